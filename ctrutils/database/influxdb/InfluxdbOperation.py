@@ -4,9 +4,12 @@ InfluxDB utilizando un cliente `InfluxDBClient`.
 """
 
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union, Callable
 from datetime import datetime, timezone
+import gzip
 import math
+import re
+import socket
 import time
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -15,6 +18,108 @@ from contextlib import contextmanager
 import pandas as pd  # type: ignore
 import numpy as np  # type: ignore
 from influxdb import InfluxDBClient
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from influxdb.line_protocol import make_line, quote_ident
+
+# Tamaño maximo de lote al escribir DataFrames: InfluxDB rinde mejor con
+# lotes de 5.000-10.000 puntos por peticion
+MAX_BATCH_SIZE = 10000
+# Tope aproximado de bytes por lote al escribir DataFrames
+DEFAULT_MAX_PAYLOAD_BYTES = 10 * 1024 * 1024
+# Pool de conexiones HTTP reutilizado por todas las peticiones del cliente
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 32
+# Carga util maxima de un datagrama UDP sobre IPv4
+UDP_MAX_DATAGRAM_BYTES = 65507
+# Puerto por defecto del listener UDP de InfluxDB
+DEFAULT_UDP_PORT = 8089
+# Segundos durante los que se reutiliza la lista de bases de datos
+DATABASE_CACHE_TTL = 30.0
+# Filas por bloque al volcar un measurement a line protocol
+BACKUP_CHUNK_SIZE = 10000
+
+# Measurement escapado al inicio de una linea de line protocol
+_LINE_PROTOCOL_MEASUREMENT = re.compile(r'^(?:[^\\, ]|\\.)*')
+
+# Un tag escapado (',clave=valor') tras el measurement; el grupo 1 es la clave
+_LINE_PROTOCOL_TAG = re.compile(r',((?:[^\\,= ]|\\.)*)=(?:[^\\, ]|\\.)*')
+
+# Caracteres a escapar en measurements, claves y valores de tags (line protocol)
+_LINE_PROTOCOL_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    ' ': '\\ ',
+    ',': '\\,',
+    '=': '\\=',
+    '\n': '\\n',
+})
+
+
+def _escape_line_protocol(value: Any) -> str:
+    """
+    Escapa un measurement, clave o valor de tag para el line protocol.
+
+    Args:
+        value: Valor a escapar. None se convierte en cadena vacia.
+
+    Returns:
+        Cadena escapada, identica a la que genera `influxdb.line_protocol`.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    return str(value).translate(_LINE_PROTOCOL_ESCAPES)
+
+
+def _line_protocol_tags(tags: Dict[str, Any]) -> str:
+    """
+    Serializa los tags de un punto para el line protocol.
+
+    Args:
+        tags: Diccionario de tags.
+
+    Returns:
+        Tags ordenados por clave con el formato ',clave=valor' (se omiten los
+        vacios), listos para concatenar tras el measurement.
+    """
+    tag_str = ''
+    for tag_key in sorted(tags):
+        tag_name = _escape_line_protocol(tag_key)
+        tag_value = _escape_line_protocol(tags[tag_key])
+        if tag_name and tag_value:
+            tag_str += f",{tag_name}={tag_value}"
+    return tag_str
+
+
+def _format_line_protocol_field(value: Any) -> str:
+    """
+    Formatea el valor de un field para el line protocol.
+
+    Args:
+        value: Valor del field.
+
+    Returns:
+        Valor formateado (cadena vacia si es None, en cuyo caso se omite).
+    """
+    # Camino rapido para el caso habitual (float nativo de Python)
+    if type(value) is float:
+        return repr(value)
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    if isinstance(value, str):
+        return quote_ident(value)
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, int):
+        return f"{value}i"
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return str(value)
 
 
 class InfluxdbOperation:
@@ -44,7 +149,7 @@ class InfluxdbOperation:
         ...     measurement='mi_medicion',
         ...     data=df,
         ...     database='mi_db',
-        ...     batch_size=1000,
+        ...     batch_size=5000,
         ...     validate_data=True
         ... )
     """
@@ -55,6 +160,7 @@ class InfluxdbOperation:
         port: Optional[Union[int, str]] = None,
         timeout: Optional[Union[int, float]] = 5,
         client: Optional[InfluxDBClient] = None,
+        compress_requests: bool = True,
         **kwargs: Any,
     ):
         """
@@ -66,15 +172,22 @@ class InfluxdbOperation:
             timeout: Tiempo de espera para las operaciones en segundos.
             client: Cliente InfluxDBClient existente (opcional). Si se proporciona,
                    se usara este cliente en lugar de crear uno nuevo.
+            compress_requests: Si True (por defecto), comprime con gzip el cuerpo de las
+                              escrituras y acepta respuestas comprimidas. Las series
+                              temporales en line protocol (tags repetidos, timestamps
+                              monotonicos) se reducen varias veces. Un `gzip` en kwargs,
+                              el argumento de InfluxDBClient, tiene el mismo efecto.
             **kwargs: Argumentos adicionales para InfluxDBClient (username, password, etc.).
 
         Raises:
             ValueError: Si no se proporciona ni cliente ni host/port.
         """
+        compress_requests = kwargs.pop('gzip', compress_requests)
         if client is not None:
             # Usar el cliente proporcionado
             self._client = client
             self._is_external_client = True
+            self._gzip = getattr(client, '_gzip', compress_requests)
             # Intentar extraer informacion del cliente
             self.host = getattr(client, '_host', None)
             self.port = getattr(client, '_port', None)
@@ -86,7 +199,7 @@ class InfluxdbOperation:
             self.timeout = timeout
             self._is_external_client = False
             self._headers = {"Accept": "application/json"}
-            self._gzip = True
+            self._gzip = compress_requests
 
             self._client = InfluxDBClient(
                 host=host,
@@ -96,6 +209,17 @@ class InfluxdbOperation:
                 gzip=self._gzip,
                 **kwargs,
             )
+            if not {'session', 'pool_size', 'socket_options'} & kwargs.keys():
+                # Conexiones keep-alive reutilizadas (tambien entre hilos) y
+                # reintentos de conexion con backoff en lugar de abrir un socket nuevo
+                self._client._session.mount(
+                    f"{self._client._scheme}://",
+                    HTTPAdapter(
+                        pool_connections=POOL_CONNECTIONS,
+                        pool_maxsize=POOL_MAXSIZE,
+                        max_retries=Retry(total=3, backoff_factor=0.1),
+                    ),
+                )
         else:
             raise ValueError(
                 "Debe proporcionar un cliente existente (client) o "
@@ -103,8 +227,9 @@ class InfluxdbOperation:
             )
 
         self._database: Optional[str] = None
+        # (instante monotonic, nombres) de la ultima consulta SHOW DATABASES
+        self._db_cache: Optional[Tuple[float, FrozenSet[str]]] = None
         self._headers = {"Accept": "application/json"}
-        self._gzip = True
         self._logger: Optional[logging.Logger] = None
         self._retry_attempts = 3
         self._retry_delay = 1  # segundos
@@ -118,16 +243,87 @@ class InfluxdbOperation:
     # ==================== UTILIDADES INTERNAS ====================
 
     @staticmethod
-    def _convert_to_utc_iso(dt: Union[str, datetime, pd.Timestamp]) -> str:
+    def points_to_line_protocol(points: List[Dict[str, Any]]) -> List[str]:
+        """
+        Serializa una lista de puntos al line protocol de InfluxDB.
+
+        Produce las mismas lineas que `influxdb.line_protocol.make_lines`, pero
+        convierte todos los timestamps del lote con una sola llamada vectorizada
+        en lugar de analizar cada cadena por separado, y reutiliza el escapado de
+        measurements y tags compartidos entre puntos.
+
+        Args:
+            points: Lista de puntos con 'measurement', 'fields' y opcionalmente
+                   'time' (cadena ISO8601 o entero en nanosegundos) y 'tags'.
+
+        Returns:
+            Lista de lineas en line protocol, una por punto.
+        """
+        times = [point.get('time') for point in points]
+        iso_times = [t for t in times if isinstance(t, str)]
+        nanos = None
+        if all(t is None or isinstance(t, (str, int, np.integer)) for t in times):
+            try:
+                parsed = pd.to_datetime(pd.Index(iso_times), utc=True, format='ISO8601')
+                if not parsed.hasnans:
+                    # Precision de microsegundos, igual que el analisis por punto del cliente
+                    nanos = iter(((parsed.as_unit('ns').asi8 // 1000) * 1000).tolist())
+            except (ValueError, TypeError, OverflowError):
+                nanos = None
+        if nanos is None:
+            # Formatos no ISO8601 o fuera de rango: se delega en el cliente punto a punto
+            return [
+                make_line(point.get('measurement'), point.get('tags'), point.get('fields'), point.get('time'))
+                for point in points
+            ]
+
+        escaped: Dict[Any, str] = {}
+        tag_cache: Dict[int, str] = {}
+        lines = []
+        for point, point_time in zip(points, times):
+            measurement = point.get('measurement')
+            key = escaped.get(measurement)
+            if key is None:
+                key = escaped[measurement] = _escape_line_protocol(measurement)
+            point_tags = point.get('tags')
+            if point_tags:
+                # Los puntos suelen compartir el diccionario de tags
+                tag_str = tag_cache.get(id(point_tags))
+                if tag_str is None:
+                    tag_str = tag_cache[id(point_tags)] = _line_protocol_tags(point_tags)
+                key += tag_str
+
+            fields = point.get('fields') or {}
+            field_parts = []
+            for field_key in sorted(fields):
+                field_name = _escape_line_protocol(field_key)
+                value = _format_line_protocol_field(fields[field_key])
+                if field_name and value:
+                    field_parts.append(f"{field_name}={value}")
+            line = f"{key} {','.join(field_parts)}" if field_parts else key
+            if isinstance(point_time, str):
+                line += f" {next(nanos)}"
+            elif point_time is not None:
+                # Los enteros ya son nanosegundos desde epoch
+                line += f" {int(point_time)}"
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _convert_to_utc_iso(dt: Union[str, int, datetime, pd.Timestamp]) -> Union[str, int]:
         """
         Convierte un datetime a formato ISO8601 en UTC.
 
         Args:
-            dt: Datetime a convertir (string, datetime o Timestamp).
+            dt: Datetime a convertir (string, datetime o Timestamp). Los enteros
+                (nanosegundos desde epoch) se devuelven sin cambios.
 
         Returns:
-            String en formato ISO8601 UTC.
+            String en formato ISO8601 UTC, o el mismo entero si `dt` lo era.
         """
+        if isinstance(dt, (int, np.integer)):
+            # Nanosegundos desde epoch: ya estan en UTC
+            return dt
         if isinstance(dt, str):
             # Ya es string, asumimos que está en formato correcto
             return dt
@@ -321,6 +517,25 @@ class InfluxdbOperation:
         """
         return self._client
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        Sesion HTTP (`requests.Session`) usada por el cliente.
+        """
+        return self._client._session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        """
+        Sustituye la sesion HTTP del cliente, p. ej. para compartir un pool de
+        conexiones keep-alive entre varias instancias.
+
+        La sesion anterior no se cierra y la nueva se usa tal cual, sin montar
+        adaptadores: su pool lo configura quien la crea. `close_client` cierra la
+        sesion activa, por lo que no debe llamarse mientras se comparta.
+        """
+        self._client._session = session
+
     def close_client(self) -> None:
         """
         Cierra la conexion actual del cliente `InfluxDBClient`.
@@ -335,8 +550,8 @@ class InfluxdbOperation:
         """
         Cambia la base de datos activa en el cliente de InfluxDB.
         """
-        if database not in self._client.get_list_database():
-            self._client.create_database(database)
+        if database not in self._databases_cached():
+            self.create_database(database)
         self._database = database
         self._client.switch_database(database)
 
@@ -669,6 +884,112 @@ class InfluxdbOperation:
 
         return value
 
+    def normalize_dataframe_to_write(
+        self,
+        df: pd.DataFrame,
+        validate_data: bool = True,
+        pass_to_float: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Normaliza un DataFrame completo para su escritura en InfluxDB.
+
+        Version vectorizada de aplicar `normalize_value_to_write` a cada celda:
+        las columnas numericas y booleanas se convierten columna a columna
+        con NumPy, y solo las columnas de otros tipos (strings, objetos) pasan
+        por la normalizacion escalar. El resultado es el mismo que se obtiene
+        recorriendo las filas con `iterrows`, incluido el tipo comun que
+        pandas asigna a cada fila cuando se mezclan enteros y floats.
+
+        Args:
+            df: DataFrame con los fields a normalizar.
+            validate_data: Si True, descarta NaN, infinitos y strings vacios
+                y convierte enteros a float. Si False, solo descarta NaN.
+            pass_to_float: Sin validacion, convierte enteros a float.
+
+        Returns:
+            DataFrame de tipo object con el mismo indice y columnas, con los
+            valores como tipos nativos de Python y None donde el valor no es
+            valido.
+        """
+        # Al recorrer filas de un DataFrame solo numerico, pandas promociona
+        # los enteros al tipo comun de las columnas, que puede ser float
+        dtypes = list(df.dtypes)
+        rows_as_float = bool(dtypes) and all(
+            isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in dtypes
+        ) and np.result_type(*dtypes).kind == 'f'
+
+        columns = {}
+        for position, dtype in enumerate(dtypes):
+            series = df.iloc[:, position]
+            kind = dtype.kind if isinstance(dtype, np.dtype) else 'O'
+
+            if kind == 'f':
+                arr = series.to_numpy(dtype=np.float64)
+                valid = np.isfinite(arr) if validate_data else ~np.isnan(arr)
+                values = np.array(arr.tolist(), dtype=object)
+            elif kind in 'iu':
+                arr = series.to_numpy()
+                valid = np.ones(len(arr), dtype=bool)
+                if validate_data or pass_to_float or rows_as_float:
+                    arr = arr.astype(np.float64)
+                values = np.array(arr.tolist(), dtype=object)
+            elif kind == 'b':
+                arr = series.to_numpy()
+                valid = np.ones(len(arr), dtype=bool)
+                # Los bool de Python son enteros: se convierten igual que ellos
+                if validate_data or pass_to_float:
+                    arr = arr.astype(np.float64)
+                values = np.array(arr.tolist(), dtype=object)
+            else:
+                values = np.empty(len(series), dtype=object)
+                for i, value in enumerate(series.tolist()):
+                    if pd.isna(value):
+                        value = None
+                    elif validate_data:
+                        value = self.normalize_value_to_write(value)
+                    elif pass_to_float and isinstance(value, (int, np.integer)):
+                        value = float(value)
+                    values[i] = value
+                columns[position] = values
+                continue
+
+            values[~valid] = None
+            columns[position] = values
+
+        normalized = pd.DataFrame(columns, index=df.index, dtype=object)
+        normalized.columns = df.columns
+        return normalized
+
+    def _validate_frame(
+        self,
+        df: pd.DataFrame,
+        validate_data: bool = True,
+        pass_to_float: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Valida y limpia un DataFrame completo antes de escribirlo en InfluxDB.
+
+        Equivalente vectorizado de aplicar `_validate_point` a cada fila: las
+        celdas no validas quedan como None y se descartan las filas sin ningun
+        valor valido.
+
+        Args:
+            df: DataFrame con los fields a validar.
+            validate_data: Si True, descarta NaN, infinitos y strings vacios.
+            pass_to_float: Sin validacion, convierte enteros a float.
+
+        Returns:
+            DataFrame normalizado (ver `normalize_dataframe_to_write`) con solo
+            las filas que conservan al menos un valor.
+        """
+        normalized = self.normalize_dataframe_to_write(
+            df, validate_data=validate_data, pass_to_float=pass_to_float
+        )
+        valid_rows = normalized.notna().to_numpy().any(axis=1)
+        if valid_rows.all():
+            return normalized
+        return normalized[valid_rows]
+
     def _validate_point(self, point: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Valida y limpia un punto antes de escribirlo en InfluxDB.
@@ -726,12 +1047,7 @@ class InfluxdbOperation:
         Raises:
             ValueError: Si no se proporciona base de datos o la lista de puntos esta vacia.
         """
-        db_to_use = database or self._database
-        if db_to_use is None:
-            raise ValueError(
-                "Debe proporcionar una base de datos o establecerla mediante el metodo 'switch_database'."
-            )
-        self.switch_database(db_to_use)
+        db_to_use = self._resolve_write_database(database)
 
         if not points:
             raise ValueError("La lista de puntos no puede estar vacia.")
@@ -760,21 +1076,153 @@ class InfluxdbOperation:
                 validated_points.append(point)
 
         # Escribir en lotes
+        written_count, batch_count = self._write_line_batches(
+            self.points_to_line_protocol(validated_points), db_to_use, batch_size
+        )
+
+        return {
+            'total_points': total_points,
+            'written_points': written_count,
+            'invalid_points': invalid_count,
+            'batches': batch_count
+        }
+
+    def _resolve_write_database(self, database: Optional[str]) -> str:
+        """
+        Determina y activa la base de datos de destino de una escritura.
+
+        Args:
+            database: Base de datos indicada (None = usa la actual).
+
+        Returns:
+            Nombre de la base de datos a usar.
+
+        Raises:
+            ValueError: Si no se proporciona base de datos ni hay una activa.
+        """
+        db_to_use = database or self._database
+        if db_to_use is None:
+            raise ValueError(
+                "Debe proporcionar una base de datos o establecerla mediante el metodo 'switch_database'."
+            )
+        self.switch_database(db_to_use)
+        return db_to_use
+
+    def _write_line_batches(self, lines: List[str], database: str, batch_size: int) -> Tuple[int, int]:
+        """
+        Escribe lineas de line protocol en lotes.
+
+        Args:
+            lines: Lineas ya serializadas.
+            database: Base de datos de destino.
+            batch_size: Numero de lineas por peticion.
+
+        Returns:
+            Tupla (lineas escritas, numero de lotes).
+        """
         written_count = 0
         batch_count = 0
-        for i in range(0, len(validated_points), batch_size):
-            batch = validated_points[i:i + batch_size]
+        for i in range(0, len(lines), batch_size):
+            batch = lines[i:i + batch_size]
+            # El cliente convertiria los puntos JSON a line protocol analizando
+            # cada timestamp por separado; se envian ya serializados
             self._client.write_points(
-                points=batch, database=db_to_use, batch_size=batch_size
+                points=batch,
+                database=database,
+                batch_size=batch_size,
+                protocol='line',
             )
             written_count += len(batch)
             batch_count += 1
+        return written_count, batch_count
+
+    def write_points_udp(
+        self,
+        points: list,
+        host: Optional[str] = None,
+        port: int = DEFAULT_UDP_PORT,
+        tags: Optional[dict] = None,
+        validate_data: bool = True,
+        max_datagram_bytes: int = UDP_MAX_DATAGRAM_BYTES,
+    ) -> Dict[str, int]:
+        """
+        Escribe una lista de puntos mediante el listener UDP de InfluxDB.
+
+        Los puntos se serializan a line protocol y se agrupan en datagramas de
+        hasta `max_datagram_bytes`, separados por saltos de linea. UDP no confirma
+        la entrega: es adecuado para metricas en las que se tolera perder puntos.
+        La base de datos de destino es la configurada en el listener del servidor.
+
+        Args:
+            points: Lista de puntos con las claves 'measurement', 'time', 'fields'
+                   y opcionalmente 'tags'.
+            host: Servidor InfluxDB (por defecto el de la conexion HTTP).
+            port: Puerto del listener UDP. Por defecto 8089.
+            tags: Tags adicionales para agregar a todos los puntos.
+            validate_data: Si True, valida y limpia los puntos antes de enviarlos.
+            max_datagram_bytes: Tamaño maximo de cada datagrama. Por defecto 65507.
+
+        Returns:
+            Diccionario con estadisticas de envio: {
+                'total_points': int,
+                'written_points': int,
+                'invalid_points': int,
+                'datagrams': int
+            }
+
+        Raises:
+            ValueError: Si no hay host, la lista de puntos esta vacia o un punto no
+                       cabe en un datagrama.
+        """
+        target_host = host or self.host
+        if target_host is None:
+            raise ValueError("Debe proporcionar el host del listener UDP.")
+
+        if not points:
+            raise ValueError("La lista de puntos no puede estar vacia.")
+
+        validated_points = []
+        invalid_count = 0
+        for point in points:
+            if "time" in point:
+                point["time"] = self._convert_to_utc_iso(point["time"])
+            if tags:
+                point["tags"] = {**point.get("tags", {}), **tags}
+            if validate_data:
+                point = self._validate_point(point)
+                if point is None:
+                    invalid_count += 1
+                    continue
+            validated_points.append(point)
+
+        # Empaquetar varias lineas por datagrama sin superar el limite
+        datagrams = []
+        current: List[bytes] = []
+        current_size = 0
+        for line in self.points_to_line_protocol(validated_points):
+            encoded = line.encode('utf-8')
+            if len(encoded) > max_datagram_bytes:
+                raise ValueError(
+                    f"Un punto ocupa {len(encoded)} bytes y no cabe en un datagrama UDP."
+                )
+            # current_size incluye un salto de linea por cada linea ya añadida
+            if current and current_size + len(encoded) > max_datagram_bytes:
+                datagrams.append(b'\n'.join(current))
+                current, current_size = [], 0
+            current.append(encoded)
+            current_size += len(encoded) + 1
+        if current:
+            datagrams.append(b'\n'.join(current))
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for datagram in datagrams:
+                sock.sendto(datagram, (target_host, port))
 
         return {
-            'total_points': total_points,
-            'written_points': written_count,
+            'total_points': len(points),
+            'written_points': len(validated_points),
             'invalid_points': invalid_count,
-            'batches': batch_count
+            'datagrams': len(datagrams)
         }
 
     def write_dataframe(
@@ -784,7 +1232,7 @@ class InfluxdbOperation:
         df: Optional[pd.DataFrame] = None,
         tags: Optional[dict] = None,
         database: Optional[str] = None,
-        batch_size: int = 1000,
+        batch_size: int = 5000,
         validate_data: bool = True,
         pass_to_float: bool = True,
         convert_bool_to_float: bool = False,
@@ -793,6 +1241,7 @@ class InfluxdbOperation:
         field_columns: Optional[List[str]] = None,
         tag_columns: Optional[List[str]] = None,
         convert_index_to_utc: bool = True,
+        max_payload_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
     ) -> Dict[str, int]:
         """
         Convierte un DataFrame en una lista de puntos y los escribe en InfluxDB,
@@ -811,7 +1260,8 @@ class InfluxdbOperation:
             df: Alias para 'data' (por compatibilidad).
             tags: Tags adicionales para todos los puntos (opcional).
             database: Base de datos donde escribir (opcional si ya esta configurada).
-            batch_size: Tamaño del lote para escritura. Por defecto 1000.
+            batch_size: Tamaño del lote para escritura. Por defecto 5000, con un
+                       maximo de 10000 (MAX_BATCH_SIZE).
                        Reducir si tiene problemas de memoria con DataFrames grandes.
             validate_data: Si True, valida y limpia datos antes de escribir.
             pass_to_float: Si True, convierte enteros a float para compatibilidad InfluxDB.
@@ -821,6 +1271,9 @@ class InfluxdbOperation:
             field_columns: Lista de columnas a usar como fields (None = todas excepto tag_columns).
             tag_columns: Lista de columnas a usar como tags adicionales.
             convert_index_to_utc: Si True, convierte el indice a UTC antes de escribir.
+            max_payload_bytes: Tope aproximado de bytes por lote, estimado a partir
+                       de la memoria que ocupa cada fila del DataFrame. Reduce el
+                       lote cuando las filas son anchas. Por defecto 10 MiB.
 
         Returns:
             Diccionario con estadisticas de escritura.
@@ -839,7 +1292,7 @@ class InfluxdbOperation:
             ...     measurement='clima',
             ...     data=df,
             ...     database='mi_db',
-            ...     batch_size=1000,
+            ...     batch_size=5000,
             ...     validate_data=True
             ... )
             >>> print(f"Escritos: {stats['written_points']}/{stats['total_points']}")
@@ -893,57 +1346,87 @@ class InfluxdbOperation:
                 dataframe[f"{column}{suffix_bool_to_float}"] = dataframe[column].astype(float)
                 dataframe = dataframe.drop(columns=[column])
 
-        # Convertir DataFrame a lista de diccionarios de puntos
-        points = []
-        for index, row in dataframe.iterrows():
-            # Construir los campos, aplicando normalizacion
-            fields = {}
-            for field, value in row.items():
-                # Saltar valores NaN
-                if pd.isna(value):
-                    continue
-
-                # Normalizar el valor
-                if validate_data:
-                    normalized_value = self.normalize_value_to_write(value)
-                    if normalized_value is not None:
-                        fields[field] = normalized_value
-                else:
-                    # Sin validacion, solo aplicar conversion basica
-                    if pass_to_float and isinstance(value, (int, np.integer)):
-                        fields[field] = float(value)
-                    else:
-                        fields[field] = value
+        # Validar todas las columnas de una vez; los valores no validos quedan
+        # como None y las filas sin ningun valor se descartan
+        normalized = self._validate_frame(
+            dataframe, validate_data=validate_data, pass_to_float=pass_to_float
+        )
 
-            # Solo agregar el punto si tiene campos validos
+        # Timestamps como enteros en nanosegundos desde epoch, sin formatear ni
+        # analizar cadenas (un indice sin zona horaria se interpreta como UTC)
+        times = normalized.index.as_unit('ns').asi8.tolist()
+
+        # Tags comunes a todos los puntos (tanto los proporcionados como los de columnas)
+        point_tags = {}
+        if tags:
+            point_tags.update(tags)
+        if tags_from_columns:
+            point_tags.update(tags_from_columns)
+
+        db_to_use = self._resolve_write_database(database)
+
+        # Serializar directamente a line protocol recorriendo las columnas en
+        # paralelo, sin crear diccionarios por fila; los valores no validos
+        # (None) se omiten
+        key = _escape_line_protocol(measurement) + _line_protocol_tags(point_tags)
+        prefixes = []
+        columns = []
+        for column in sorted(normalized.columns):
+            field_name = _escape_line_protocol(column)
+            if field_name:
+                prefixes.append(f"{field_name}=")
+                columns.append(normalized[column].tolist())
+
+        lines = []
+        for timestamp, *values in zip(times, *columns):
+            fields = ','.join([
+                prefix + _format_line_protocol_field(value)
+                for prefix, value in zip(prefixes, values) if value is not None
+            ])
+            # Solo escribir la fila si tiene campos validos
             if fields:
-                point = {
-                    "measurement": measurement,
-                    "time": self._convert_to_utc_iso(index),
-                    "fields": fields,
-                }
+                lines.append(f"{key} {fields} {timestamp}")
 
-                # Agregar tags (tanto los proporcionados como los de columnas)
-                point_tags = {}
-                if tags:
-                    point_tags.update(tags)
-                if tags_from_columns:
-                    point_tags.update(tags_from_columns)
-
-                if point_tags:
-                    point["tags"] = point_tags
-
-                points.append(point)
-
-        # Escribir los puntos usando el metodo write_points mejorado
-        return self.write_points(
-            points=points,
-            database=database,
-            tags=None,  # Ya los agregamos arriba
-            batch_size=batch_size,
-            validate_data=False,  # Ya validamos arriba
+        if not lines:
+            raise ValueError("La lista de puntos no puede estar vacia.")
+
+        written_count, batch_count = self._write_line_batches(
+            lines, db_to_use, self._dataframe_batch_size(dataframe, batch_size, max_payload_bytes)
         )
 
+        return {
+            'total_points': len(lines),
+            'written_points': written_count,
+            'invalid_points': 0,
+            'batches': batch_count
+        }
+
+    @staticmethod
+    def _dataframe_batch_size(
+        dataframe: pd.DataFrame, batch_size: int, max_payload_bytes: int
+    ) -> int:
+        """
+        Ajusta el tamaño de lote para escribir un DataFrame.
+
+        Limita el lote a MAX_BATCH_SIZE y a las filas que caben en
+        `max_payload_bytes`, estimando el tamaño de cada fila con
+        `DataFrame.memory_usage(deep=False)`.
+
+        Args:
+            dataframe: DataFrame que se va a escribir.
+            batch_size: Tamaño de lote solicitado.
+            max_payload_bytes: Tope aproximado de bytes por lote.
+
+        Returns:
+            Tamaño de lote efectivo (al menos 1).
+        """
+        batch_size = min(batch_size, MAX_BATCH_SIZE)
+        if len(dataframe) > 0 and max_payload_bytes > 0:
+            row_bytes = dataframe.memory_usage(deep=False).sum() / len(dataframe)
+            if row_bytes > 0:
+                batch_size = min(batch_size, int(max_payload_bytes // row_bytes))
+        return max(1, batch_size)
+
     def write_dataframe_parallel(
         self,
         df: pd.DataFrame,
@@ -955,10 +1438,16 @@ class InfluxdbOperation:
         max_workers: int = 4,
         progress_callback: Optional[Callable[[int, int], None]] = None,
         database: Optional[str] = None,
+        shard_duration: str = '1h',
     ) -> Dict[str, Any]:
         """
         Escribe un DataFrame a InfluxDB usando procesamiento paralelo.
 
+        Las filas se agrupan por serie (valores de `tag_columns`) y ventana de
+        `shard_duration`, y cada grupo se asigna a un unico worker. Asi dos
+        workers nunca escriben a la vez en la misma serie y shard, lo que
+        InfluxDB serializaria con el bloqueo del shard.
+
         Args:
             df: DataFrame con datos a escribir
             measurement: Nombre de la medicion
@@ -969,45 +1458,68 @@ class InfluxdbOperation:
             max_workers: Numero maximo de threads para procesamiento paralelo
             progress_callback: Funcion opcional(processed, total) para reportar progreso
             database: Nombre de la base de datos (None = usa la actual)
+            shard_duration: Duracion de los grupos de shards del servidor (por
+                           defecto '1h', la de InfluxDB) usada para alinear el reparto.
 
         Returns:
             Diccionario con estadisticas de la operacion
+
+        Raises:
+            TypeError: Si el indice del DataFrame no es DatetimeIndex.
         """
         if df.empty:
             return {"total_points": 0, "successful": 0, "failed": 0, "duration": 0.0}
 
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError("El indice del DataFrame debe ser de tipo DatetimeIndex.")
+
         start_time = time.time()
         total_rows = len(df)
         processed = 0
         successful = 0
         failed = 0
 
-        # Dividir DataFrame en chunks
-        chunks = [df.iloc[i:i + batch_size] for i in range(0, total_rows, batch_size)]
-
-        # Funcion para procesar cada chunk
-        def process_chunk(chunk_data):
-            try:
-                stats = self.write_dataframe(
-                    df=chunk_data,
-                    measurement=measurement,
-                    tags=tags,
-                    field_columns=field_columns,
-                    tag_columns=tag_columns,
-                    batch_size=batch_size,
-                    validate_data=True,
-                    database=database
-                )
-                return stats['successful'], stats['failed']
-            except Exception as e:
-                if self._logger:
-                    self._logger.error(f"Error procesando chunk: {e}")
-                return 0, len(chunk_data)
+        # Clave de grupo: serie (tags por fila) + ventana del grupo de shards
+        series_columns = [col for col in (tag_columns or []) if col in df.columns]
+        window = df.index.as_unit('ns').asi8 // pd.Timedelta(shard_duration).value
+        group_ids = df.groupby(
+            [df[col].to_numpy() for col in series_columns] + [window],
+            sort=False,
+            dropna=False,
+        ).ngroup().to_numpy()
+        shard_ids = group_ids % max(1, max_workers)
+        shards = [df[shard_ids == shard] for shard in np.unique(shard_ids)]
+
+        # Cada worker escribe su shard; con tag_columns, una escritura por serie
+        # para que cada una conserve sus propios tags
+        def process_shard(shard_data):
+            series = (
+                [group for _, group in shard_data.groupby(series_columns, sort=False, dropna=False)]
+                if series_columns else [shard_data]
+            )
+            written = 0
+            for series_data in series:
+                try:
+                    stats = self.write_dataframe(
+                        df=series_data,
+                        measurement=measurement,
+                        tags=tags,
+                        field_columns=field_columns,
+                        tag_columns=tag_columns,
+                        batch_size=batch_size,
+                        validate_data=True,
+                        database=database
+                    )
+                    written += stats['written_points']
+                except Exception as e:
+                    if self._logger:
+                        self._logger.error(f"Error procesando shard: {e}")
+            return written, len(shard_data) - written
 
-        # Procesar chunks en paralelo
+        # Procesar shards en paralelo
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(process_chunk, chunk): i
-                      for i, chunk in enumerate(chunks)}
+            futures = {executor.submit(process_shard, shard): i
+                      for i, shard in enumerate(shards)}
 
             for future in futures:
                 chunk_success, chunk_failed = future.result()
@@ -1025,7 +1537,8 @@ class InfluxdbOperation:
             "successful": successful,
             "failed": failed,
             "duration": duration,
-            "points_per_second": successful / duration if duration > 0 else 0
+            "points_per_second": successful / duration if duration > 0 else 0,
+            "shards": len(shards),
         }
 
         if self._logger:
@@ -1176,6 +1689,29 @@ class InfluxdbOperation:
         if self._logger:
             self._logger.info(f"Continuous query '{cq_name}' eliminada")
 
+    @staticmethod
+    def _infer_backup_format(path: str, backup_format: Optional[str]) -> str:
+        """
+        Determina el formato de un archivo de backup.
+
+        Args:
+            path: Ruta del archivo.
+            backup_format: Formato indicado ('lp' o 'csv'). None = line protocol solo
+                          si la extension es '.lp' o '.lp.gz'; cualquier otra es
+                          CSV, el formato historico de estos backups.
+
+        Returns:
+            'lp' o 'csv'.
+
+        Raises:
+            ValueError: Si el formato indicado no es valido.
+        """
+        if backup_format is None:
+            return 'lp' if path.lower().endswith(('.lp', '.lp.gz')) else 'csv'
+        if backup_format not in ('lp', 'csv'):
+            raise ValueError(f"Formato de backup no soportado: '{backup_format}'. Use 'lp' o 'csv'.")
+        return backup_format
+
     def backup_measurement(
         self,
         measurement: str,
@@ -1183,38 +1719,146 @@ class InfluxdbOperation:
         start_time: Optional[str] = None,
         end_time: Optional[str] = None,
         database: Optional[str] = None,
+        compression: Union[str, Dict[str, Any], None] = "infer",
+        backup_format: Optional[str] = None,
     ) -> int:
         """
-        Exporta un measurement a archivo CSV.
+        Exporta un measurement a archivo de line protocol o CSV.
+
+        En formato line protocol ('lp') los datos se leen con una query por bloques
+        de `BACKUP_CHUNK_SIZE` filas y se escriben directamente al archivo, con los
+        timestamps como enteros en nanosegundos; el measurement nunca se carga
+        entero en memoria y la restauracion no necesita volver a analizar los puntos.
 
         Args:
             measurement: Nombre del measurement
-            output_file: Ruta del archivo CSV de salida
+            output_file: Ruta del archivo de salida
             start_time: Tiempo de inicio (opcional)
             end_time: Tiempo de fin (opcional)
             database: Base de datos (None = usa la actual)
+            compression: Compresion del archivo. Por defecto se infiere de la
+                        extension (ej. '.lp.gz' o '.csv.gz'). En CSV acepta lo mismo
+                        que `DataFrame.to_csv`; en line protocol solo gzip.
+            backup_format: 'lp' o 'csv'. None = se infiere de la extension
+                          ('.lp' o '.lp.gz' es line protocol, el resto CSV).
 
         Returns:
             Numero de puntos exportados
         """
-        df = self.query_to_dataframe(
-            measurement=measurement,
-            start_time=start_time,
-            end_time=end_time,
-            database=database
-        )
+        if self._infer_backup_format(output_file, backup_format) == 'lp':
+            exported = self._backup_measurement_lp(
+                measurement, output_file, start_time, end_time, database, compression
+            )
+        else:
+            df = self.query_to_dataframe(
+                measurement=measurement,
+                start_time=start_time,
+                end_time=end_time,
+                database=database
+            )
+            exported = len(df)
+            if not df.empty:
+                df.to_csv(output_file, index=True, compression=compression)
 
-        if df.empty:
+        if exported == 0:
             if self._logger:
                 self._logger.warning(f"No hay datos para exportar del measurement '{measurement}'")
             return 0
 
-        df.to_csv(output_file, index=True)
-
         if self._logger:
-            self._logger.info(f"Backup completado: {len(df)} puntos exportados a '{output_file}'")
+            self._logger.info(f"Backup completado: {exported} puntos exportados a '{output_file}'")
+
+        return exported
+
+    def _backup_measurement_lp(
+        self,
+        measurement: str,
+        output_file: str,
+        start_time: Optional[str],
+        end_time: Optional[str],
+        database: Optional[str],
+        compression: Union[str, Dict[str, Any], None],
+    ) -> int:
+        """
+        Vuelca un measurement a un archivo de line protocol por bloques.
+
+        Returns:
+            Numero de lineas escritas.
+        """
+        tag_keys = set(self.list_tags(measurement, database=database))
+        # JSON no distingue 2.0 de 2: sin el tipo, un float entero se restauraria
+        # como integer y chocaria con el resto de valores del field
+        float_fields = {
+            name for name, field_type in self.list_fields(measurement, database=database).items()
+            if field_type == 'float'
+        }
+        db_to_use = database or self._database
 
-        return len(df)
+        query = f'SELECT * FROM "{measurement}"'
+        where_clauses = []
+        if start_time:
+            where_clauses.append(f"time >= '{start_time}'")
+        if end_time:
+            where_clauses.append(f"time <= '{end_time}'")
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+
+        result = self._client.query(
+            query,
+            database=db_to_use,
+            epoch='ns',
+            chunked=True,
+            chunk_size=BACKUP_CHUNK_SIZE,
+        )
+        # Las respuestas por bloques producen un ResultSet por bloque; el resto
+        # (por ejemplo msgpack) devuelve un unico ResultSet
+        chunks = [result] if hasattr(result, 'get_points') else result
+
+        if isinstance(compression, dict):
+            method = compression.get('method')
+            compresslevel = compression.get('compresslevel', 9)
+        else:
+            method = compression
+            compresslevel = 9
+        if method == 'infer':
+            method = 'gzip' if output_file.lower().endswith('.gz') else None
+        if method not in (None, 'gzip'):
+            raise ValueError(f"Compresion no soportada para line protocol: '{method}'. Use 'gzip'.")
+
+        lines_written = 0
+        with open(output_file, 'wb') as raw:
+            handle = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=compresslevel) if method else raw
+            try:
+                for chunk in chunks:
+                    points = []
+                    for row in chunk.get_points():
+                        tags = {}
+                        fields = {}
+                        for key, value in row.items():
+                            if key == 'time' or value is None:
+                                continue
+                            if key in tag_keys:
+                                tags[key] = value
+                            elif key in float_fields and isinstance(value, int):
+                                fields[key] = float(value)
+                            else:
+                                fields[key] = value
+                        if fields:
+                            points.append({
+                                'measurement': measurement,
+                                'time': row['time'],
+                                'tags': tags,
+                                'fields': fields,
+                            })
+                    if points:
+                        lines = self.points_to_line_protocol(points)
+                        handle.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                        lines_written += len(lines)
+            finally:
+                if handle is not raw:
+                    handle.close()
+
+        return lines_written
 
     def restore_measurement(
         self,
@@ -1223,38 +1867,116 @@ class InfluxdbOperation:
         tags: Optional[Dict[str, str]] = None,
         batch_size: int = 5000,
         database: Optional[str] = None,
+        backup_format: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Restaura un measurement desde archivo CSV.
+        Restaura un measurement desde archivo de line protocol o CSV.
+
+        Las lineas de un backup en line protocol se envian tal cual, solo
+        sustituyendo el measurement y añadiendo `tags`, sin deserializar los puntos.
 
         Args:
             measurement: Nombre del measurement de destino
-            input_file: Ruta del archivo CSV
+            input_file: Ruta del archivo (en line protocol la compresion gzip se
+                       detecta por su contenido; en CSV se infiere de la extension)
             tags: Tags adicionales
             batch_size: Tamaño de batch para escritura
             database: Base de datos de destino
+            backup_format: 'lp' o 'csv'. None = se infiere de la extension
+                          ('.lp' o '.lp.gz' es line protocol, el resto CSV).
 
         Returns:
             Estadisticas de la operacion
         """
-        df = pd.read_csv(input_file, index_col=0, parse_dates=True)
+        if self._infer_backup_format(input_file, backup_format) == 'lp':
+            result = self._restore_measurement_lp(measurement, input_file, tags, batch_size, database)
+        else:
+            df = pd.read_csv(input_file, index_col=0, parse_dates=True)
 
-        if df.empty:
-            return {"total_points": 0, "successful": 0, "failed": 0}
+            if df.empty:
+                return {"total_points": 0, "successful": 0, "failed": 0}
 
-        result = self.write_dataframe(
-            df=df,
-            measurement=measurement,
-            tags=tags,
-            batch_size=batch_size,
-            database=database
-        )
+            result = self.write_dataframe(
+                df=df,
+                measurement=measurement,
+                tags=tags,
+                batch_size=batch_size,
+                database=database
+            )
 
         if self._logger:
             self._logger.info(f"Restauracion completada: {result}")
 
         return result
 
+    def _restore_measurement_lp(
+        self,
+        measurement: str,
+        input_file: str,
+        tags: Optional[Dict[str, str]],
+        batch_size: int,
+        database: Optional[str],
+    ) -> Dict[str, int]:
+        """
+        Escribe un backup de line protocol en lotes de `batch_size` lineas.
+
+        Los tags del backup con la misma clave que alguno de `tags` se eliminan
+        de cada linea, de modo que prevalece el valor indicado en la restauracion.
+
+        Returns:
+            Diccionario con total_points, written_points, invalid_points y batches.
+        """
+        db_to_use = self._resolve_write_database(database)
+        prefix = _escape_line_protocol(measurement) + _line_protocol_tags(tags or {})
+        overridden = {_escape_line_protocol(key) for key in tags or {}}
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        total_points = 0
+        written_points = 0
+        batches = 0
+        # La compresion se detecta por el contenido: un backup con
+        # compression='gzip' no tiene por que terminar en '.gz'
+        with open(input_file, 'rb') as raw:
+            compressed = raw.read(2) == b'\x1f\x8b'
+        opener = gzip.open if compressed else open
+        with opener(input_file, 'rt', encoding='utf-8') as handle:
+            pending: List[str] = []
+            for line in handle:
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                pos = _LINE_PROTOCOL_MEASUREMENT.match(line).end()
+                if overridden:
+                    # Una clave de tag repetida en la linea invalidaria el punto
+                    kept = ''
+                    tag = _LINE_PROTOCOL_TAG.match(line, pos)
+                    while tag:
+                        if tag.group(1) not in overridden:
+                            kept += tag.group(0)
+                        pos = tag.end()
+                        tag = _LINE_PROTOCOL_TAG.match(line, pos)
+                    pending.append(prefix + kept + line[pos:])
+                else:
+                    pending.append(prefix + line[pos:])
+                if len(pending) >= batch_size:
+                    written, sent = self._write_line_batches(pending, db_to_use, batch_size)
+                    total_points += len(pending)
+                    written_points += written
+                    batches += sent
+                    pending = []
+            if pending:
+                written, sent = self._write_line_batches(pending, db_to_use, batch_size)
+                total_points += len(pending)
+                written_points += written
+                batches += sent
+
+        return {
+            "total_points": total_points,
+            "written_points": written_points,
+            "invalid_points": 0,
+            "batches": batches,
+        }
+
     def calculate_data_quality_metrics(
         self,
         measurement: str,
@@ -1674,7 +2396,27 @@ class InfluxdbOperation:
             ['_internal', 'mi_db', 'otra_db']
         """
         result = self._client.get_list_database()
-        return [db['name'] for db in result]
+        names = [db['name'] for db in result]
+        self._db_cache = (time.monotonic(), frozenset(names))
+        return names
+
+    def _databases_cached(self, ttl: float = DATABASE_CACHE_TTL) -> FrozenSet[str]:
+        """
+        Devuelve los nombres de las bases de datos reutilizando la ultima consulta.
+
+        Solo se lanza `SHOW DATABASES` si no hay resultado previo o tiene mas de
+        `ttl` segundos. `create_database` y `drop_database` invalidan la cache.
+
+        Args:
+            ttl: Segundos de validez de la lista cacheada.
+
+        Returns:
+            Conjunto con los nombres de las bases de datos.
+        """
+        cache = self._db_cache
+        if cache is not None and time.monotonic() - cache[0] < ttl:
+            return cache[1]
+        return frozenset(self.list_databases())
 
     def database_exists(self, database: str) -> bool:
         """
@@ -1686,8 +2428,7 @@ class InfluxdbOperation:
         Returns:
             True si la base de datos existe, False en caso contrario.
         """
-        databases = self.list_databases()
-        return database in databases
+        return database in self._databases_cached()
 
     def create_database(self, database: str) -> None:
         """
@@ -1700,6 +2441,7 @@ class InfluxdbOperation:
             >>> influx.create_database('nueva_db')
         """
         self._client.create_database(database)
+        self._db_cache = None
 
     def drop_database(self, database: str, confirm: bool = False) -> None:
         """
@@ -1720,6 +2462,7 @@ class InfluxdbOperation:
                 "Debe confirmar la eliminacion de la base de datos estableciendo confirm=True"
             )
         self._client.drop_database(database)
+        self._db_cache = None
 
     def list_measurements(self, database: Optional[str] = None) -> List[str]:
         """
@@ -1930,6 +2673,17 @@ class InfluxdbOperation:
         result = self._client.get_list_retention_policies(db_to_use)
         return result
 
+    @staticmethod
+    def _max_count(point: Dict[str, Any]) -> int:
+        """
+        Numero de puntos de una fila de `SELECT COUNT(*)`: el mayor de sus
+        `count_<field>`, es decir, el del field mas completo.
+        """
+        return max(
+            (int(value) for key, value in point.items() if key.startswith('count_') and value),
+            default=0
+        )
+
     def count_points(self, measurement: str, database: Optional[str] = None,
                     start_time: Optional[str] = None, end_time: Optional[str] = None) -> int:
         """
@@ -1942,7 +2696,8 @@ class InfluxdbOperation:
             end_time: Tiempo de fin para el conteo (opcional).
 
         Returns:
-            Numero de puntos en la medicion.
+            Numero de puntos en la medicion: el mayor de sus `count_<field>`, igual
+            que en `count_points_by_measurement`.
 
         Ejemplos:
             >>> # Contar todos los puntos
@@ -1978,13 +2733,40 @@ class InfluxdbOperation:
         result = self._client.query(query)
         points = list(result.get_points())
 
-        if points:
-            # Obtener el primer valor de conteo disponible
-            for key, value in points[0].items():
-                if key.startswith('count_'):
-                    return int(value) if value is not None else 0
+        return self._max_count(points[0]) if points else 0
+
+    def count_points_by_measurement(self, database: Optional[str] = None) -> Dict[str, int]:
+        """
+        Cuenta los puntos de todas las mediciones de una base de datos con una
+        sola consulta (`SELECT COUNT(*) FROM /.*/`).
+
+        No cambia la base de datos activa (ni la crea si no existe).
+
+        Args:
+            database: Nombre de la base de datos (opcional si ya esta configurada).
+
+        Returns:
+            Diccionario {medicion: puntos}. Para cada medicion se toma el mayor de
+            sus `count_<field>`, es decir, el numero de puntos del field mas
+            completo. Las mediciones sin puntos no aparecen.
+
+        Ejemplos:
+            >>> counts = influx.count_points_by_measurement('mi_db')
+            >>> print(counts)
+            {'temperatura': 1440, 'humedad': 1380}
+        """
+        db_to_use = database or self._database
+        if db_to_use is None:
+            raise ValueError(
+                "Debe proporcionar una base de datos o establecerla mediante el metodo 'switch_database'."
+            )
 
-        return 0
+        result = self._client.query('SELECT COUNT(*) FROM /.*/', database=db_to_use)
+        counts: Dict[str, int] = {}
+        for (measurement, _), points in result.items():
+            for point in points:
+                counts[measurement] = self._max_count(point)
+        return counts
 
     def get_database_info(self, database: Optional[str] = None) -> Dict[str, Any]:
         """
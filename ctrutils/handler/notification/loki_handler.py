@@ -8,6 +8,8 @@ Características:
   - Envío de logs vía HTTP API
   - Soporte para labels personalizados (como en Prometheus)
   - Batching opcional para mejor performance
+  - Envío en un hilo en segundo plano (emit no espera a la red)
+  - Conexión HTTP persistente (keep-alive)
   - Manejo de errores robusto
   - Timeout configurable
 
@@ -32,7 +34,9 @@ API de Loki:
 
 import json
 import logging
+import queue
 import sys
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 
@@ -43,6 +47,11 @@ except ImportError:
     REQUESTS_AVAILABLE = False
 
 
+# Señales del hilo de envío: parada y vencimiento de flush_interval sin logs
+_STOP = object()
+_IDLE = object()
+
+
 class LokiHandler(logging.Handler):
     """
     Handler personalizado para enviar logs a Grafana Loki.
@@ -53,6 +62,8 @@ class LokiHandler(logging.Handler):
 
     **Características:**
       - Envío en tiempo real o con batching
+      - ``emit()`` solo encola el log: un hilo dedicado hace las peticiones HTTP,
+        de modo que el hilo que registra el log no espera la latencia de red
       - Labels personalizados por aplicación/servicio/entorno
       - Manejo de errores sin bloquear la aplicación
       - Timeout configurable
@@ -75,12 +86,19 @@ class LokiHandler(logging.Handler):
     :type timeout: int, optional
     :param batch_size: Número de logs a acumular antes de enviar (0 = sin batching). Defaults to 0.
     :type batch_size: int, optional
+    :param flush_interval: Segundos de inactividad tras los que el hilo de envío
+                           manda un batch incompleto. Defaults to 1.0.
+    :type flush_interval: float, optional
+    :param background: Si True, los logs se envían desde un hilo dedicado; si False,
+                       ``emit()`` hace la petición HTTP en el hilo que registra el log.
+                       Defaults to True.
+    :type background: bool, optional
 
     :ivar url: URL del endpoint de push de Loki.
     :ivar labels: Labels asociados a este handler.
     :ivar timeout: Timeout configurado para las peticiones HTTP.
     :ivar batch_size: Tamaño del batch configurado.
-    :ivar batch: Lista temporal para acumular logs (si batching está habilitado).
+    :ivar batch: Lista temporal para acumular logs (batching sin hilo de envío).
 
     Ejemplo básico:
     ---------------
@@ -134,6 +152,9 @@ class LokiHandler(logging.Handler):
         logger.info("Aplicación en producción iniciada")
     """
 
+    # Máximo de logs por petición cuando no hay batching
+    MAX_COALESCE = 1000
+
     def __init__(
         self,
         url: str,
@@ -141,6 +162,8 @@ class LokiHandler(logging.Handler):
         level: int = logging.INFO,
         timeout: int = 5,
         batch_size: int = 0,
+        flush_interval: float = 1.0,
+        background: bool = True,
     ) -> None:
         """
         Inicializa el LokiHandler.
@@ -150,6 +173,8 @@ class LokiHandler(logging.Handler):
         :param level: Nivel mínimo de log.
         :param timeout: Timeout en segundos para las peticiones HTTP.
         :param batch_size: Número de logs a acumular antes de enviar (0 = sin batching).
+        :param flush_interval: Segundos de inactividad antes de enviar un batch incompleto.
+        :param background: Si True, envía los logs desde un hilo dedicado.
         """
         super().__init__(level)
 
@@ -164,8 +189,19 @@ class LokiHandler(logging.Handler):
         self.labels = labels
         self.timeout = timeout
         self.batch_size = batch_size
+        self.flush_interval = flush_interval
         self.batch: List[Tuple[str, str]] = []  # [(timestamp_ns, message), ...]
 
+        # Sesión persistente: reutiliza la conexión (y el handshake TLS) entre envíos
+        self._session = requests.Session()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._sender: Optional[threading.Thread] = None
+        if background:
+            self._sender = threading.Thread(
+                target=self._run, name="LokiHandler-sender", daemon=True
+            )
+            self._sender.start()
+
     def emit(self, record: logging.LogRecord) -> None:
         """
         Envía el mensaje de log a Loki.
@@ -173,8 +209,9 @@ class LokiHandler(logging.Handler):
         Este método es llamado automáticamente por el logger cuando se registra
         un mensaje que cumple con el nivel mínimo configurado.
 
-        Si el batching está habilitado, acumula los logs hasta alcanzar batch_size
-        antes de enviarlos. Si no, envía inmediatamente.
+        Con el hilo de envío activo solo encola el log y retorna. Sin él, si el
+        batching está habilitado, acumula los logs hasta alcanzar batch_size
+        antes de enviarlos; si no, envía inmediatamente.
 
         :param record: Registro de log a enviar.
         :type record: logging.LogRecord
@@ -183,7 +220,9 @@ class LokiHandler(logging.Handler):
             log_entry = self.format(record)
             timestamp_ns = str(int(time.time() * 1e9))  # Nanosegundos
 
-            if self.batch_size > 0:
+            if self._sender_alive():
+                self._queue.put((timestamp_ns, log_entry))
+            elif self.batch_size > 0:
                 # Modo batching
                 self.batch.append((timestamp_ns, log_entry))
                 if len(self.batch) >= self.batch_size:
@@ -196,6 +235,54 @@ class LokiHandler(logging.Handler):
             # No queremos que un error en logging rompa la aplicación
             print(f"Error al enviar log a Loki: {e}", file=sys.stderr)
 
+    def _sender_alive(self) -> bool:
+        """
+        Indica si el hilo de envío está activo.
+        """
+        return self._sender is not None and self._sender.is_alive()
+
+    def _run(self) -> None:
+        """
+        Bucle del hilo de envío.
+
+        Agrupa los logs encolados hasta ``batch_size`` (sin batching, hasta
+        ``MAX_COALESCE`` de los que ya estén en cola) y los envía en una sola
+        petición. Un batch incompleto se envía tras ``flush_interval`` segundos sin
+        logs nuevos. Una petición de flush (``threading.Event``) se confirma tras
+        enviar lo pendiente y ``_STOP`` detiene el hilo. Un error al enviar se
+        informa por stderr y descarta ese batch, pero no detiene el hilo.
+        """
+        pending: List[Tuple[str, str]] = []
+        limit = self.batch_size if self.batch_size > 0 else self.MAX_COALESCE
+        while True:
+            try:
+                control = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                control = _IDLE
+
+            while isinstance(control, tuple):
+                pending.append(control)
+                if len(pending) >= limit:
+                    control = None
+                    break
+                try:
+                    control = self._queue.get_nowait()
+                except queue.Empty:
+                    control = None
+
+            if pending and (control is not None or len(pending) >= limit or self.batch_size == 0):
+                try:
+                    self._send_to_loki(pending)
+                except Exception as e:
+                    # Si el hilo muriera, la cola crecería sin que nadie la vacíe
+                    print(f"Error al enviar logs a Loki: {e}", file=sys.stderr)
+                pending = []
+
+            if control is _STOP:
+                return
+            if isinstance(control, threading.Event):
+                control.set()
+
     def _send_batch(self) -> None:
         """
         Envía el batch acumulado de logs a Loki y limpia el batch.
@@ -220,7 +307,7 @@ class LokiHandler(logging.Handler):
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.url,
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -245,6 +332,9 @@ class LokiHandler(logging.Handler):
         """
         Fuerza el envío de todos los logs pendientes en el batch.
 
+        Con el hilo de envío activo, espera a que se hayan enviado todos los logs
+        encolados hasta el momento.
+
         Este método debe ser llamado antes de cerrar la aplicación si se usa batching,
         para asegurar que todos los logs se envíen.
 
@@ -260,15 +350,26 @@ class LokiHandler(logging.Handler):
             # Asegurar que se envíen los logs pendientes al cerrar
             atexit.register(loki_handler.flush)
         """
+        if self._sender_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            # Si el hilo muere antes de confirmar, no se espera indefinidamente
+            while not done.wait(0.1):
+                if not self._sender_alive():
+                    break
         if self.batch_size > 0:
             self._send_batch()
         super().flush()
 
     def close(self) -> None:
         """
-        Cierra el handler enviando los logs pendientes.
+        Cierra el handler enviando los logs pendientes y detiene el hilo de envío.
         """
+        if self._sender_alive():
+            self._queue.put(_STOP)
+            self._sender.join()
         self.flush()
+        self._session.close()
         super().close()
 
 
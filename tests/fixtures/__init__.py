@@ -1,9 +1,11 @@
 """Fixtures compartidos para tests."""
+import functools
 import os
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, Iterable, Optional
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
 
 def get_test_config() -> Dict[str, Any]:
@@ -16,60 +18,130 @@ def get_test_config() -> Dict[str, Any]:
     - INFLUXDB_TEST_USER
     - INFLUXDB_TEST_PASSWORD
     - INFLUXDB_TEST_DATABASE
+
+    Con pytest-xdist (`pytest -n N`) cada worker usa su propia base de datos
+    (`<database>_<worker>`) para que los tests en paralelo no se pisen.
     """
+    database = os.getenv('INFLUXDB_TEST_DATABASE', 'test_db')
+    worker = os.getenv('PYTEST_XDIST_WORKER')
+    if worker:
+        database = f"{database}_{worker}"
+
     return {
         'host': os.getenv('INFLUXDB_TEST_HOST', 'localhost'),
         'port': int(os.getenv('INFLUXDB_TEST_PORT', 8086)),
         'username': os.getenv('INFLUXDB_TEST_USER', 'admin'),
         'password': os.getenv('INFLUXDB_TEST_PASSWORD', 'admin'),
-        'database': os.getenv('INFLUXDB_TEST_DATABASE', 'test_db'),
+        'database': database,
     }
 
 
+# Escrituras de datos semilla por (base de datos, measurement)
+SEED_WRITES: Counter = Counter()
+
+
+def clear_database(op: Any, database: str, measurements: Optional[Iterable[str]] = None) -> None:
+    """
+    Elimina series de una base de datos con una sola consulta.
+
+    Args:
+        op: Instancia de InfluxdbOperation
+        database: Base de datos a vaciar
+        measurements: Measurements a vaciar (None = todas)
+    """
+    if measurements is None:
+        op.get_client.query('DROP SERIES FROM /.*/', database=database)
+        return
+    names = sorted(measurements)
+    if names:
+        source = ', '.join(f'"{name}"' for name in names)
+        op.get_client.query(f'DROP SERIES FROM {source}', database=database)
+
+
+def write_seed_dataframe(op: Any, measurement: str, database: str, rows: int = 1000) -> pd.DataFrame:
+    """
+    Escribe el DataFrame de referencia compartido por los tests de lectura.
+
+    Cada escritura se contabiliza en `SEED_WRITES` para comprobar que una clase
+    siembra sus datos una sola vez.
+
+    Args:
+        op: Instancia de InfluxdbOperation
+        measurement: Measurement de destino
+        database: Base de datos de destino
+        rows: Numero de filas (numericas, con NaNs)
+
+    Returns:
+        DataFrame escrito
+    """
+    df = create_sample_dataframe(rows=rows, with_nans=True)
+    op.write_dataframe(df, measurement=measurement, database=database)
+    SEED_WRITES[(database, measurement)] += 1
+    return df
+
+
 def create_sample_dataframe(
     rows: int = 100,
     with_nans: bool = False,
     with_infs: bool = False,
     numeric_only: bool = True,
+    seed: int = 42,
 ) -> pd.DataFrame:
     """
     Crea un DataFrame de ejemplo para tests.
 
+    Los DataFrames se generan una sola vez por combinacion de parametros y se
+    comparten entre tests: hacer `df.copy()` antes de modificarlo.
+
     Args:
         rows: Numero de filas
         with_nans: Si incluir valores NaN
         with_infs: Si incluir valores infinitos
         numeric_only: Si solo incluir columnas numericas
+        seed: Semilla del generador aleatorio (datos reproducibles)
 
     Returns:
         DataFrame de prueba con timestamp como index
     """
+    return _build_sample_dataframe(rows, with_nans, with_infs, numeric_only, seed)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_sample_dataframe(
+    rows: int,
+    with_nans: bool,
+    with_infs: bool,
+    numeric_only: bool,
+    seed: int,
+) -> pd.DataFrame:
+    """Genera el DataFrame de `create_sample_dataframe` (cacheado)."""
+    rng = np.random.default_rng(seed)
+
     # Crear timestamps
-    start_date = datetime(2024, 1, 1)
-    timestamps = [start_date + timedelta(minutes=i) for i in range(rows)]
+    timestamps = pd.date_range(start=datetime(2024, 1, 1), periods=rows, freq='1min')
 
     data = {
-        'temperature': np.random.uniform(20, 30, rows),
-        'humidity': np.random.uniform(40, 60, rows),
-        'pressure': np.random.uniform(1000, 1020, rows),
+        'temperature': rng.uniform(20, 30, rows),
+        'humidity': rng.uniform(40, 60, rows),
+        'pressure': rng.uniform(1000, 1020, rows),
     }
 
     if not numeric_only:
         data['location'] = ['site_A' if i % 2 == 0 else 'site_B' for i in range(rows)]
-        data['status'] = np.random.choice(['ok', 'warning', 'error'], rows)
+        data['status'] = rng.choice(['ok', 'warning', 'error'], rows)
 
     df = pd.DataFrame(data, index=timestamps)
     df.index.name = 'time'
 
     # Añadir NaNs
     if with_nans:
-        nan_indices = np.random.choice(rows, size=rows // 10, replace=False)
+        nan_indices = rng.choice(rows, size=rows // 10, replace=False)
         for col in ['temperature', 'humidity']:
             df.loc[df.index[nan_indices[:len(nan_indices)//2]], col] = np.nan
 
     # Añadir infinitos
     if with_infs:
-        inf_indices = np.random.choice(rows, size=rows // 20, replace=False)
+        inf_indices = rng.choice(rows, size=rows // 20, replace=False)
         df.loc[df.index[inf_indices[:len(inf_indices)//2]], 'temperature'] = np.inf
         df.loc[df.index[inf_indices[len(inf_indices)//2:]], 'temperature'] = -np.inf
 
@@ -1,10 +1,39 @@
 import math
+import operator
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from unittest.mock import Mock, MagicMock
 from influxdb import InfluxDBClient
 
+_BASE_INDEX_10 = pd.date_range(start='2024-01-01', periods=10, freq='1min')
+
+_ISO_TIMES_5 = tuple(
+    (datetime(2024, 1, 1, 12, 0, 0) + timedelta(minutes=i)).isoformat() for i in range(5)
+)
+
+# Attribute names resolved once; a list spec skips Mock's per-instance class introspection.
+_INFLUX_CLIENT_SPEC = dir(InfluxDBClient)
+
+_TAG_LUT = np.array([f'value_{k}' for k in range(5)], dtype=object)
+
+
+class _FakeResult:
+    """Lightweight stand-in for a ResultSet exposing ``raw`` and ``get_points()``."""
+
+    __slots__ = ('raw', '_points')
+
+    def __init__(self, raw, points):
+        self.raw = raw
+        self._points = points
+
+    def get_points(self):
+        return iter(self._points)
+
+    def __iter__(self):
+        return iter([self])
+
 
 def create_mock_influxdb_client(
     ping_return=True,
@@ -14,7 +43,7 @@ def create_mock_influxdb_client(
     get_list_database_return=None,
     drop_database_return=None,
 ):
-    mock_client = Mock(spec=InfluxDBClient)
+    mock_client = Mock(spec=_INFLUX_CLIENT_SPEC)
     mock_client.ping.return_value = ping_return
     mock_client.create_database.return_value = create_database_return
     mock_client.write_points.return_value = write_points_return
@@ -30,53 +59,59 @@ def create_mock_influxdb_client(
 
 
 def create_edge_case_dataframe(case_type='infinity'):
-    base_time = pd.date_range(start='2024-01-01', periods=10, freq='1min')
+    # DatetimeIndex is immutable, so the shared index is safe to reuse
+    base_time = _BASE_INDEX_10
 
     if case_type == 'infinity':
         data = {
-            'value1': [float('inf'), -float('inf'), 1.0, 2.0, float('inf'),
-                      -float('inf'), 3.0, 4.0, float('inf'), -float('inf')],
-            'value2': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+            'value1': np.array([float('inf'), -float('inf'), 1.0, 2.0, float('inf'),
+                                -float('inf'), 3.0, 4.0, float('inf'), -float('inf')], dtype=np.float64),
+            'value2': np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0], dtype=np.float64)
         }
     elif case_type == 'all_nan':
         data = {
-            'value1': [np.nan] * 10,
-            'value2': [None] * 10
+            'value1': np.full(10, np.nan, dtype=np.float64),
+            'value2': np.full(10, None, dtype=object)
         }
     elif case_type == 'mixed_nan':
         data = {
-            'value1': [np.nan, pd.NA, None, 1.0, math.nan, 2.0, np.nan, pd.NA, None, 3.0],
-            'value2': [1.0, np.nan, None, pd.NA, math.nan, 4.0, 5.0, np.nan, None, 6.0]
+            'value1': np.array([np.nan, pd.NA, None, 1.0, math.nan, 2.0, np.nan, pd.NA, None, 3.0],
+                               dtype=object),
+            'value2': np.array([1.0, np.nan, None, pd.NA, math.nan, 4.0, 5.0, np.nan, None, 6.0],
+                               dtype=object)
         }
     elif case_type == 'empty':
         data = {
-            'value1': [],
-            'value2': []
+            'value1': np.array([], dtype=np.float64),
+            'value2': np.array([], dtype=np.float64)
         }
         base_time = pd.DatetimeIndex([])
     elif case_type == 'large_numbers':
         data = {
-            'value1': [1e308, -1e308, 1e-308, -1e-308, 1e100, -1e100, 1e-100, -1e-100, 0.0, 1.0],
-            'value2': [np.finfo(np.float64).max, np.finfo(np.float64).min, 0.0, 1.0, -1.0,
-                      np.finfo(np.float32).max, np.finfo(np.float32).min, 100.0, 200.0, 300.0]
+            'value1': np.array([1e308, -1e308, 1e-308, -1e-308, 1e100, -1e100, 1e-100, -1e-100, 0.0, 1.0],
+                               dtype=np.float64),
+            'value2': np.array([np.finfo(np.float64).max, np.finfo(np.float64).min, 0.0, 1.0, -1.0,
+                                np.finfo(np.float32).max, np.finfo(np.float32).min, 100.0, 200.0, 300.0],
+                               dtype=np.float64)
         }
     elif case_type == 'unicode':
         data = {
-            'sensor': ['température', '温度', 'температура', 'θερμοκρασία', '🌡️',
-                      'café', '北京', 'Москва', 'Αθήνα', 'emoji😀'],
-            'location': ['París', '东京', 'Москва́', 'Ελλάδα', 'Test🏠',
-                        'España', '上海', 'Сибирь', 'Κρήτη', 'Unicode✅']
+            'sensor': np.array(['température', '温度', 'температура', 'θερμοκρασία', '🌡️',
+                                'café', '北京', 'Москва', 'Αθήνα', 'emoji😀'], dtype=object),
+            'location': np.array(['París', '东京', 'Москва́', 'Ελλάδα', 'Test🏠',
+                                  'España', '上海', 'Сибирь', 'Κρήτη', 'Unicode✅'], dtype=object)
         }
     elif case_type == 'empty_strings':
         data = {
-            'value1': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-            'tag1': ['', '   ', '\t', '\n', 'valid', '', '  \t  ', '\n\n', 'test', '']
+            'value1': np.arange(1.0, 11.0),
+            'tag1': np.array(['', '   ', '\t', '\n', 'valid', '', '  \t  ', '\n\n', 'test', ''],
+                             dtype=object)
         }
     elif case_type == 'special_chars':
         data = {
-            'value1': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-            'tag1': ['key=value', 'a,b,c', 'x y z', 'a"b"c', "a'b'c",
-                    'a\\b\\c', 'a/b/c', 'a|b|c', 'a&b&c', 'a;b;c']
+            'value1': np.arange(1.0, 11.0),
+            'tag1': np.array(['key=value', 'a,b,c', 'x y z', 'a"b"c', "a'b'c",
+                              'a\\b\\c', 'a/b/c', 'a|b|c', 'a&b&c', 'a;b;c'], dtype=object)
         }
     elif case_type == 'numpy_types':
         data = {
@@ -89,28 +124,26 @@ def create_edge_case_dataframe(case_type='infinity'):
         }
     elif case_type == 'boolean':
         data = {
-            'bool_val': [True, False, True, False, True, False, True, False, True, False],
+            'bool_val': np.array([True, False, True, False, True, False, True, False, True, False], dtype=bool),
             'np_bool': np.array([True, False, True, False, True, False, True, False, True, False], dtype=bool)
         }
     else:
         data = {
-            'value1': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0],
-            'value2': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+            'value1': np.arange(1.0, 11.0),
+            'value2': np.arange(10.0, 101.0, 10.0)
         }
 
-    df = pd.DataFrame(data, index=base_time)
+    df = pd.DataFrame(data, index=base_time, copy=False)
     return df
 
 
 def create_edge_case_points(case_type='infinity'):
-    base_time = datetime(2024, 1, 1, 12, 0, 0)
-
     if case_type == 'infinity':
         points = [
             {
                 "measurement": "test",
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": float('inf') if i % 2 == 0 else -float('inf')}
             }
             for i in range(5)
@@ -120,7 +153,7 @@ def create_edge_case_points(case_type='infinity'):
             {
                 "measurement": "test",
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": np.nan}
             }
             for i in range(5)
@@ -130,20 +163,23 @@ def create_edge_case_points(case_type='infinity'):
             {
                 "measurement": "test",
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {}
             }
             for i in range(5)
         ]
     elif case_type == 'mixed_valid_invalid':
+        idx = np.arange(5)
+        value1 = np.where(idx % 2 == 0, 1.0, np.nan).tolist()
+        value2 = np.where(idx % 3 == 0, 2.0, None).tolist()
         points = [
             {
                 "measurement": "test",
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {
-                    "value1": 1.0 if i % 2 == 0 else np.nan,
-                    "value2": 2.0 if i % 3 == 0 else None,
+                    "value1": value1[i],
+                    "value2": value2[i],
                     "value3": 3.0
                 }
             }
@@ -158,7 +194,7 @@ def create_edge_case_points(case_type='infinity'):
                     "sensor": "a,b,c",
                     "device": 'x"y"z'
                 },
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": float(i)}
             }
             for i in range(5)
@@ -168,7 +204,7 @@ def create_edge_case_points(case_type='infinity'):
             {
                 "measurement": "température_capteur",
                 "tags": {"location": "París", "device": "温度计"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": float(i), "label": f"測試{i}"}
             }
             for i in range(5)
@@ -179,7 +215,7 @@ def create_edge_case_points(case_type='infinity'):
         points = [
             {
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": float(i)}
             }
             for i in range(5)
@@ -189,7 +225,7 @@ def create_edge_case_points(case_type='infinity'):
             {
                 "measurement": "test",
                 "tags": {"location": "lab"},
-                "time": (base_time + timedelta(minutes=i)).isoformat(),
+                "time": _ISO_TIMES_5[i],
                 "fields": {"value": float(i)}
             }
             for i in range(5)
@@ -270,8 +306,8 @@ def create_retention_policy_scenarios():
     ]
 
 
-def create_value_normalization_test_cases():
-    return [
+_VALUE_NORM_CASES = tuple(
+    MappingProxyType(case) for case in (
         {'value': None, 'expected': None, 'description': 'None value'},
         {'value': np.nan, 'expected': None, 'description': 'numpy.nan'},
         {'value': pd.NA, 'expected': None, 'description': 'pandas.NA'},
@@ -300,7 +336,32 @@ def create_value_normalization_test_cases():
         {'value': 'Москва', 'expected': 'Москва', 'description': 'Cyrillic characters'},
         {'value': 'café', 'expected': 'café', 'description': 'accented characters'},
         {'value': '🌡️', 'expected': '🌡️', 'description': 'emoji'},
-    ]
+    )
+)
+
+
+def create_value_normalization_test_cases():
+    """Return the shared, read-only value normalization cases."""
+    return _VALUE_NORM_CASES
+
+
+_NULL_RETURN_ATTRS = {
+    f'{method}.return_value': None
+    for method in (
+        'create_database',
+        'drop_database',
+        'switch_database',
+        'close',
+        'drop_measurement',
+    )
+}
+
+_QUERY_ATTR_BUILDERS = {
+    'error': lambda results, error: {'query.side_effect': error},
+    'sequence': lambda results, error: {'query.side_effect': results},
+    'single': lambda results, error: {'query.return_value': results},
+    'default': lambda results, error: {'query.return_value': MagicMock()},
+}
 
 
 def create_comprehensive_mock_client(
@@ -324,35 +385,28 @@ def create_comprehensive_mock_client(
         error_on_query: Exception to raise on query()
         error_on_write: Exception to raise on write_points()
     """
-    mock_client = Mock(spec=InfluxDBClient)
-
-    mock_client.ping.return_value = ping_success
-    mock_client.write_points.return_value = write_success
-
-    if error_on_write:
-        mock_client.write_points.side_effect = error_on_write
-
     if error_on_query:
-        mock_client.query.side_effect = error_on_query
-    elif query_results is not None:
-        if isinstance(query_results, list):
-            mock_client.query.side_effect = query_results
-        else:
-            mock_client.query.return_value = query_results
+        query_mode = 'error'
+    elif query_results is None:
+        query_mode = 'default'
+    elif isinstance(query_results, list):
+        query_mode = 'sequence'
     else:
-        mock_client.query.return_value = MagicMock()
-
-    if databases is None:
-        databases = [{'name': 'test_db'}]
-    mock_client.get_list_database.return_value = databases
-
-    mock_client.create_database.return_value = None
-    mock_client.drop_database.return_value = None
-    mock_client.switch_database.return_value = None
-    mock_client.close.return_value = None
-    mock_client.drop_measurement.return_value = None
+        query_mode = 'single'
+
+    attrs = {
+        'ping.return_value': ping_success,
+        'write_points.return_value': write_success,
+        'get_list_database.return_value': (
+            databases if databases is not None else [{'name': 'test_db'}]
+        ),
+        **_NULL_RETURN_ATTRS,
+        **_QUERY_ATTR_BUILDERS[query_mode](query_results, error_on_query),
+    }
+    if error_on_write:
+        attrs['write_points.side_effect'] = error_on_write
 
-    return mock_client
+    return Mock(spec=_INFLUX_CLIENT_SPEC, **attrs)
 
 
 def create_mock_query_result(points_data=None, raw_data=None):
@@ -363,31 +417,26 @@ def create_mock_query_result(points_data=None, raw_data=None):
         points_data: List of point dicts with 'time' and field keys
         raw_data: Raw data dict if you want full control
     """
-    mock_result = MagicMock()
-
     if raw_data:
-        mock_result.raw = raw_data
+        raw = raw_data
     elif points_data:
-        mock_result.raw = {
+        non_time_keys = [k for k in points_data[0].keys() if k != 'time']
+        if non_time_keys:
+            getter = operator.itemgetter('time', *non_time_keys)
+            values = [list(getter(p)) for p in points_data]
+        else:
+            values = [[p['time']] for p in points_data]
+        raw = {
             'series': [{
                 'name': 'test_measurement',
-                'columns': ['time'] + list(points_data[0].keys() - {'time'}),
-                'values': [[p['time']] + [p[k] for k in points_data[0].keys() if k != 'time']
-                          for p in points_data]
+                'columns': ['time'] + non_time_keys,
+                'values': values
             }]
         }
     else:
-        mock_result.raw = {'series': []}
-
-    def get_points():
-        if points_data:
-            return iter(points_data)
-        return iter([])
+        raw = {'series': []}
 
-    mock_result.get_points.side_effect = get_points
-    mock_result.__iter__ = lambda self: iter([mock_result])
-
-    return mock_result
+    return _FakeResult(raw, points_data or [])
 
 
 def create_test_dataframe(
@@ -420,22 +469,30 @@ def create_test_dataframe(
 
     data = {}
 
+    values = np.random.standard_normal((num_fields, rows)) * 100
+    num_nans = int(rows * nan_percentage) if with_nans else 0
+    if num_nans:
+        # k unique rows per field in one vectorized pass over the whole buffer
+        nan_indices = np.argpartition(
+            np.random.random((num_fields, rows)), num_nans - 1, axis=1
+        )[:, :num_nans]
+        np.put_along_axis(values, nan_indices, np.nan, axis=1)
+
     for i in range(num_fields):
-        values = np.random.randn(rows) * 100
-        if with_nans:
-            nan_indices = np.random.choice(rows, int(rows * nan_percentage), replace=False)
-            values[nan_indices] = np.nan
-        data[f'field_{i+1}'] = values
+        data[f'field_{i+1}'] = values[i]
 
-    for i in range(num_tags):
-        data[f'tag_{i+1}'] = [f'value_{j % 5}' for j in range(rows)]
+    if num_tags:
+        tag_positions = np.arange(rows) % len(_TAG_LUT)
+        for i in range(num_tags):
+            # fancy indexing gives every tag column its own array
+            data[f'tag_{i+1}'] = _TAG_LUT[tag_positions]
 
     if mixed_types:
-        data['int_field'] = np.random.randint(0, 100, rows)
-        data['bool_field'] = np.random.choice([True, False], rows)
-        data['str_field'] = [f'string_{i}' for i in range(rows)]
+        data['int_field'] = np.random.randint(0, 100, rows, dtype=np.int64)
+        data['bool_field'] = np.random.random(rows) < 0.5
+        data['str_field'] = np.char.add('string_', np.arange(rows).astype('U')).astype(object)
 
-    df = pd.DataFrame(data, index=time_index)
+    df = pd.DataFrame(data, index=time_index, copy=False)
     return df
 
 
@@ -469,19 +526,16 @@ def create_measurements_list_response(measurement_names=None):
     if measurement_names is None:
         measurement_names = ['cpu', 'memory', 'disk', 'network']
 
-    mock_result = MagicMock()
-    mock_result.raw = {
+    raw = {
         'series': [{
             'name': 'measurements',
             'columns': ['name'],
-            'values': [[name] for name in measurement_names]
+            'values': np.asarray(measurement_names, dtype=object).reshape(-1, 1).tolist()
         }]
     }
 
     points = [{'name': name} for name in measurement_names]
-    mock_result.get_points.return_value = iter(points)
-
-    return mock_result
+    return _FakeResult(raw, points)
 
 
 def create_tag_keys_response(tag_keys=None):
@@ -489,19 +543,16 @@ def create_tag_keys_response(tag_keys=None):
     if tag_keys is None:
         tag_keys = ['host', 'region', 'datacenter']
 
-    mock_result = MagicMock()
-    mock_result.raw = {
+    raw = {
         'series': [{
             'name': 'cpu',
             'columns': ['tagKey'],
-            'values': [[key] for key in tag_keys]
+            'values': np.asarray(tag_keys, dtype=object).reshape(-1, 1).tolist()
         }]
     }
 
     points = [{'tagKey': key} for key in tag_keys]
-    mock_result.get_points.return_value = iter(points)
-
-    return mock_result
+    return _FakeResult(raw, points)
 
 
 def create_field_keys_response(field_keys=None):
@@ -514,19 +565,16 @@ def create_field_keys_response(field_keys=None):
             ('count', 'integer'),
         ]
 
-    mock_result = MagicMock()
-    mock_result.raw = {
+    raw = {
         'series': [{
             'name': 'cpu',
             'columns': ['fieldKey', 'fieldType'],
-            'values': list(field_keys)
+            'values': np.asarray(field_keys, dtype=object).reshape(-1, 2).tolist()
         }]
     }
 
     points = [{'fieldKey': k, 'fieldType': t} for k, t in field_keys]
-    mock_result.get_points.return_value = iter(points)
-
-    return mock_result
+    return _FakeResult(raw, points)
 
 
 def create_retention_policies_response(policies=None):
@@ -539,21 +587,17 @@ def create_retention_policies_response(policies=None):
              'replicaN': 1, 'default': False},
         ]
 
-    mock_result = MagicMock()
     columns = ['name', 'duration', 'shardGroupDuration', 'replicaN', 'default']
-    values = [[p['name'], p['duration'], p['shardGroupDuration'], p['replicaN'], p['default']]
-              for p in policies]
+    values = list(map(list, map(operator.itemgetter(*columns), policies)))
 
-    mock_result.raw = {
+    raw = {
         'series': [{
             'columns': columns,
             'values': values
         }]
     }
 
-    mock_result.get_points.return_value = iter(policies)
-
-    return mock_result
+    return _FakeResult(raw, policies)
 
 
 def create_continuous_queries_response(queries=None):
@@ -563,8 +607,7 @@ def create_continuous_queries_response(queries=None):
             {'name': 'cq_30m', 'query': 'CREATE CONTINUOUS QUERY cq_30m ON test_db BEGIN SELECT mean(value) INTO mean_30m FROM data GROUP BY time(30m) END'},
         ]
 
-    mock_result = MagicMock()
-    mock_result.raw = {
+    raw = {
         'series': [{
             'name': 'test_db',
             'columns': ['name', 'query'],
@@ -572,6 +615,4 @@ def create_continuous_queries_response(queries=None):
         }]
     }
 
-    mock_result.get_points.return_value = iter(queries)
-
-    return mock_result
+    return _FakeResult(raw, queries)
@@ -2,6 +2,11 @@ import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
+# Reference time captured once at import; pass ``ref`` for a fresh "now".
+# Future cases stay at least a day ahead so they remain valid for the
+# whole test session.
+_FROZEN_NOW = datetime.now()
+
 
 def mock_job_success():
     time.sleep(0.01)
@@ -133,12 +138,12 @@ def create_interval_test_cases():
     ]
 
 
-def create_date_schedule_test_cases():
-    now = datetime.now()
+def create_date_schedule_test_cases(ref=None):
+    now = ref or _FROZEN_NOW
     return [
-        {'date': now + timedelta(seconds=5), 'valid': True, 'description': 'future date'},
-        {'date': now + timedelta(hours=1), 'valid': True, 'description': 'future hour'},
         {'date': now + timedelta(days=1), 'valid': True, 'description': 'future day'},
+        {'date': now + timedelta(weeks=1), 'valid': True, 'description': 'future week'},
+        {'date': now + timedelta(days=365), 'valid': True, 'description': 'future year'},
         {'date': now - timedelta(hours=1), 'valid': False, 'description': 'past date'},
         {'date': now - timedelta(days=1), 'valid': False, 'description': 'past day'},
         {'date': None, 'valid': False, 'description': 'None date'},
@@ -1,102 +1,413 @@
+import asyncio
+import glob
+import gzip
+import hashlib
+import io
+import json
 import logging
+import math
+import os
+import queue
+import random
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, IO, Iterator, List, Optional, Set, Tuple, Callable, Union
+from datetime import datetime, timedelta
+
+import requests
+from influxdb.exceptions import InfluxDBClientError, InfluxDBServerError
+from requests.adapters import HTTPAdapter
 
 from ctrutils.database.influxdb import InfluxdbOperation
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Failures worth retrying: the server or the network may recover
+_TRANSIENT_ERRORS: Tuple[type, ...] = (
+    requests.Timeout,
+    requests.ConnectionError,
+    InfluxDBServerError
+)
+if AIOHTTP_AVAILABLE:
+    _TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
 logger = logging.getLogger(__name__)
 
+# Level 1 gzip: most of the size reduction for a fraction of the CPU cost
+_GZIP_FAST = {'method': 'gzip', 'compresslevel': 1}
+
+# Keep-alive pool of the shared HTTP session: hosts cached / connections per host
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 64
+
+# influxd's portable backup format exists since InfluxDB 1.5 and is 1.x only
+_PORTABLE_MIN_VERSION = (1, 5)
+
+# Destination database/measurement recording the fingerprint of every
+# measurement restored, and the point count it left, for incremental restores
+_MARKER_DATABASE = '_backup_markers'
+_MARKER_MEASUREMENT = 'restore_markers'
+
+# Per-database catalog of finished measurement backups, one JSON object per line
+_MANIFEST_SUFFIX = '.manifest.jsonl'
+_MANIFEST_NAME = re.compile(r'(?P<database>.+)_(?P<timestamp>\d{8}_\d{6})\.manifest\.jsonl')
+
+# Userspace buffer of backup files, so the OS sees large sequential writes
+_WRITE_BUFFER = 1 << 20
+
+# Points fetched per chunk when exporting a measurement as line protocol
+_EXPORT_CHUNK_SIZE = 10000
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a manifest entry, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(data: str) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _typed_field_value(value: Any, field_type: Optional[str]) -> Any:
+    """
+    Coerce a queried field value to its schema type; None when it cannot be
+    written. JSON responses return whole floats as ints, which would otherwise
+    be written back as integers and conflict with the existing field
+    """
+    if value is None:
+        return None
+    if field_type == 'integer' and not isinstance(value, bool):
+        return int(value)
+    if field_type == 'float' and not isinstance(value, bool):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    return value
+
 
 class BackupManager:
-    """Manages backup and restore operations between InfluxDB instances"""
+    """
+    Manages backup and restore operations between InfluxDB instances
+
+    Use it as a context manager (or call close()) to release the HTTP
+    session and the clients built by the factories, and to give the
+    source/dest operations back their own sessions
+    """
 
     def __init__(
         self,
         source_op: InfluxdbOperation,
         dest_op: InfluxdbOperation,
-        backup_dir: str = '/app/backup_data'
+        backup_dir: str = '/app/backup_data',
+        max_workers: int = 8,
+        restore_batch_size: int = 10000,
+        compress: bool = True,
+        backup_format: str = 'line',
+        rpc_port: int = 8088,
+        incremental: bool = False,
+        backup_window: Optional[timedelta] = timedelta(days=1),
+        restore_concurrency: int = 32,
+        durability: str = 'strict',
+        retry_attempts: int = 5,
+        retry_max_delay: float = 30.0,
+        source_factory: Optional[Callable[[], InfluxdbOperation]] = None,
+        dest_factory: Optional[Callable[[], InfluxdbOperation]] = None,
+        session: Optional[requests.Session] = None,
+        dest_url: Optional[str] = None,
+        dest_username: Optional[str] = None,
+        dest_password: Optional[str] = None,
+        verify_ssl: bool = True
     ):
-        self.source = source_op
-        self.dest = dest_op
+        """
+        Args:
+            source_op: Operation used against the source instance
+            dest_op: Operation used against the destination instance
+            backup_dir: Directory where backup files are written
+            max_workers: Threads used per database for measurement work
+            restore_batch_size: Points per write request on restore; InfluxDB
+                ingests best with batches of roughly 5k-25k points
+            compress: Write gzip-compressed (level 1) backups
+            backup_format: 'line' stores raw line protocol that is POSTed
+                back verbatim on restore; 'csv' goes through
+                backup_measurement/restore_measurement; 'portable' shells
+                out to `influxd backup/restore -portable` (native TSM
+                shards) when influxd is installed and both servers run
+                1.5+ 1.x, and behaves like 'line' otherwise
+            rpc_port: Port of the servers' backup/restore RPC service
+                (bind-address), used by the portable format
+            incremental: Skip restoring measurements whose backup files
+                fingerprint matches the last one restored to the destination
+            backup_window: Time span of each line protocol chunk file; large
+                measurements are exported window by window so neither the
+                server nor the client holds more than one window at a time.
+                None exports each measurement as a single file
+            restore_concurrency: Write requests kept in flight per database
+                when restoring line protocol with aiohttp
+            durability: 'strict' fsyncs every backup file and the manifest
+                once the whole database is written; 'relaxed' leaves
+                writeback to the OS
+            retry_attempts: Attempts per InfluxDB call before a timeout,
+                connection error or 5xx is reported as an error
+            retry_max_delay: Upper bound in seconds of the jittered
+                exponential backoff between attempts
+            source_factory: Builds a fresh source operation; enables
+                running several databases concurrently
+            dest_factory: Builds a fresh destination operation
+            session: HTTP session shared by every client; one with a
+                keep-alive pool is created when omitted. It is injected into
+                source_op, dest_op and every operation the factories build,
+                so connections are reused across databases instead of each
+                operation opening its own. Factories must not pass it to
+                InfluxDBClient themselves: the client mounts its own adapter
+                on the session it is built with, replacing the shared pool
+            dest_url: Base URL of the destination (e.g. http://host:8086)
+                used by the aiohttp line protocol restore. Without it line
+                protocol is restored through dest_op on worker threads
+            dest_username: User for the aiohttp restore writes
+            dest_password: Password for the aiohttp restore writes
+            verify_ssl: Verify the destination certificate on https URLs
+        """
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        # (operation, its original session) for every operation moved onto
+        # the shared session, so close() can hand the originals back
+        self._adopted: List[Tuple[InfluxdbOperation, requests.Session]] = []
+        self.source = self._adopt(source_op)
+        self.dest = self._adopt(dest_op)
+        self._source_factory = source_factory
+        self._dest_factory = dest_factory
+        # InfluxdbOperation tracks the active database, so each database
+        # processed concurrently gets its own pair of operations
+        self._db_ops: Dict[str, Tuple[InfluxdbOperation, InfluxdbOperation]] = {}
+        self._db_ops_lock = threading.Lock()
+        # Databases already created (or confirmed) on the destination
+        self._dest_databases: Set[str] = set()
+        self._dest_databases_lock = threading.Lock()
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"BackupManager initialized with backup_dir: {self.backup_dir}")
+        # Plain string joins avoid building a Path per backup file
+        self._bdir = str(self.backup_dir)
+        self.max_workers = max_workers
+        self.restore_batch_size = restore_batch_size
+        if backup_format not in ('line', 'csv', 'portable'):
+            raise ValueError(f"Unsupported backup_format: {backup_format}")
+        self.compress = compress
+        self._lp_extension = '.lp.gz' if compress else '.lp'
+        self._csv_extension = '.csv.gz' if compress else '.csv'
+        self.backup_format = backup_format
+        self.rpc_port = rpc_port
+        self.incremental = incremental
+        self._portable: Optional[bool] = None
+        self.backup_window = backup_window
+        self.restore_concurrency = restore_concurrency
+        self.dest_url = dest_url.rstrip('/') if dest_url else None
+        self.dest_username = dest_username
+        self.dest_password = dest_password
+        self.verify_ssl = verify_ssl
+        if durability not in ('strict', 'relaxed'):
+            raise ValueError(f"Unsupported durability: {durability}")
+        self.durability = durability
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_max_delay = retry_max_delay
+        logger.info(
+            "BackupManager initialized with backup_dir: %s, max_workers: %d",
+            self.backup_dir, self.max_workers
+        )
+
+    def __enter__(self) -> 'BackupManager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Give every operation back its original session, close the clients
+        built by the factories (on their own sessions, so the shared one is
+        not closed through them) and the shared session if the manager
+        created it. The source/dest operations passed in belong to the
+        caller and are left open
+        """
+        with self._db_ops_lock:
+            db_ops = list(self._db_ops.values())
+            self._db_ops.clear()
+            adopted, self._adopted = self._adopted, []
+        for op, original in adopted:
+            op.session = original
+        for source, dest in db_ops:
+            source.close_client()
+            dest.close_client()
+        if self._owns_session:
+            self.session.close()
+
+    def _adopt(self, op: InfluxdbOperation) -> InfluxdbOperation:
+        """Move an operation onto the shared session, remembering its own"""
+        self._adopted.append((op, op.session))
+        op.session = self.session
+        return op
 
     def backup_database(
         self,
         database: str,
-        include_timestamp: bool = True
+        resume: bool = False
     ) -> Dict[str, Any]:
         """
-        Backup entire database (all measurements) to CSV files
+        Backup entire database (all measurements) to line protocol or CSV
+        files (gzip-compressed unless the manager was built with compress=False)
+
+        Every finished measurement is appended to a JSON-Lines manifest
+        (``{database}_{timestamp}.manifest.jsonl``) as soon as its file is
+        closed, so an interrupted run keeps a usable catalog on disk
+
+        Args:
+            database: Database to back up
+            resume: Continue the latest manifest of this database, skipping
+                measurements whose backup file is already complete
 
         Returns dict with backup metadata and results
         """
-        logger.info(f"Starting backup of database: {database}")
+        logger.info("Starting backup of database: %s", database)
 
-        measurements = self.source.list_measurements(database)
+        source, _ = self._ops_for(database)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        if self._use_portable():
+            results = self._backup_portable(database, timestamp)
+            if results is not None:
+                return results
+
+        measurements = source.list_measurements(database)
 
+        completed: Dict[str, Dict[str, Any]] = {}
+        if resume:
+            previous = self._latest_manifest(database)
+            if previous is not None:
+                timestamp = _MANIFEST_NAME.fullmatch(previous.name).group('timestamp')
+                for entry in self.read_manifest(previous):
+                    if self._backup_complete(entry):
+                        completed[entry['measurement']] = entry
+                logger.info(
+                    "Resuming backup of %s from %s: %d measurements already done",
+                    database, previous.name, len(completed)
+                )
+
+        manifest_path = self._manifest_path(database, timestamp)
         results = {
             'database': database,
             'timestamp': timestamp,
+            'manifest': str(manifest_path),
             'measurements': {},
             'total_points': 0,
             'errors': []
         }
+        for measurement, entry in completed.items():
+            info = {key: value for key, value in entry.items() if key != 'measurement'}
+            results['measurements'][measurement] = info
+            results['total_points'] += info['points']
 
-        for measurement in measurements:
-            try:
-                filename = f"{database}_{measurement}_{timestamp}.csv"
-                output_file = str(self.backup_dir / filename)
-
-                logger.info(f"Backing up {measurement} to {filename}")
-
-                points_exported = self.source.backup_measurement(
-                    measurement=measurement,
-                    output_file=output_file,
-                    database=database
-                )
-
-                results['measurements'][measurement] = {
-                    'file': filename,
-                    'points': points_exported
-                }
-                results['total_points'] += points_exported
+        pending, empty = self._plan_backup(
+            source, database, [m for m in measurements if m not in completed]
+        )
 
-                logger.info(f"Successfully backed up {measurement}: {points_exported} points")
+        with open(manifest_path, 'a', encoding='utf-8') as manifest, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for measurement in empty:
+                info = self._empty_backup_info()
+                self._append_manifest(manifest, measurement, info)
+                results['measurements'][measurement] = info
+            futures = [
+                executor.submit(self._backup_one, measurement, database, timestamp)
+                for measurement in pending
+            ]
+            # Results are collected on this thread only, so the manifest has
+            # a single writer
+            for future in as_completed(futures):
+                measurement, info, error = future.result()
+                if error is not None:
+                    results['errors'].append(error)
+                    continue
+                self._append_manifest(manifest, measurement, info)
+                results['measurements'][measurement] = info
+                results['total_points'] += info['points']
 
-            except Exception as e:
-                error_msg = f"Error backing up {measurement}: {e}"
-                logger.error(error_msg)
-                results['errors'].append(error_msg)
+        self._sync_backup(results)
 
         logger.info(
-            f"Database {database} backup complete: "
-            f"{len(measurements)} measurements, {results['total_points']} total points"
+            "Database %s backup complete: %d measurements, %d total points",
+            database, len(measurements), results['total_points']
         )
 
         return results
 
     def restore_database(
         self,
-        backup_results: Dict[str, Any]
+        backup_results: Union[Dict[str, Any], str, Path],
+        restore_batch_size: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Restore database from backup files
 
         Args:
-            backup_results: Results dict from backup_database()
+            backup_results: Results dict from backup_database(), or the path
+                of a manifest it wrote
+            restore_batch_size: Points per write request; defaults to the
+                manager's restore_batch_size (5k-25k is the usual sweet spot)
         """
-        database = backup_results['database']
-        logger.info(f"Starting restore of database: {database}")
+        if isinstance(backup_results, dict) and 'portable' in backup_results:
+            return self._restore_portable(backup_results)
+
+        if isinstance(backup_results, (str, Path)):
+            manifest_path = Path(backup_results)
+            match = _MANIFEST_NAME.fullmatch(manifest_path.name)
+            if match is None:
+                raise ValueError(f"Not a backup manifest: {manifest_path}")
+            database = match.group('database')
+            entries = self._unique_entries(self.read_manifest(manifest_path))
+        else:
+            database = backup_results['database']
+            entries = iter(backup_results['measurements'].items())
+        empty: List[str] = []
+        # Largest first, so the longest restores don't start last
+        entries = sorted(
+            self._non_empty_entries(entries, empty),
+            key=lambda entry: entry[1]['points'],
+            reverse=True
+        )
+        batch_size = restore_batch_size or self.restore_batch_size
+        logger.info("Starting restore of database: %s", database)
 
-        # Create database on destination if it doesn't exist
-        existing_dbs = self.dest.list_databases()
-        if database not in existing_dbs:
-            logger.info(f"Creating database: {database}")
-            self.dest.create_database(database)
+        self._ensure_dest_database(database)
 
         results = {
             'database': database,
@@ -105,55 +416,1062 @@ class BackupManager:
             'errors': []
         }
 
+        fingerprints = {
+            measurement: info['fingerprint']
+            for measurement, info in entries
+            if info.get('fingerprint')
+        }
+        if self.incremental and fingerprints:
+            _, dest = self._ops_for(database)
+            restored = self._restore_markers(dest, database)
+            # Markers live outside the restored database: a dropped or
+            # truncated destination must not look unchanged, so its current
+            # counts have to match the ones recorded with the marker
+            dest_counts = self._point_counts(dest, database) if restored else None
+            unchanged = {
+                measurement for measurement, fingerprint in fingerprints.items()
+                if dest_counts is not None
+                and measurement in restored
+                and restored[measurement][0] == fingerprint
+                and 0 < dest_counts.get(measurement, 0) == restored[measurement][1]
+            }
+            if unchanged:
+                logger.info(
+                    "Skipping %d measurements of %s unchanged since the last restore",
+                    len(unchanged), database
+                )
+                for measurement in unchanged:
+                    stats = self._empty_restore_stats()
+                    stats['skipped'] = True
+                    results['measurements'][measurement] = stats
+                entries = [entry for entry in entries if entry[0] not in unchanged]
+
+        if AIOHTTP_AVAILABLE and self.dest_url:
+            outcomes = asyncio.run(
+                self._restore_async(entries, database, batch_size)
+            )
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._restore_one, measurement, info, database, batch_size)
+                    for measurement, info in entries
+                ]
+                outcomes = [future.result() for future in as_completed(futures)]
+
+        restored_now = {}
+        for measurement, stats, error in outcomes:
+            if error is not None:
+                results['errors'].append(error)
+                continue
+            results['measurements'][measurement] = stats
+            results['total_points'] += stats['successful']
+            # A partially written measurement must be restored again next time
+            if measurement in fingerprints and stats['failed'] == 0:
+                restored_now[measurement] = fingerprints[measurement]
+        for measurement in empty:
+            results['measurements'][measurement] = self._empty_restore_stats()
+
+        if self.incremental and restored_now:
+            self._write_restore_markers(database, restored_now)
+
+        logger.info(
+            "Database %s restore complete: %d measurements, %d total points",
+            database, len(results['measurements']), results['total_points']
+        )
+
+        return results
+
+    def backup_and_restore(
+        self,
+        database: str,
+        restore_batch_size: Optional[int] = None,
+        queue_size: int = 4
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Backup a database and restore each measurement as soon as its
+        export finishes, overlapping source reads with destination writes
+
+        Returns (backup_results, restore_results) shaped like the results of
+        backup_database() and restore_database(). Portable backups can't be
+        restored per measurement, so they run backup then restore
+        """
+        if self._use_portable():
+            backup_results = self.backup_database(database)
+            return backup_results, self.restore_database(backup_results, restore_batch_size)
+
+        batch_size = restore_batch_size or self.restore_batch_size
+        logger.info("Starting pipelined backup/restore of database: %s", database)
+
+        source, _ = self._ops_for(database)
+        measurements = source.list_measurements(database)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._ensure_dest_database(database)
+
+        manifest_path = self._manifest_path(database, timestamp)
+        backup_results = {
+            'database': database,
+            'timestamp': timestamp,
+            'manifest': str(manifest_path),
+            'measurements': {},
+            'total_points': 0,
+            'errors': []
+        }
+        restore_results = {
+            'database': database,
+            'measurements': {},
+            'total_points': 0,
+            'errors': []
+        }
+        restore_lock = threading.Lock()
+        exported: queue.Queue = queue.Queue(maxsize=queue_size)
+        num_consumers = max(1, self.max_workers // 2)
+
+        def consume():
+            while True:
+                item = exported.get()
+                if item is None:
+                    return
+                measurement, info = item
+                measurement, stats, error = self._restore_one(
+                    measurement, info, database, batch_size
+                )
+                with restore_lock:
+                    if error is not None:
+                        restore_results['errors'].append(error)
+                    else:
+                        restore_results['measurements'][measurement] = stats
+                        restore_results['total_points'] += stats['successful']
+
+        consumers = [
+            threading.Thread(target=consume, name=f"restore-{database}-{i}", daemon=True)
+            for i in range(num_consumers)
+        ]
+        for consumer in consumers:
+            consumer.start()
+
+        pending, empty = self._plan_backup(source, database, measurements)
+
+        try:
+            with open(manifest_path, 'a', encoding='utf-8') as manifest, \
+                    ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for measurement in empty:
+                    info = self._empty_backup_info()
+                    self._append_manifest(manifest, measurement, info)
+                    backup_results['measurements'][measurement] = info
+                    with restore_lock:
+                        restore_results['measurements'][measurement] = self._empty_restore_stats()
+                futures = [
+                    executor.submit(self._backup_one, measurement, database, timestamp)
+                    for measurement in pending
+                ]
+                for future in as_completed(futures):
+                    measurement, info, error = future.result()
+                    if error is not None:
+                        backup_results['errors'].append(error)
+                        continue
+                    self._append_manifest(manifest, measurement, info)
+                    backup_results['measurements'][measurement] = info
+                    backup_results['total_points'] += info['points']
+                    exported.put((measurement, info))
+        finally:
+            for _ in consumers:
+                exported.put(None)
+            for consumer in consumers:
+                consumer.join()
+
+        self._sync_backup(backup_results)
+
+        logger.info(
+            "Database %s pipelined backup/restore complete: "
+            "%d points backed up, %d points restored",
+            database, backup_results['total_points'], restore_results['total_points']
+        )
+
+        return backup_results, restore_results
+
+    def _plan_backup(
+        self,
+        source: InfluxdbOperation,
+        database: str,
+        measurements: List[str]
+    ) -> Tuple[List[str], Set[str]]:
+        """
+        Split measurements into (to export, empty) from a single COUNT(*) over
+        every measurement. The ones to export are ordered largest first so
+        the longest jobs start early and don't stretch the tail of the run
+        """
+        if not measurements:
+            return [], set()
+        counts = self._point_counts(source, database)
+        if counts is None:
+            return list(measurements), set()
+
+        empty = {m for m in measurements if counts.get(m, 0) == 0}
+        if empty:
+            logger.info("Skipping %d empty measurements in %s", len(empty), database)
+        pending = sorted(
+            (m for m in measurements if m not in empty),
+            key=lambda m: counts[m],
+            reverse=True
+        )
+        return pending, empty
+
+    def _point_counts(
+        self,
+        source: InfluxdbOperation,
+        database: str
+    ) -> Optional[Dict[str, int]]:
+        """Points per measurement, or None if the count query fails"""
+        try:
+            return source.count_points_by_measurement(database)
+        except Exception as e:
+            logger.warning("Could not count points in %s: %s", database, e)
+            return None
+
+    def _empty_backup_info(self) -> Dict[str, Any]:
+        """Results entry of a measurement skipped for having no points"""
+        if self.backup_format != 'csv':
+            return {'chunks': [], 'points': 0}
+        return {'file': None, 'points': 0}
+
+    @staticmethod
+    def _empty_restore_stats() -> Dict[str, int]:
+        return {'total_points': 0, 'successful': 0, 'failed': 0}
+
+    @staticmethod
+    def _non_empty_entries(
+        entries: Iterator[Tuple[str, Dict[str, Any]]],
+        empty: List[str]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield entries with points; collect the rest into `empty`"""
+        for measurement, info in entries:
+            if info.get('points') == 0:
+                empty.append(measurement)
+            else:
+                yield measurement, info
+
+    @staticmethod
+    def read_manifest(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Yield the entries of a backup manifest, one measurement at a time"""
+        with open(path, 'r', encoding='utf-8') as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append can leave a torn last line (orjson's
+                    # decode error subclasses json.JSONDecodeError)
+                    logger.warning("Skipping unreadable manifest line in %s", path)
+
+    @staticmethod
+    def _unique_entries(
+        entries: Iterator[Dict[str, Any]]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """A resumed run may list a measurement twice; restore it once"""
+        seen = set()
+        for entry in entries:
+            if entry['measurement'] not in seen:
+                seen.add(entry['measurement'])
+                yield entry['measurement'], entry
+
+    def _manifest_path(self, database: str, timestamp: str) -> Path:
+        return self.backup_dir / f"{database}_{timestamp}{_MANIFEST_SUFFIX}"
+
+    def _latest_manifest(self, database: str) -> Optional[Path]:
+        """Most recent manifest written for a database, if any"""
+        candidates = [
+            path for path in self.backup_dir.glob(f"{glob.escape(database)}_*{_MANIFEST_SUFFIX}")
+            if (match := _MANIFEST_NAME.fullmatch(path.name))
+            and match.group('database') == database
+        ]
+        return max(candidates, key=lambda path: path.name) if candidates else None
+
+    def _backup_complete(self, entry: Dict[str, Any]) -> bool:
+        """
+        A manifest entry is complete when all its files are non-empty: entries
+        are only appended once every file has been fully written and closed
+        """
+        if entry['points'] == 0:
+            return True
+        for filename in self._backup_files(entry):
+            path = os.path.join(self._bdir, filename)
+            if not os.path.isfile(path) or os.path.getsize(path) == 0:
+                return False
+        return True
+
+    @staticmethod
+    def _backup_files(info: Dict[str, Any]) -> List[str]:
+        """Files of a measurement backup: its time-window chunks or a single file"""
+        if 'chunks' in info:
+            return info['chunks']
+        return [info['file']]
+
+    @staticmethod
+    def _append_manifest(
+        manifest: IO[str],
+        measurement: str,
+        info: Dict[str, Any]
+    ) -> None:
+        manifest.write(_json_dumps({'measurement': measurement, **info}) + '\n')
+        manifest.flush()
+
+    def _fingerprint(self, filenames: List[str]) -> str:
+        """
+        Content hash of a measurement's backup files, prefixed with the
+        algorithm so fingerprints from hosts with and without xxhash never
+        compare equal
+        """
+        if XXHASH_AVAILABLE:
+            algorithm, digest = 'xxh3', xxhash.xxh3_128()
+        else:
+            algorithm, digest = 'blake2b', hashlib.blake2b(digest_size=16)
+        for filename in filenames:
+            with open(os.path.join(self._bdir, filename), 'rb') as handle:
+                while block := handle.read(_WRITE_BUFFER):
+                    digest.update(block)
+        return f"{algorithm}:{digest.hexdigest()}"
+
+    def _restore_markers(
+        self,
+        dest: InfluxdbOperation,
+        database: str
+    ) -> Dict[str, Tuple[str, Optional[int]]]:
+        """(fingerprint, destination points) last restored per measurement of a database"""
+        escaped = database.replace('\\', '\\\\').replace("'", "\\'")
+        try:
+            result = dest.get_client.query(
+                f'SELECT last("fingerprint") AS "fingerprint", last("points") AS "points" '
+                f'FROM "{_MARKER_MEASUREMENT}" '
+                f"WHERE \"database\" = '{escaped}' GROUP BY \"measurement\"",
+                database=_MARKER_DATABASE
+            )
+            return {
+                tags['measurement']: (point['fingerprint'], point.get('points'))
+                for (_, tags), points in result.items()
+                for point in points
+            }
+        except Exception as e:
+            # Typically the marker database doesn't exist yet
+            logger.info("No restore markers for %s: %s", database, e)
+            return {}
+
+    def _write_restore_markers(self, database: str, fingerprints: Dict[str, str]) -> None:
+        """
+        Record the fingerprints of the measurements just restored, with the
+        point count each one has on the destination now
+        """
+        _, dest = self._ops_for(database)
+        counts = self._point_counts(dest, database)
+        if counts is None:
+            # Without counts a later run could not tell the data is still there
+            return
+        points = [
+            {
+                'measurement': _MARKER_MEASUREMENT,
+                'tags': {'database': database, 'measurement': measurement},
+                'fields': {'fingerprint': fingerprint, 'points': counts.get(measurement, 0)}
+            }
+            for measurement, fingerprint in fingerprints.items()
+        ]
+        try:
+            self._ensure_dest_database(_MARKER_DATABASE, dest)
+            dest.get_client.write_points(points, database=_MARKER_DATABASE)
+        except Exception as e:
+            # The data is restored; only the next run's skip is lost
+            logger.warning("Could not write restore markers for %s: %s", database, e)
+
+    def _use_portable(self) -> bool:
+        """
+        Whether portable backups can be used: influxd is on PATH and both
+        servers report a 1.x version with portable support. Checked once
+        """
+        if self.backup_format != 'portable':
+            return False
+        if self._portable is None:
+            self._portable = shutil.which('influxd') is not None and all(
+                self._supports_portable(op) for op in (self.source, self.dest)
+            )
+            if not self._portable:
+                logger.warning(
+                    "influxd portable backup unavailable, falling back to line protocol"
+                )
+        return self._portable
+
+    @staticmethod
+    def _supports_portable(op: InfluxdbOperation) -> bool:
+        try:
+            version = op.get_client.ping()
+            major, minor = (int(part) for part in version.lstrip('v').split('.')[:2])
+        except Exception as e:
+            logger.warning("Could not read InfluxDB version from %s: %s", op.host, e)
+            return False
+        return major == _PORTABLE_MIN_VERSION[0] and (major, minor) >= _PORTABLE_MIN_VERSION
+
+    def _backup_portable(self, database: str, timestamp: str) -> Optional[Dict[str, Any]]:
+        """
+        Run `influxd backup -portable` for a database. Returns None when it
+        fails, so the caller falls back to the line protocol export
+        """
+        source, _ = self._ops_for(database)
+        dirname = f"{database}_{timestamp}.portable"
+        command = [
+            'influxd', 'backup', '-portable',
+            '-database', database,
+            '-host', f"{source.host}:{self.rpc_port}",
+            os.path.join(self._bdir, dirname)
+        ]
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', None) or e
+            logger.warning(
+                "Portable backup of %s failed, falling back to line protocol: %s",
+                database, detail
+            )
+            return None
+
+        # Per-measurement sizes keep the results shaped like a file backup
+        counts = self._point_counts(source, database) or {}
+        results = {
+            'database': database,
+            'timestamp': timestamp,
+            'portable': dirname,
+            'measurements': {
+                measurement: {'points': points}
+                for measurement, points in counts.items()
+            },
+            'total_points': sum(counts.values()),
+            'errors': []
+        }
+        logger.info(
+            "Database %s portable backup complete: %d measurements, %d total points",
+            database, len(results['measurements']), results['total_points']
+        )
+        return results
+
+    def _restore_portable(self, backup_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run `influxd restore -portable`. influxd refuses to restore over an
+        existing database, so the destination database is not pre-created
+        """
+        database = backup_results['database']
+        _, dest = self._ops_for(database)
+        logger.info("Starting portable restore of database: %s", database)
+
+        results = {
+            'database': database,
+            'measurements': {},
+            'total_points': 0,
+            'errors': []
+        }
+        command = [
+            'influxd', 'restore', '-portable',
+            '-db', database,
+            '-host', f"{dest.host}:{self.rpc_port}",
+            os.path.join(self._bdir, backup_results['portable'])
+        ]
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', None) or e
+            error_msg = f"Error restoring portable backup of {database}: {detail}"
+            logger.error(error_msg)
+            results['errors'].append(error_msg)
+            return results
+
         for measurement, info in backup_results['measurements'].items():
-            try:
-                input_file = str(self.backup_dir / info['file'])
-                logger.info(f"Restoring {measurement} from {info['file']}")
+            points = info['points']
+            results['measurements'][measurement] = {
+                'total_points': points, 'successful': points, 'failed': 0
+            }
+            results['total_points'] += points
+
+        logger.info(
+            "Database %s portable restore complete: %d total points",
+            database, results['total_points']
+        )
+        return results
+
+    def _ensure_dest_database(
+        self,
+        database: str,
+        dest: Optional[InfluxdbOperation] = None
+    ) -> None:
+        """
+        Create the database on the destination if it doesn't exist.
+        CREATE DATABASE is a no-op for existing databases, so it replaces
+        listing them; each database is only sent once per manager
+        """
+        with self._dest_databases_lock:
+            if database in self._dest_databases:
+                return
+        if dest is None:
+            _, dest = self._ops_for(database)
+        logger.info("Ensuring database exists: %s", database)
+        dest.create_database(database)
+        with self._dest_databases_lock:
+            self._dest_databases.add(database)
+
+    def _backup_one(
+        self,
+        measurement: str,
+        database: str,
+        timestamp: str
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Backup a single measurement; safe to run from a worker thread
 
-                stats = self.dest.restore_measurement(
+        Returns (measurement, info, error) where info holds the written
+        'file' (CSV) or time-window 'chunks' (line protocol) and 'points'
+        """
+        try:
+            source, _ = self._ops_for(database)
+            if self.backup_format != 'csv':
+                logger.info("Backing up %s as line protocol", measurement)
+                chunks, points_exported = self._export_line_protocol(
+                    source, measurement, database, timestamp
+                )
+                info = {'chunks': chunks, 'points': points_exported}
+            else:
+                filename = f"{database}_{measurement}_{timestamp}{self._csv_extension}"
+                logger.info("Backing up %s to %s", measurement, filename)
+                points_exported = self._with_retry(
+                    f"Backup of {measurement}",
+                    source.backup_measurement,
                     measurement=measurement,
-                    input_file=input_file,
+                    output_file=os.path.join(self._bdir, filename),
                     database=database,
-                    batch_size=5000
+                    compression=_GZIP_FAST if self.compress else None
                 )
+                info = {'file': filename, 'points': points_exported}
 
-                results['measurements'][measurement] = stats
-                results['total_points'] += stats['successful']
+            if info['points'] > 0:
+                info['fingerprint'] = self._fingerprint(self._backup_files(info))
 
-                logger.info(
-                    f"Successfully restored {measurement}: "
-                    f"{stats['successful']} points"
+            logger.info("Successfully backed up %s: %d points", measurement, points_exported)
+            return measurement, info, None
+
+        except Exception as e:
+            error_msg = f"Error backing up {measurement}: {e}"
+            logger.error(error_msg)
+            return measurement, None, error_msg
+
+    def _restore_one(
+        self,
+        measurement: str,
+        info: Dict[str, Any],
+        database: str,
+        batch_size: int
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Restore a single measurement; safe to run from a worker thread
+
+        Returns (measurement, stats, error)
+        """
+        try:
+            _, dest = self._ops_for(database)
+            if 'chunks' in info:
+                logger.info("Restoring %s from %d chunk files", measurement, len(info['chunks']))
+                stats = {'total_points': 0, 'successful': 0, 'failed': 0}
+                # Windows are restored in time order
+                for filename in info['chunks']:
+                    chunk_stats = self._restore_line_protocol(
+                        dest, database, os.path.join(self._bdir, filename), batch_size
+                    )
+                    for key in stats:
+                        stats[key] += chunk_stats[key]
+            else:
+                logger.info("Restoring %s from %s", measurement, info['file'])
+                restored = self._with_retry(
+                    f"Restore of {measurement}",
+                    dest.restore_measurement,
+                    measurement=measurement,
+                    input_file=os.path.join(self._bdir, info['file']),
+                    database=database,
+                    batch_size=batch_size
                 )
+                # The library reports written/total points; keep the shape the
+                # rest of the restore code aggregates
+                total = restored.get('total_points', 0)
+                successful = restored.get('written_points', restored.get('successful', 0))
+                stats = {'total_points': total, 'successful': successful, 'failed': total - successful}
+
+            logger.info("Successfully restored %s: %d points", measurement, stats['successful'])
+            return measurement, stats, None
+
+        except Exception as e:
+            error_msg = f"Error restoring {measurement}: {e}"
+            logger.error(error_msg)
+            return measurement, None, error_msg
+
+    def _export_line_protocol(
+        self,
+        source: InfluxdbOperation,
+        measurement: str,
+        database: str,
+        timestamp: str
+    ) -> Tuple[List[str], int]:
+        """
+        Export a measurement as line protocol, one file per time window
+
+        Empty windows leave no file behind. Returns (chunk files in time
+        order, total lines written)
+        """
+        tag_keys = self._with_retry(
+            f"Tag keys of {measurement}", source.list_tags, measurement, database=database
+        )
+        field_types = self._with_retry(
+            f"Field keys of {measurement}", source.list_fields, measurement, database=database
+        )
+        # Built once per measurement; each window only appends its suffix
+        stem = os.path.join(self._bdir, f"{database}_{measurement}_{timestamp}")
+        base_query = f'SELECT * FROM "{measurement}"'
+        extension = self._lp_extension
+        name_offset = len(os.path.join(self._bdir, ''))
+
+        chunks: List[str] = []
+        total = 0
+        for index, (start, stop) in enumerate(self._time_windows(source, measurement, database)):
+            if start is None:
+                query = base_query
+                output_file = stem + extension
+            else:
+                query = f'{base_query} WHERE time >= {start} AND time < {stop}'
+                output_file = f"{stem}_{index:05d}{extension}"
+            filename = output_file[name_offset:]
+
+            # A retried window is rewritten from scratch
+            lines = self._with_retry(
+                f"Export of {filename}",
+                self._write_line_file,
+                source, query, database, output_file, measurement, tag_keys, field_types
+            )
+            if lines == 0:
+                os.remove(output_file)
+                continue
+            chunks.append(filename)
+            total += lines
+        return chunks, total
+
+    def _time_windows(
+        self,
+        source: InfluxdbOperation,
+        measurement: str,
+        database: str
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Split the measurement's time range into [start, stop) nanosecond
+        windows aligned to backup_window; [(None, None)] when not windowing
+        """
+        if self.backup_window is None:
+            return [(None, None)]
+
+        bounds = []
+        for order in ('ASC', 'DESC'):
+            result = self._with_retry(
+                f"Time range of {measurement}",
+                source.get_client.query,
+                f'SELECT * FROM "{measurement}" ORDER BY time {order} LIMIT 1',
+                database=database,
+                epoch='ns'
+            )
+            point = next(iter(result.get_points()), None)
+            if point is None:
+                return []
+            bounds.append(int(point['time']))
 
-            except Exception as e:
-                error_msg = f"Error restoring {measurement}: {e}"
+        first, last = bounds
+        window_ns = (self.backup_window // timedelta(microseconds=1)) * 1000
+        start = first - first % window_ns
+        return [
+            (window_start, window_start + window_ns)
+            for window_start in range(start, last + 1, window_ns)
+        ]
+
+    def _write_line_file(
+        self,
+        source: InfluxdbOperation,
+        query: str,
+        database: str,
+        output_file: str,
+        measurement: str,
+        tag_keys: List[str],
+        field_types: Dict[str, str]
+    ) -> int:
+        """
+        Stream a query result to disk as line protocol
+
+        Rows are read with a chunked query so a window is never
+        materialized in memory. Returns the number of lines written
+        """
+        result = source.get_client.query(
+            query,
+            database=database,
+            epoch='ns',
+            chunked=True,
+            chunk_size=_EXPORT_CHUNK_SIZE
+        )
+        # Chunked JSON responses yield one ResultSet per chunk; anything else
+        # comes back as a single ResultSet
+        chunks = [result] if hasattr(result, 'get_points') else result
+
+        lines_written = 0
+        with self._open_backup_file(output_file) as handle:
+            for chunk in chunks:
+                points = []
+                for row in chunk.get_points():
+                    fields = {}
+                    for key, field_type in field_types.items():
+                        value = _typed_field_value(row.get(key), field_type)
+                        if value is not None:
+                            fields[key] = value
+                    if fields:
+                        points.append({
+                            'measurement': measurement,
+                            'time': int(row['time']),
+                            'tags': {key: row.get(key) for key in tag_keys},
+                            'fields': fields
+                        })
+                if points:
+                    # Same serializer (and escaping) as the library's own writes
+                    lines = InfluxdbOperation.points_to_line_protocol(points)
+                    handle.write('\n'.join(lines) + '\n')
+                    lines_written += len(lines)
+        return lines_written
+
+    @contextmanager
+    def _open_backup_file(self, output_file: str) -> Iterator[IO[str]]:
+        """Open a backup file for text writes behind a 1 MiB buffer"""
+        with open(output_file, 'wb', buffering=_WRITE_BUFFER) as raw:
+            if self.compress:
+                # No name or mtime in the gzip header: identical data gives
+                # identical files, which keeps fingerprints stable across runs
+                stream = gzip.GzipFile(
+                    filename='', fileobj=raw, mode='wb', compresslevel=1, mtime=0
+                )
+            else:
+                stream = raw
+            with io.TextIOWrapper(stream, encoding='utf-8') as handle:
+                yield handle
+
+    def _sync_backup(self, results: Dict[str, Any]) -> None:
+        """
+        fsync the files of a finished database backup in one pass, then the
+        directory so the new entries are durable too
+        """
+        if self.durability != 'strict':
+            return
+        paths = [
+            os.path.join(self._bdir, filename)
+            for info in results['measurements'].values()
+            if info['points'] > 0
+            for filename in self._backup_files(info)
+        ]
+        paths.append(results['manifest'])
+        paths.append(self._bdir)
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                error_msg = f"Error syncing {path}: {e}"
                 logger.error(error_msg)
                 results['errors'].append(error_msg)
 
-        logger.info(
-            f"Database {database} restore complete: "
-            f"{len(results['measurements'])} measurements, "
-            f"{results['total_points']} total points"
+    def _restore_line_protocol(
+        self,
+        dest: InfluxdbOperation,
+        database: str,
+        input_file: str,
+        batch_size: int
+    ) -> Dict[str, int]:
+        """
+        POST a line protocol backup to /write in batches of `batch_size` lines
+
+        The file body is sent as-is over the client's keep-alive session,
+        skipping any per-point parsing or re-serialization
+        """
+        client = dest.get_client
+        params = {'db': database, 'precision': 'n'}
+
+        description = f"Write from {os.path.basename(input_file)}"
+
+        total = 0
+        for body, lines in self._iter_line_batches(input_file, batch_size):
+            self._with_retry(
+                description,
+                client.request,
+                url='write',
+                method='POST',
+                params=params,
+                data=body,
+                expected_response_code=204,
+                headers={'Content-Type': 'application/octet-stream'}
+            )
+            total += lines
+
+        return {'total_points': total, 'successful': total, 'failed': 0}
+
+    @staticmethod
+    def _iter_line_batches(
+        input_file: str,
+        batch_size: int
+    ) -> Iterator[Tuple[bytes, int]]:
+        """Yield (body, line count) batches of at most `batch_size` lines"""
+        opener = gzip.open if input_file.endswith('.gz') else open
+        # One growing buffer reused for every batch instead of a list of
+        # line objects per batch; only the finished body is copied out
+        buffer = bytearray()
+        count = 0
+        with opener(input_file, 'rb') as handle:
+            for line in handle:
+                buffer += line
+                count += 1
+                if count >= batch_size:
+                    yield bytes(buffer), count
+                    buffer.clear()
+                    count = 0
+        if count:
+            yield bytes(buffer), count
+
+    async def _restore_async(
+        self,
+        entries: Iterator[Tuple[str, Dict[str, Any]]],
+        database: str,
+        batch_size: int
+    ) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Restore every measurement of a database over one aiohttp session
+
+        Up to restore_concurrency write requests are in flight at once, so
+        the round-trip of a single POST no longer gates throughput
+        """
+        auth = None
+        if self.dest_username is not None and self.dest_password is not None:
+            auth = aiohttp.BasicAuth(self.dest_username, self.dest_password)
+
+        semaphore = asyncio.Semaphore(self.restore_concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self.restore_concurrency,
+            ssl=None if self.verify_ssl else False
         )
+        async with aiohttp.ClientSession(connector=connector, auth=auth) as session:
+            return await asyncio.gather(*(
+                self._restore_measurement_async(
+                    session, semaphore, measurement, info, database, batch_size
+                )
+                for measurement, info in entries
+            ))
 
-        return results
+    async def _restore_measurement_async(
+        self,
+        session: 'aiohttp.ClientSession',
+        semaphore: asyncio.Semaphore,
+        measurement: str,
+        info: Dict[str, Any],
+        database: str,
+        batch_size: int
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Async counterpart of _restore_one; CSV backups and the reads and
+        decompression of line protocol files run in worker threads
+        """
+        loop = asyncio.get_running_loop()
+        if 'chunks' not in info:
+            return await loop.run_in_executor(
+                None, self._restore_one, measurement, info, database, batch_size
+            )
+
+        url = f"{self.dest_url}/write"
+        params = {'db': database, 'precision': 'n'}
+        headers = {'Content-Type': 'application/octet-stream'}
+
+        async def send(body: bytes) -> None:
+            async with session.post(url, params=params, data=body, headers=headers) as response:
+                if response.status >= 500:
+                    raise InfluxDBServerError(await response.text())
+                if response.status != 204:
+                    raise InfluxDBClientError(await response.text(), response.status)
+
+        async def post(body: bytes, lines: int) -> int:
+            try:
+                for attempt in range(self.retry_attempts):
+                    try:
+                        await send(body)
+                        return lines
+                    except _TRANSIENT_ERRORS as e:
+                        if attempt == self.retry_attempts - 1:
+                            raise
+                        delay = self._backoff_delay(attempt)
+                        logger.warning(
+                            "Write of %s failed (attempt %d/%d), retrying in %.1fs: %s",
+                            measurement, attempt + 1, self.retry_attempts, delay, e
+                        )
+                        await asyncio.sleep(delay)
+            finally:
+                semaphore.release()
+
+        tasks: List[asyncio.Task] = []
+        try:
+            logger.info("Restoring %s from %d chunk files", measurement, len(info['chunks']))
+            for filename in info['chunks']:
+                input_file = os.path.join(self._bdir, filename)
+                batches = self._iter_line_batches(input_file, batch_size)
+                try:
+                    while True:
+                        # Acquiring before reading the next batch bounds the
+                        # number of request bodies held in memory
+                        await semaphore.acquire()
+                        batch = await loop.run_in_executor(None, next, batches, None)
+                        if batch is None:
+                            semaphore.release()
+                            break
+                        tasks.append(asyncio.create_task(post(*batch)))
+                finally:
+                    batches.close()
+
+            written = await asyncio.gather(*tasks, return_exceptions=True)
+            for outcome in written:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+
+            total = sum(written)
+            logger.info("Successfully restored %s: %d points", measurement, total)
+            return measurement, {'total_points': total, 'successful': total, 'failed': 0}, None
+
+        except Exception as e:
+            # Don't leave requests running against a session about to close
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            error_msg = f"Error restoring {measurement}: {e}"
+            logger.error(error_msg)
+            return measurement, None, error_msg
+
+    def _with_retry(self, description: str, operation: Callable, *args, **kwargs) -> Any:
+        """
+        Call `operation`, retrying transient failures with jittered exponential
+        backoff; the last failure is re-raised once attempts run out
+        """
+        for attempt in range(self.retry_attempts):
+            try:
+                return operation(*args, **kwargs)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == self.retry_attempts - 1:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    "%s failed (attempt %d/%d), retrying in %.1fs: %s",
+                    description, attempt + 1, self.retry_attempts, delay, e
+                )
+                time.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """1s, 2s, 4s... plus up to 1s of jitter, capped at retry_max_delay"""
+        return min(self.retry_max_delay, 2 ** attempt + random.uniform(0, 1))
+
+    def _ops_for(self, database: str) -> Tuple[InfluxdbOperation, InfluxdbOperation]:
+        """Return the (source, dest) operations dedicated to a database"""
+        if self._source_factory is None or self._dest_factory is None:
+            return self.source, self.dest
+        with self._db_ops_lock:
+            if database not in self._db_ops:
+                self._db_ops[database] = (
+                    self._adopt(self._source_factory()),
+                    self._adopt(self._dest_factory())
+                )
+            return self._db_ops[database]
+
+    def _database_concurrency(self, concurrency: int) -> int:
+        """Databases can only run in parallel when per-database operations can be built"""
+        if self._source_factory is None or self._dest_factory is None:
+            return 1
+        return max(1, concurrency)
 
     def backup_all_databases(
         self,
-        databases: List[str]
+        databases: List[str],
+        concurrency: int = 4,
+        resume: bool = False
     ) -> Dict[str, Dict[str, Any]]:
-        """Backup multiple databases"""
-        results = {}
-        for database in databases:
-            results[database] = self.backup_database(database)
-        return results
+        """Backup multiple databases, up to `concurrency` at a time"""
+        workers = self._database_concurrency(concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            backups = executor.map(
+                lambda database: self.backup_database(database, resume=resume),
+                databases
+            )
+            return dict(zip(databases, backups))
 
     def restore_all_databases(
         self,
-        backup_results: Dict[str, Dict[str, Any]]
+        backup_results: Dict[str, Dict[str, Any]],
+        concurrency: int = 4
     ) -> Dict[str, Dict[str, Any]]:
-        """Restore multiple databases"""
-        results = {}
-        for database, backup_info in backup_results.items():
-            results[database] = self.restore_database(backup_info)
-        return results
+        """Restore multiple databases, up to `concurrency` at a time"""
+        workers = self._database_concurrency(concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                database: executor.submit(self.restore_database, backup_info)
+                for database, backup_info in backup_results.items()
+            }
+            return {database: future.result() for database, future in futures.items()}
+
+    def backup_and_restore_all_databases(
+        self,
+        databases: List[str],
+        concurrency: int = 4,
+        resume: bool = False
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Backup multiple databases and restore each one as soon as its backup
+        finishes, so restores of early databases overlap the backups of the
+        later ones
+
+        Backups run on one pool and push (database, backup_info) onto a
+        queue that the restore pool drains. Without factories every
+        database shares the same operations, so it runs backup then restore
+
+        Returns (backup_results, restore_results) keyed by database, like
+        backup_all_databases() and restore_all_databases()
+        """
+        if self._source_factory is None or self._dest_factory is None:
+            backup_results = self.backup_all_databases(databases, resume=resume)
+            return backup_results, self.restore_all_databases(backup_results)
+
+        workers = self._database_concurrency(concurrency)
+        backed_up: queue.Queue = queue.Queue()
+
+        def produce(database: str) -> Dict[str, Any]:
+            backup_info = None
+            try:
+                backup_info = self.backup_database(database, resume=resume)
+                return backup_info
+            finally:
+                # A failed backup still wakes one consumer, which skips it
+                backed_up.put((database, backup_info))
+
+        def consume() -> Tuple[str, Optional[Dict[str, Any]]]:
+            database, backup_info = backed_up.get()
+            if backup_info is None:
+                return database, None
+            return database, self.restore_database(backup_info)
+
+        with ThreadPoolExecutor(max_workers=workers) as backup_pool, \
+                ThreadPoolExecutor(max_workers=workers) as restore_pool:
+            backups = {
+                database: backup_pool.submit(produce, database)
+                for database in databases
+            }
+            restores = [restore_pool.submit(consume) for _ in databases]
+            backup_results = {
+                database: future.result() for database, future in backups.items()
+            }
+            restored = dict(future.result() for future in restores)
+
+        restore_results = {database: restored[database] for database in databases}
+        return backup_results, restore_results
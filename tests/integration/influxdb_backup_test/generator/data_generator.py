@@ -1,23 +1,342 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
-from .schemas import DatabaseSchema, MeasurementSchema
+from .schemas import CompiledMeasurement, DatabaseSchema, MeasurementSchema
 
 logger = logging.getLogger(__name__)
 
+# Column dtype of each schema field type
+_FIELD_DTYPES = {'float': np.float64, 'int': np.int64}
+
+
+def _matches(*any_of: str, all_of: Tuple[str, ...] = ()) -> Callable[[str], bool]:
+    """Predicate on a lowercased field name: contains one of any_of (if
+    given) and every word of all_of"""
+    def predicate(field_lower: str) -> bool:
+        return (
+            (not any_of or any(word in field_lower for word in any_of))
+            and all(word in field_lower for word in all_of)
+        )
+    return predicate
+
+
+# Sampling rules by field name: the first rule whose predicate matches
+# the lowercased name wins. Entries: (predicate, Generator method, args,
+# clip bounds). Beta draws are scaled to 0-100 before clipping.
+FLOAT_RULES = (
+    (_matches('motor', 'machine', all_of=('temp',)), 'normal', (65.0, 10.0), None),
+    (_matches('setpoint', all_of=('temp',)), 'normal', (22.0, 1.0), None),
+    (_matches('temp'), 'normal', (22.0, 3.0), None),
+    (_matches('humidity', 'moisture'), 'normal', (50.0, 15.0), (0, 100)),
+    (_matches('pressure'), 'normal', (1013.25, 10.0), None),
+    (_matches('cpu', 'memory'), 'gamma', (2, 15), (0, 100)),
+    (_matches('response_time', 'query_time', 'wait_time'), 'exponential', (50,), (1, 5000)),
+    (_matches('pct', 'rate', 'efficiency'), 'beta', (8, 2), (0, 100)),
+    (_matches('power', 'consumption', all_of=('kw',)), 'gamma', (3, 2), (0.5, 50)),
+    (_matches('power', 'consumption'), 'gamma', (4, 50), (10, 1000)),
+    (_matches('vibration'), 'normal', (0.5, 0.2), (0, 5)),
+    (_matches('speed'), 'normal', (1.5, 0.3), (0, 5)),
+    (_matches('luminosity', 'brightness'), 'gamma', (5, 10), (0, 100)),
+    (_matches('uv'), 'gamma', (2, 1), (0, 11)),
+    (_matches('pm'), 'exponential', (15,), (0, 150)),
+    (_matches('voltage'), 'normal', (230.0, 5.0), None),
+    (_matches('current'), 'gamma', (3, 5), (0, 100)),
+    (_matches('factor'), 'normal', (0.95, 0.05), (0.7, 1.0)),
+    (_matches('load'), 'gamma', (4, 20), (0, 500)),
+    (_matches('smoke'), 'exponential', (2,), (0, 10)),
+    (_matches('storage'), 'gamma', (5, 2), (0, 100)),
+    (_matches('sensitivity'), 'uniform', (0.5, 1.0), None),
+    (_matches('processing'), 'exponential', (30,), (1, 300)),
+    (_matches('conversion'), 'beta', (2, 5), (0, 100)),
+    (_matches('cycle'), 'normal', (45.0, 10.0), (10, 120)),
+    (_matches('occupancy_time'), 'exponential', (60,), (5, 300)),
+    (_matches(), 'uniform', (0, 100), None),
+)
+
+# Same layout for int fields; continuous draws are truncated to int64
+INT_RULES = (
+    (_matches('error', 'defect', 'failed', all_of=('count',)), 'poisson', (0.5,), None),
+    (_matches('alarm', 'emergency', all_of=('count',)), 'poisson', (0.1,), None),
+    (_matches('request', 'transaction', all_of=('count',)), 'poisson', (100,), None),
+    (_matches('connection', all_of=('count',)), 'poisson', (20,), None),
+    (_matches('access', 'door', 'card', all_of=('count',)), 'poisson', (5,), None),
+    (_matches('trip', all_of=('count',)), 'poisson', (3,), None),
+    (_matches('count'), 'poisson', (10,), None),
+    (_matches('detected', 'status', 'is_open', 'occupancy'), 'binomial', (1, 0.3), None),
+    (_matches('granted'), 'poisson', (10,), None),
+    (_matches('denied'), 'poisson', (1,), None),
+    (_matches('rpm'), 'normal', (1500, 200), None),
+    (_matches(all_of=('floor', 'current')), 'integers', (1, 20), None),
+    (_matches('bytes'), 'exponential', (1000000,), None),
+    (_matches('co2'), 'normal', (450, 100), None),
+    (_matches('voc'), 'normal', (100, 30), None),
+    (_matches(all_of=('user', 'active')), 'poisson', (500,), None),
+    (_matches('revenue'), 'exponential', (100000,), None),
+    (_matches('units', 'produced'), 'poisson', (50,), None),
+    (_matches('slow', 'deadlock'), 'poisson', (0.5,), None),
+    (_matches(all_of=('job', 'queued')), 'poisson', (15,), None),
+    (_matches(all_of=('job', 'processing')), 'poisson', (5,), None),
+    (_matches(all_of=('job', 'completed')), 'poisson', (100,), None),
+    (_matches(all_of=('job', 'failed')), 'poisson', (2,), None),
+    (_matches('critical'), 'poisson', (0.2,), None),
+    (_matches('warning'), 'poisson', (5,), None),
+    (_matches('status_2', '2xx'), 'poisson', (90,), None),
+    (_matches('status_4', '4xx'), 'poisson', (8,), None),
+    (_matches('status_5', '5xx'), 'poisson', (2,), None),
+    (_matches(all_of=('spaces', 'occupied')), 'integers', (20, 80), None),
+    (_matches(all_of=('spaces', 'available')), 'integers', (10, 50), None),
+    (_matches('eviction', 'miss'), 'poisson', (3,), None),
+    (_matches(), 'poisson', (5,), None),
+)
+
+_RULES = {'float': FLOAT_RULES, 'int': INT_RULES}
+
+
+def _rule_index(field_type: str, field_name: str) -> int:
+    """Index of the first rule of a field type matching the field name"""
+    field_lower = field_name.lower()
+    for index, (predicate, _, _, _) in enumerate(_RULES[field_type]):
+        if predicate(field_lower):
+            return index
+    raise ValueError(f"No sampling rule for {field_type} field {field_name!r}")
+
+
+# Distribution families used by the sampling rules; CompiledMeasurement.dist_ids
+# index into this tuple
+_DISTRIBUTIONS = ('normal', 'gamma', 'exponential', 'beta', 'uniform',
+                  'poisson', 'binomial', 'integers')
+_DISTRIBUTION_IDS = {method: dist_id for dist_id, method in enumerate(_DISTRIBUTIONS)}
+
+# Families _draw fills in place from their standard form
+_IN_PLACE_FAMILIES = frozenset(('normal', 'exponential', 'gamma', 'uniform'))
+
+# Rows sampled per chunk for long windows; 64k float64 rows (512 KiB per
+# field) keep a family's block within L2
+_SAMPLE_CHUNK_ROWS = 65536
+
+
+def _draw(
+    rng: np.random.Generator,
+    method: str,
+    args: Tuple[Any, ...],
+    shape: Tuple[int, ...]
+) -> np.ndarray:
+    """Draw an array of the given shape from a distribution family
+
+    Location/scale families are drawn into one preallocated buffer from
+    their standard form and rescaled in place; the rest go through the
+    Generator method directly.
+    """
+    if method not in _IN_PLACE_FAMILIES:
+        return getattr(rng, method)(*args, size=shape)
+
+    out = np.empty(shape)
+    if method == 'normal':
+        rng.standard_normal(out=out)
+        out *= args[1]
+        out += args[0]
+    elif method == 'exponential':
+        rng.standard_exponential(out=out)
+        out *= args[0]
+    elif method == 'gamma':
+        rng.standard_gamma(args[0], out=out)
+        out *= args[1]
+    elif method == 'uniform':
+        rng.random(out=out)
+        out *= np.subtract(args[1], args[0])
+        out += args[0]
+    return out
+
+
+def _sample(field_type: str, rule_index: int, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Draw n values for a rule, clipped in place and cast to the field dtype"""
+    _, method, args, clip = _RULES[field_type][rule_index]
+    values = _draw(rng, method, args, (n,))
+    if method == 'beta':
+        values *= 100
+    if clip is not None:
+        np.clip(values, clip[0], clip[1], out=values)
+    return values.astype(_FIELD_DTYPES[field_type], copy=False)
+
+
+def compile_measurement(measurement: MeasurementSchema) -> CompiledMeasurement:
+    """Flatten a measurement's fields into per-field parameter arrays"""
+    field_names = []
+    dist_ids = []
+    params = []
+    clips = []
+    is_int = []
+    for field_name, field_type in measurement.fields.items():
+        if field_type not in _RULES:
+            continue
+        _, method, args, clip = _RULES[field_type][_rule_index(field_type, field_name)]
+        field_names.append(field_name)
+        dist_ids.append(_DISTRIBUTION_IDS[method])
+        params.append(args + (np.nan,) * (2 - len(args)))
+        clips.append(clip if clip is not None else (-np.inf, np.inf))
+        is_int.append(field_type == 'int')
+
+    params = np.array(params, dtype=np.float64).reshape(-1, 2)
+    clips = np.array(clips, dtype=np.float64).reshape(-1, 2)
+    compiled = CompiledMeasurement(
+        field_names=field_names,
+        dist_ids=np.array(dist_ids, dtype=np.int8),
+        param_a=params[:, 0],
+        param_b=params[:, 1],
+        clip_lo=clips[:, 0],
+        clip_hi=clips[:, 1],
+        is_int=np.array(is_int, dtype=bool),
+    )
+    compiled.steps = _compile_steps(compiled)
+    return compiled
+
+
+def _compile_steps(compiled: CompiledMeasurement) -> Tuple[Tuple[Any, ...], ...]:
+    """Specialize the per-family sampling of a measurement ahead of time
+
+    Everything that only depends on the schema (family grouping,
+    broadcast-shaped parameters, clip bounds, output columns) is worked
+    out here, so _sample_compiled only draws, clips and slices.
+    """
+    steps = []
+    for dist_id in np.unique(compiled.dist_ids):
+        method = _DISTRIBUTIONS[dist_id]
+        idx = np.flatnonzero(compiled.dist_ids == dist_id)
+
+        # One row per field: parameters broadcast down the rows, so each
+        # field's values come out contiguous
+        args = (compiled.param_a[idx, None], compiled.param_b[idx, None])
+        if method in ('exponential', 'poisson'):
+            args = args[:1]
+        elif method == 'integers':
+            args = tuple(arg.astype(np.int64) for arg in args)
+        elif method == 'binomial':
+            args = (args[0].astype(np.int64), args[1])
+
+        clip = None
+        if method not in ('poisson', 'binomial', 'integers'):
+            clip_lo = compiled.clip_lo[idx, None]
+            clip_hi = compiled.clip_hi[idx, None]
+            if np.isfinite(clip_lo).any() or np.isfinite(clip_hi).any():
+                clip = (clip_lo, clip_hi)
+
+        outputs = tuple(
+            (
+                compiled.field_names[field_index],
+                _FIELD_DTYPES['int' if compiled.is_int[field_index] else 'float']
+            )
+            for field_index in idx
+        )
+        steps.append((method, args, clip, outputs))
+    return tuple(steps)
+
+
+def _sample_compiled(
+    rng: np.random.Generator,
+    compiled: CompiledMeasurement,
+    n: int
+) -> Dict[str, np.ndarray]:
+    """Draw n rows for every field, one Generator call per family and chunk
+
+    Long windows are sampled _SAMPLE_CHUNK_ROWS rows at a time: every
+    field of a chunk is drawn, clipped and copied out while its buffers
+    are still in cache, instead of making each pass over full-length
+    arrays.
+    """
+    if n <= _SAMPLE_CHUNK_ROWS:
+        return _sample_chunk(rng, compiled, n)
+
+    columns = {
+        field_name: np.empty(n, dtype=dtype)
+        for _, _, _, outputs in compiled.steps
+        for field_name, dtype in outputs
+    }
+    for start in range(0, n, _SAMPLE_CHUNK_ROWS):
+        stop = min(start + _SAMPLE_CHUNK_ROWS, n)
+        for field_name, values in _sample_chunk(rng, compiled, stop - start).items():
+            columns[field_name][start:stop] = values
+
+    return {field_name: columns[field_name] for field_name in compiled.field_names}
+
+
+def _sample_chunk(
+    rng: np.random.Generator,
+    compiled: CompiledMeasurement,
+    n: int
+) -> Dict[str, np.ndarray]:
+    """Draw n rows for every field, one Generator call per distribution family"""
+    columns = {}
+    for method, args, clip, outputs in compiled.steps:
+        block = _draw(rng, method, args, (len(outputs), n))
+        if method == 'beta':
+            block *= 100
+        if clip is not None:
+            np.clip(block, clip[0], clip[1], out=block)
+
+        for row, (field_name, dtype) in enumerate(outputs):
+            columns[field_name] = block[row].astype(dtype, copy=False)
+
+    return {field_name: columns[field_name] for field_name in compiled.field_names}
+
+
+def _sample_tags(rng: np.random.Generator, measurement: MeasurementSchema) -> Dict[str, str]:
+    """Draw one tag set for a measurement with a single vectorized call"""
+    tag_arrays = measurement.tag_arrays
+    indices = rng.integers(0, [len(values) for values in tag_arrays.values()])
+    return {
+        tag_name: values[index]
+        for (tag_name, values), index in zip(tag_arrays.items(), indices)
+    }
+
+
+def _generate_measurement(
+    measurement: MeasurementSchema,
+    compiled: CompiledMeasurement,
+    rng: np.random.Generator,
+    timestamps: pd.DatetimeIndex
+) -> Tuple[str, pd.DataFrame, Dict[str, str]]:
+    """Build one measurement's DataFrame and tag set
+
+    Lives at module level so ProcessPoolExecutor workers can run it.
+    """
+    columns = _sample_compiled(rng, compiled, len(timestamps))
+    df = pd.DataFrame(columns, index=timestamps, copy=False)
+    return measurement.name, df, _sample_tags(rng, measurement)
+
 
 class HeterogeneousDataGenerator:
     """Generates heterogeneous time-series data for testing"""
 
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, max_workers: int = 1):
         self.seed = seed
-        np.random.seed(seed)
+        self.max_workers = max(1, max_workers)
+        self.rng = np.random.default_rng(seed)
         self.schemas = self._create_schemas()
+        self._rule_indexes = self._compile_rules()
+        self._compiled = {
+            (database.name, measurement.name): compile_measurement(measurement)
+            for database in self.schemas
+            for measurement in database.measurements
+        }
+        self._float_sampler = self._compile_samplers('float')
+        self._int_sampler = self._compile_samplers('int')
+        self._index_cache: Dict[Tuple[datetime, datetime, str], pd.DatetimeIndex] = {}
+        self._index_window: Optional[Tuple[datetime, datetime]] = None
         logger.info(f"Initialized generator with {len(self.schemas)} database schemas")
 
+    def spawn(self, n: int) -> List[np.random.Generator]:
+        """Return n independent generators derived from this one's seed
+
+        Each child stream is statistically independent, so parallel
+        workers can sample without sharing (or locking) self.rng.
+        """
+        return self.rng.spawn(n)
+
     def _create_schemas(self) -> List[DatabaseSchema]:
         """Create 4 database schemas with heterogeneous data types"""
         return [
@@ -393,7 +712,7 @@ class HeterogeneousDataGenerator:
         measurement: MeasurementSchema,
         timestamp: datetime
     ) -> Dict[str, Any]:
-        """Generate single data point for a measurement"""
+        """Generate single data point for a measurement ('time' is the datetime as given, UTC)"""
         fields = {}
         for field_name, field_type in measurement.fields.items():
             if field_type == 'float':
@@ -401,283 +720,208 @@ class HeterogeneousDataGenerator:
             elif field_type == 'int':
                 fields[field_name] = self._generate_int(field_name)
 
-        tags = {
-            tag_name: np.random.choice(values)
-            for tag_name, values in measurement.tags.items()
-        }
+        tags = _sample_tags(self.rng, measurement)
 
         return {
             'measurement': measurement.name,
-            'time': timestamp.isoformat() + 'Z',
+            'time': timestamp,
             'fields': fields,
             'tags': tags
         }
 
     def _generate_float(self, field_name: str) -> float:
-        """Generate realistic float values based on field name patterns"""
-        field_lower = field_name.lower()
-
-        # Temperature fields
-        if 'temperature' in field_lower or 'temp' in field_lower:
-            if 'motor' in field_lower or 'machine' in field_lower:
-                return float(np.random.normal(65.0, 10.0))
-            elif 'setpoint' in field_lower:
-                return float(np.random.normal(22.0, 1.0))
-            return float(np.random.normal(22.0, 3.0))
-
-        # Humidity
-        elif 'humidity' in field_lower or 'moisture' in field_lower:
-            return float(np.clip(np.random.normal(50.0, 15.0), 0, 100))
-
-        # Pressure
-        elif 'pressure' in field_lower:
-            return float(np.random.normal(1013.25, 10.0))
-
-        # CPU/Memory usage
-        elif 'cpu' in field_lower or 'memory' in field_lower:
-            return float(np.clip(np.random.gamma(2, 15), 0, 100))
-
-        # Response time
-        elif 'response_time' in field_lower or 'query_time' in field_lower or 'wait_time' in field_lower:
-            return float(np.clip(np.random.exponential(50), 1, 5000))
-
-        # Percentages
-        elif 'pct' in field_lower or 'rate' in field_lower or 'efficiency' in field_lower:
-            return float(np.clip(np.random.beta(8, 2) * 100, 0, 100))
-
-        # Power consumption
-        elif 'power' in field_lower or 'consumption' in field_lower:
-            if 'kw' in field_lower:
-                return float(np.clip(np.random.gamma(3, 2), 0.5, 50))
-            else:  # watts
-                return float(np.clip(np.random.gamma(4, 50), 10, 1000))
-
-        # Vibration
-        elif 'vibration' in field_lower:
-            return float(np.clip(np.random.normal(0.5, 0.2), 0, 5))
-
-        # Speed
-        elif 'speed' in field_lower:
-            return float(np.clip(np.random.normal(1.5, 0.3), 0, 5))
-
-        # Luminosity
-        elif 'luminosity' in field_lower or 'brightness' in field_lower:
-            return float(np.clip(np.random.gamma(5, 10), 0, 100))
-
-        # UV index
-        elif 'uv' in field_lower:
-            return float(np.clip(np.random.gamma(2, 1), 0, 11))
-
-        # PM2.5, PM10
-        elif 'pm' in field_lower:
-            return float(np.clip(np.random.exponential(15), 0, 150))
-
-        # Voltage, Current, Power Factor
-        elif 'voltage' in field_lower:
-            return float(np.random.normal(230.0, 5.0))
-        elif 'current' in field_lower:
-            return float(np.clip(np.random.gamma(3, 5), 0, 100))
-        elif 'factor' in field_lower:
-            return float(np.clip(np.random.normal(0.95, 0.05), 0.7, 1.0))
-
-        # Load
-        elif 'load' in field_lower:
-            return float(np.clip(np.random.gamma(4, 20), 0, 500))
-
-        # Smoke level
-        elif 'smoke' in field_lower:
-            return float(np.clip(np.random.exponential(2), 0, 10))
-
-        # Storage
-        elif 'storage' in field_lower:
-            return float(np.clip(np.random.gamma(5, 2), 0, 100))
-
-        # Sensitivity
-        elif 'sensitivity' in field_lower:
-            return float(np.random.uniform(0.5, 1.0))
-
-        # Processing time
-        elif 'processing' in field_lower:
-            return float(np.clip(np.random.exponential(30), 1, 300))
-
-        # Conversion rate
-        elif 'conversion' in field_lower:
-            return float(np.clip(np.random.beta(2, 5) * 100, 0, 100))
-
-        # Cycle time
-        elif 'cycle' in field_lower:
-            return float(np.clip(np.random.normal(45.0, 10.0), 10, 120))
-
-        # Occupancy time
-        elif 'occupancy_time' in field_lower:
-            return float(np.clip(np.random.exponential(60), 5, 300))
-
-        # Default: uniform distribution
-        else:
-            return float(np.random.uniform(0, 100))
+        """Generate a realistic float value based on field name patterns"""
+        return self._generate_float_bulk(field_name, 1).item()
 
     def _generate_int(self, field_name: str) -> int:
-        """Generate realistic integer values based on field name patterns"""
-        field_lower = field_name.lower()
-
-        # Counters
-        if 'count' in field_lower:
-            if 'error' in field_lower or 'defect' in field_lower or 'failed' in field_lower:
-                return int(np.random.poisson(0.5))
-            elif 'alarm' in field_lower or 'emergency' in field_lower:
-                return int(np.random.poisson(0.1))
-            elif 'request' in field_lower or 'transaction' in field_lower:
-                return int(np.random.poisson(100))
-            elif 'connection' in field_lower:
-                return int(np.random.poisson(20))
-            elif 'access' in field_lower or 'door' in field_lower or 'card' in field_lower:
-                return int(np.random.poisson(5))
-            elif 'trip' in field_lower:
-                return int(np.random.poisson(3))
-            return int(np.random.poisson(10))
-
-        # Detected/Status/Boolean flags
-        elif 'detected' in field_lower or 'status' in field_lower or 'is_open' in field_lower or 'occupancy' in field_lower:
-            return int(np.random.choice([0, 1], p=[0.7, 0.3]))
-
-        # Granted/Denied
-        elif 'granted' in field_lower:
-            return int(np.random.poisson(10))
-        elif 'denied' in field_lower:
-            return int(np.random.poisson(1))
-
-        # RPM
-        elif 'rpm' in field_lower:
-            return int(np.random.normal(1500, 200))
-
-        # Floor numbers
-        elif 'floor' in field_lower and 'current' in field_lower:
-            return int(np.random.randint(1, 20))
-
-        # Large counters (bytes)
-        elif 'bytes' in field_lower:
-            return int(np.random.exponential(1000000))
-
-        # CO2, VOC
-        elif 'co2' in field_lower:
-            return int(np.random.normal(450, 100))
-        elif 'voc' in field_lower:
-            return int(np.random.normal(100, 30))
-
-        # Users
-        elif 'user' in field_lower and 'active' in field_lower:
-            return int(np.random.poisson(500))
-
-        # Revenue (cents)
-        elif 'revenue' in field_lower:
-            return int(np.random.exponential(100000))
-
-        # Units produced
-        elif 'units' in field_lower or 'produced' in field_lower:
-            return int(np.random.poisson(50))
-
-        # Slow queries, deadlocks
-        elif 'slow' in field_lower or 'deadlock' in field_lower:
-            return int(np.random.poisson(0.5))
-
-        # Jobs
-        elif 'job' in field_lower:
-            if 'queued' in field_lower:
-                return int(np.random.poisson(15))
-            elif 'processing' in field_lower:
-                return int(np.random.poisson(5))
-            elif 'completed' in field_lower:
-                return int(np.random.poisson(100))
-            elif 'failed' in field_lower:
-                return int(np.random.poisson(2))
-
-        # Critical errors, warnings
-        elif 'critical' in field_lower:
-            return int(np.random.poisson(0.2))
-        elif 'warning' in field_lower:
-            return int(np.random.poisson(5))
-
-        # Status codes
-        elif 'status_2' in field_lower or '2xx' in field_lower:
-            return int(np.random.poisson(90))
-        elif 'status_4' in field_lower or '4xx' in field_lower:
-            return int(np.random.poisson(8))
-        elif 'status_5' in field_lower or '5xx' in field_lower:
-            return int(np.random.poisson(2))
-
-        # Spaces (parking)
-        elif 'spaces' in field_lower:
-            if 'occupied' in field_lower:
-                return int(np.random.randint(20, 80))
-            elif 'available' in field_lower:
-                return int(np.random.randint(10, 50))
-
-        # Eviction, miss
-        elif 'eviction' in field_lower or 'miss' in field_lower:
-            return int(np.random.poisson(3))
-
-        # Default: small poisson
-        else:
-            return int(np.random.poisson(5))
+        """Generate a realistic integer value based on field name patterns"""
+        return self._generate_int_bulk(field_name, 1).item()
+
+    def _compile_rules(self) -> Dict[Tuple[str, str], int]:
+        """Resolve every schema field to its sampling rule once"""
+        return {
+            (field_name, field_type): _rule_index(field_type, field_name)
+            for database in self.schemas
+            for measurement in database.measurements
+            for field_name, field_type in measurement.fields.items()
+            if field_type in _RULES
+        }
+
+    def _compile_samplers(
+        self,
+        field_type: str
+    ) -> Dict[str, Callable[[int], np.ndarray]]:
+        """Bind a sampler(n) to self.rng for every schema field of a type"""
+        return {
+            field_name: partial(_sample, field_type, rule_index, self.rng)
+            for (field_name, rule_type), rule_index in self._rule_indexes.items()
+            if rule_type == field_type
+        }
+
+    def _generate_float_bulk(self, field_name: str, n: int) -> np.ndarray:
+        """Generate n float values at once"""
+        sampler = self._float_sampler.get(field_name)
+        if sampler is None:
+            return _sample('float', _rule_index('float', field_name), self.rng, n)
+        return sampler(n)
+
+    def _generate_int_bulk(self, field_name: str, n: int) -> np.ndarray:
+        """Generate n integer values at once"""
+        sampler = self._int_sampler.get(field_name)
+        if sampler is None:
+            return _sample('int', _rule_index('int', field_name), self.rng, n)
+        return sampler(n)
 
     def generate_bulk_data(
         self,
         database: DatabaseSchema,
         hours: int = 1
-    ) -> Dict[str, pd.DataFrame]:
-        """Generate bulk historical data for all measurements in a database"""
-        result = {}
+    ) -> Dict[str, Tuple[pd.DataFrame, Dict[str, str]]]:
+        """Generate bulk historical data for all measurements in a database
+
+        Each measurement maps to a (DataFrame, tags) tuple; the tags are
+        passed separately to write_dataframe. Holds every measurement in
+        memory at once; use generate_bulk_data_stream to write them as
+        they are built.
+        """
+        return {
+            name: (df, tags)
+            for name, df, tags in self.generate_bulk_data_stream(database, hours)
+        }
 
-        for measurement in database.measurements:
+    def generate_bulk_data_stream(
+        self,
+        database: DatabaseSchema,
+        hours: int = 1
+    ) -> Iterator[Tuple[str, pd.DataFrame, Dict[str, str]]]:
+        """Yield (measurement, DataFrame, tags) one measurement at a time
+
+        Every measurement samples from its own spawned generator, so the
+        output is the same whether it runs sequentially or on max_workers
+        processes. Sequentially, peak memory is a single measurement as
+        long as the caller drops each frame before taking the next.
+        """
+        # One window per call, truncated to the second so calls made in
+        # the same second share the cached indexes
+        end_time = datetime.utcnow().replace(microsecond=0)
+        start_time = end_time - timedelta(hours=hours)
+
+        measurements = database.measurements
+        tasks = (
+            measurements,
+            [self._compiled_measurement(database, measurement) for measurement in measurements],
+            self.spawn(len(measurements)),
+            [
+                self._time_index(start_time, end_time, measurement.frequency)
+                for measurement in measurements
+            ],
+        )
+
+        workers = min(self.max_workers, len(measurements))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from self._log_generated(
+                    database, hours, pool.map(_generate_measurement, *tasks)
+                )
+        else:
+            yield from self._log_generated(
+                database, hours, map(_generate_measurement, *tasks)
+            )
+
+    def _log_generated(
+        self,
+        database: DatabaseSchema,
+        hours: int,
+        generated: Iterable[Tuple[str, pd.DataFrame, Dict[str, str]]]
+    ) -> Iterator[Tuple[str, pd.DataFrame, Dict[str, str]]]:
+        """Pass generated measurements through, logging each one"""
+        for name, df, tags in generated:
             logger.info(
-                f"Generating {hours}h of data for {database.name}.{measurement.name} "
-                f"(frequency: {measurement.frequency})"
+                f"Generated {len(df)} points ({hours}h) for {database.name}.{name}"
             )
+            yield name, df, tags
 
-            # Generate timestamps
-            end_time = datetime.utcnow()
-            start_time = end_time - timedelta(hours=hours)
+    def _compiled_measurement(
+        self,
+        database: DatabaseSchema,
+        measurement: MeasurementSchema
+    ) -> CompiledMeasurement:
+        """Return the compiled sampling arrays, compiling unknown schemas on demand"""
+        compiled = self._compiled.get((database.name, measurement.name))
+        if compiled is None:
+            compiled = compile_measurement(measurement)
+        return compiled
+
+    def _time_index(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        frequency: str
+    ) -> pd.DatetimeIndex:
+        """Return the DatetimeIndex for a window and frequency, built once
+
+        DatetimeIndex is immutable, so measurements sharing a frequency
+        share the same index. Only the current window is kept.
+        """
+        if self._index_window != (start_time, end_time):
+            self._index_window = (start_time, end_time)
+            self._index_cache.clear()
+
+        key = (start_time, end_time, frequency)
+        timestamps = self._index_cache.get(key)
+        if timestamps is None:
             timestamps = pd.date_range(
                 start=start_time,
                 end=end_time,
-                freq=measurement.frequency
+                freq=frequency,
+                tz='UTC',
+                name='time'
             )
+            self._index_cache[key] = timestamps
+        return timestamps
 
-            # Generate points
-            points = [
-                self.generate_point(measurement, ts.to_pydatetime())
-                for ts in timestamps
-            ]
-
-            # Convert to DataFrame
-            df = self._points_to_dataframe(points)
-            result[measurement.name] = df
-
-            logger.info(f"Generated {len(df)} points for {measurement.name}")
-
-        return result
-
-    def _points_to_dataframe(self, points: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Convert list of points to DataFrame compatible with InfluxdbOperation"""
+    def _points_to_dataframe(
+        self,
+        points: List[Dict[str, Any]],
+        measurement: Optional[MeasurementSchema] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """Convert list of points to a (DataFrame, tags) tuple for InfluxdbOperation
+
+        Column dtypes come from the measurement schema when given, otherwise
+        from the Python types in the first point.
+        """
         if not points:
-            return pd.DataFrame()
-
-        # Extract timestamps
-        timestamps = [
-            pd.to_datetime(p['time']) for p in points
-        ]
+            return pd.DataFrame(), {}
+
+        # One vectorized conversion for the whole column. generate_point
+        # emits datetimes (naive means UTC); ISO strings from other sources
+        # take the explicit ISO8601 path with the repeated-value cache
+        timestamps = pd.DatetimeIndex(
+            pd.to_datetime(
+                [p['time'] for p in points],
+                utc=True,
+                format='ISO8601',
+                cache=True
+            ),
+            name='time'
+        )
 
-        # Extract fields
-        fields_data = {
-            field_name: [p['fields'].get(field_name) for p in points]
-            for field_name in points[0]['fields'].keys()
+        # Fill typed columns directly so pandas has nothing to infer
+        if measurement is not None:
+            field_types = measurement.fields
+        else:
+            field_types = {
+                field_name: 'int' if isinstance(value, (int, np.integer)) else 'float'
+                for field_name, value in points[0]['fields'].items()
+            }
+        columns = {
+            field_name: np.fromiter(
+                (p['fields'][field_name] for p in points),
+                dtype=_FIELD_DTYPES[field_type],
+                count=len(points)
+            )
+            for field_name, field_type in field_types.items()
         }
+        df = pd.DataFrame(data=columns, index=timestamps, copy=False)
 
-        # Create DataFrame with timestamps as index
-        df = pd.DataFrame(fields_data, index=timestamps)
-        df.index.name = 'time'
-
-        # Store tags as metadata (to be passed separately to write_dataframe)
-        df._tags = points[0]['tags']
-
-        return df
+        return df, points[0]['tags']
@@ -1,19 +1,45 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class MeasurementSchema:
-    """Schema definition for a measurement"""
+    """Schema definition for a measurement (hashable on name and frequency)"""
     name: str
-    fields: Dict[str, str]  # field_name -> field_type
-    tags: Dict[str, List[str]]  # tag_name -> possible_values
+    fields: Dict[str, str] = field(hash=False)  # field_name -> field_type
+    tags: Dict[str, List[str]] = field(hash=False)  # tag_name -> possible_values
     frequency: str  # pandas frequency string
+    # tag_name -> possible_values as an object array, built once for sampling
+    tag_arrays: Dict[str, np.ndarray] = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        # Frozen: bypass the generated __setattr__ for the derived field
+        object.__setattr__(self, 'tag_arrays', {
+            tag_name: np.array(values, dtype=object)
+            for tag_name, values in self.tags.items()
+        })
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DatabaseSchema:
-    """Schema definition for a database"""
+    """Schema definition for a database (hashable on name and description)"""
     name: str
     description: str
-    measurements: List[MeasurementSchema]
+    measurements: List[MeasurementSchema] = field(hash=False)
+
+
+@dataclass
+class CompiledMeasurement:
+    """Per-field sampling parameters of a measurement, one array per attribute"""
+    field_names: List[str]
+    dist_ids: np.ndarray  # int8 index into the generator's distribution families
+    param_a: np.ndarray  # float64 first distribution parameter
+    param_b: np.ndarray  # float64 second parameter (NaN if unused)
+    clip_lo: np.ndarray  # float64 lower clip bound (-inf if none)
+    clip_hi: np.ndarray  # float64 upper clip bound (inf if none)
+    is_int: np.ndarray  # bool, cast the column to int64
+    # Per-family sampling steps worked out at compile time:
+    # (method, broadcast args, clip bounds or None, ((field_name, dtype), ...))
+    steps: Tuple[Tuple[Any, ...], ...] = ()
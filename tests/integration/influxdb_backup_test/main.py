@@ -1,9 +1,14 @@
 import logging
 import os
+import queue
 import sys
+import threading
 import time
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List
+from functools import cached_property
+from typing import Dict, Any, List, Tuple
 
 from ctrutils.database.influxdb import InfluxdbOperation
 
@@ -23,57 +28,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Threads writing generated frames in phase 1, and frames generated ahead of them
+PHASE1_WRITERS = 4
+PHASE1_QUEUE_SIZE = 4
+
+
+@dataclass(frozen=True, slots=True)
+class TestConfig:
+    """Test settings, read once from the environment"""
+    source_host: str
+    source_port: int
+    dest_host: str
+    dest_port: int
+    user: str
+    password: str
+    initial_hours: int
+    continuous_generation: bool
+    test_duration: int
+    generation_interval: int
+    resume_backup: bool
+    backup_format: str
+    generator_workers: int
+
 
 class BackupTestOrchestrator:
     """Orchestrates the complete backup/restore testing workflow"""
 
     def __init__(self):
-        self.config = self._load_config()
+        self.cfg = self._load_config()
         self._setup_influxdb_connections()
         self._setup_components()
 
-    def _load_config(self) -> Dict[str, Any]:
+    def _load_config(self) -> TestConfig:
         """Load configuration from environment variables"""
-        return {
-            'source': {
-                'host': os.getenv('SOURCE_HOST', 'influxdb-source'),
-                'port': int(os.getenv('SOURCE_PORT', 8086))
-            },
-            'dest': {
-                'host': os.getenv('DEST_HOST', 'influxdb-destination'),
-                'port': int(os.getenv('DEST_PORT', 8086))
-            },
-            'influxdb': {
-                'user': os.getenv('INFLUXDB_USER', 'admin'),
-                'password': os.getenv('INFLUXDB_PASSWORD', 'admin123')
-            },
-            'test': {
-                'initial_hours': int(os.getenv('INITIAL_HOURS', 2)),
-                'continuous_generation': os.getenv('CONTINUOUS_GENERATION', 'false').lower() == 'true',
-                'test_duration': int(os.getenv('TEST_DURATION', 300)),
-                'generation_interval': int(os.getenv('GENERATION_INTERVAL', 10))
-            }
-        }
+        return TestConfig(
+            source_host=os.getenv('SOURCE_HOST', 'influxdb-source'),
+            source_port=int(os.getenv('SOURCE_PORT', 8086)),
+            dest_host=os.getenv('DEST_HOST', 'influxdb-destination'),
+            dest_port=int(os.getenv('DEST_PORT', 8086)),
+            user=os.getenv('INFLUXDB_USER', 'admin'),
+            password=os.getenv('INFLUXDB_PASSWORD', 'admin123'),
+            initial_hours=int(os.getenv('INITIAL_HOURS', 2)),
+            continuous_generation=os.getenv('CONTINUOUS_GENERATION', 'false').lower() == 'true',
+            test_duration=int(os.getenv('TEST_DURATION', 300)),
+            generation_interval=int(os.getenv('GENERATION_INTERVAL', 10)),
+            resume_backup=os.getenv('RESUME_BACKUP', 'false').lower() == 'true',
+            backup_format=os.getenv('BACKUP_FORMAT', 'line'),
+            generator_workers=int(os.getenv('GENERATOR_WORKERS', 1))
+        )
+
+    @cached_property
+    def database_names(self) -> List[str]:
+        """Names of the databases in the generator's schemas"""
+        return [schema.name for schema in self.generator.schemas]
+
+    def _create_operation(self, endpoint: str) -> InfluxdbOperation:
+        """Create an InfluxdbOperation for the 'source' or 'dest' endpoint"""
+        op = InfluxdbOperation(
+            host=getattr(self.cfg, f'{endpoint}_host'),
+            port=getattr(self.cfg, f'{endpoint}_port'),
+            username=self.cfg.user,
+            password=self.cfg.password
+        )
+        op.enable_logging(level=logging.INFO)
+        return op
 
     def _setup_influxdb_connections(self):
         """Initialize InfluxDB connections"""
         logger.info("Connecting to source InfluxDB...")
-        self.source_op = InfluxdbOperation(
-            host=self.config['source']['host'],
-            port=self.config['source']['port'],
-            username=self.config['influxdb']['user'],
-            password=self.config['influxdb']['password']
-        )
-        self.source_op.enable_logging(level=logging.INFO)
+        self.source_op = self._create_operation('source')
 
         logger.info("Connecting to destination InfluxDB...")
-        self.dest_op = InfluxdbOperation(
-            host=self.config['dest']['host'],
-            port=self.config['dest']['port'],
-            username=self.config['influxdb']['user'],
-            password=self.config['influxdb']['password']
-        )
-        self.dest_op.enable_logging(level=logging.INFO)
+        self.dest_op = self._create_operation('dest')
 
         # Test connections
         try:
@@ -86,9 +112,26 @@ class BackupTestOrchestrator:
 
     def _setup_components(self):
         """Initialize test components"""
-        self.generator = HeterogeneousDataGenerator()
-        self.backup_manager = BackupManager(self.source_op, self.dest_op)
-        self.validator = DataValidator(self.source_op, self.dest_op)
+        self.generator = HeterogeneousDataGenerator(
+            max_workers=self.cfg.generator_workers
+        )
+        self.backup_manager = BackupManager(
+            self.source_op,
+            self.dest_op,
+            backup_format=self.cfg.backup_format,
+            # The manager moves every operation onto its shared session
+            source_factory=lambda: self._create_operation('source'),
+            dest_factory=lambda: self._create_operation('dest'),
+            dest_url=f"http://{self.cfg.dest_host}:{self.cfg.dest_port}",
+            dest_username=self.cfg.user,
+            dest_password=self.cfg.password
+        )
+        self.validator = DataValidator(
+            self.source_op,
+            self.dest_op,
+            source_factory=lambda: self._create_operation('source'),
+            dest_factory=lambda: self._create_operation('dest')
+        )
 
     def run_test(self) -> bool:
         """
@@ -106,21 +149,25 @@ class BackupTestOrchestrator:
             logger.info("\n[PHASE 1] Generating initial bulk data...")
             self._phase1_generate_bulk_data()
 
-            # Phase 2: Backup all databases
-            logger.info("\n[PHASE 2] Backing up all databases...")
-            backup_results = self._phase2_backup()
-
-            # Phase 3: Restore to destination
-            logger.info("\n[PHASE 3] Restoring to destination...")
-            restore_results = self._phase3_restore(backup_results)
+            with self.backup_manager:
+                # Phases 2-3: Backup all databases, restoring each one to
+                # the destination as soon as its backup is done
+                logger.info(
+                    "\n[PHASE 2-3] Backing up databases and restoring to destination..."
+                )
+                backup_results, restore_results = self._phase2_backup_and_restore()
 
             # Phase 4: Validate data integrity
             logger.info("\n[PHASE 4] Validating data integrity...")
-            comparisons = self._phase4_validate()
+            with self.validator:
+                comparisons = self._phase4_validate()
 
             # Phase 5: Real-time data generation (optional)
-            if self.config['test'].get('continuous_generation', False):
+            if self.cfg.continuous_generation:
                 logger.info("\n[PHASE 5] Continuous data generation...")
+                # Measurement lists cached during validation go stale once
+                # new data is written
+                self.validator.clear_cache()
                 self._phase5_continuous_generation()
 
             # Generate and print report
@@ -130,7 +177,7 @@ class BackupTestOrchestrator:
             reporter.save_report('/app/logs/test_report.json')
 
             # Determine test result
-            passed = all(db.summary['match_percentage'] == 100.0 for db in comparisons)
+            passed = all(db.summary['integrity_pass'] for db in comparisons)
 
             if passed:
                 logger.info("\n" + "=" * 80)
@@ -148,86 +195,114 @@ class BackupTestOrchestrator:
             return False
 
     def _phase1_generate_bulk_data(self):
-        """Generate initial data for all databases"""
+        """
+        Generate initial data for all databases. Writer threads drain a
+        bounded queue of generated frames, so the next measurements are
+        generated while earlier ones are being written
+        """
         start_time = time.time()
 
-        for db_schema in self.generator.schemas:
-            logger.info(f"Creating database: {db_schema.name}")
-            self.source_op.create_database(db_schema.name)
-
-            # Generate data for each measurement
-            bulk_data = self.generator.generate_bulk_data(
-                db_schema,
-                hours=self.config['test']['initial_hours']
-            )
-
-            for measurement, df in bulk_data.items():
-                logger.info(
-                    f"Writing {len(df)} points to {db_schema.name}.{measurement}"
-                )
-
-                # Extract tags from DataFrame metadata
-                tags = getattr(df, '_tags', {})
+        generated: queue.Queue = queue.Queue(maxsize=PHASE1_QUEUE_SIZE)
+        errors: List[BaseException] = []
+
+        def write():
+            # Each writer gets its own client: the operation tracks the
+            # active database
+            op = self._create_operation('source')
+            try:
+                while True:
+                    item = generated.get()
+                    if item is None:
+                        return
+                    if errors:
+                        # Keep draining so the generator never blocks
+                        continue
+                    database, measurement, df, tags = item
+                    try:
+                        logger.info(
+                            "Writing %d points to %s.%s", len(df), database, measurement
+                        )
+                        stats = op.write_dataframe(
+                            measurement=measurement,
+                            data=df,
+                            tags=tags,
+                            database=database,
+                            batch_size=5000
+                        )
+                        logger.info("Write stats: %s", stats)
+                    except Exception as e:
+                        errors.append(e)
+            finally:
+                op.close_client()
+
+        writers = [
+            threading.Thread(target=write, name=f"phase1-writer-{i}", daemon=True)
+            for i in range(PHASE1_WRITERS)
+        ]
+        for writer in writers:
+            writer.start()
 
-                stats = self.source_op.write_dataframe(
-                    measurement=measurement,
-                    data=df,
-                    tags=tags,
-                    database=db_schema.name,
-                    batch_size=5000
+        try:
+            for db_schema in self.generator.schemas:
+                if errors:
+                    break
+                # Created before any of its frames are queued
+                logger.info("Creating database: %s", db_schema.name)
+                self.source_op.create_database(db_schema.name)
+
+                bulk_data = self.generator.generate_bulk_data_stream(
+                    db_schema,
+                    hours=self.cfg.initial_hours
                 )
+                for measurement, df, tags in bulk_data:
+                    generated.put((db_schema.name, measurement, df, tags))
+        finally:
+            for _ in writers:
+                generated.put(None)
+            for writer in writers:
+                writer.join()
 
-                logger.info(f"Write stats: {stats}")
+        if errors:
+            raise errors[0]
 
         elapsed = time.time() - start_time
         logger.info(f"Phase 1 complete in {elapsed:.2f}s")
 
-    def _phase2_backup(self) -> Dict[str, Dict[str, Any]]:
-        """Backup all databases"""
+    def _phase2_backup_and_restore(
+        self
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Backup all databases, pipelining each restore behind its backup"""
         start_time = time.time()
 
-        databases = [schema.name for schema in self.generator.schemas]
-        backup_results = self.backup_manager.backup_all_databases(databases)
-
-        # Log summary
-        total_points = sum(r['total_points'] for r in backup_results.values())
-        total_measurements = sum(len(r['measurements']) for r in backup_results.values())
-
-        elapsed = time.time() - start_time
-        logger.info(
-            f"Phase 2 complete in {elapsed:.2f}s: "
-            f"{total_measurements} measurements, {total_points} points backed up"
+        backup_results, restore_results = (
+            self.backup_manager.backup_and_restore_all_databases(
+                self.database_names,
+                resume=self.cfg.resume_backup
+            )
         )
 
-        return backup_results
-
-    def _phase3_restore(
-        self,
-        backup_results: Dict[str, Dict[str, Any]]
-    ) -> Dict[str, Dict[str, Any]]:
-        """Restore all databases"""
-        start_time = time.time()
-
-        restore_results = self.backup_manager.restore_all_databases(backup_results)
-
         # Log summary
-        total_points = sum(r['total_points'] for r in restore_results.values())
-        total_measurements = sum(len(r['measurements']) for r in restore_results.values())
+        backup_points = sum(r['total_points'] for r in backup_results.values())
+        backup_measurements = sum(len(r['measurements']) for r in backup_results.values())
+        restore_points = sum(r['total_points'] for r in restore_results.values())
+        restore_measurements = sum(len(r['measurements']) for r in restore_results.values())
 
         elapsed = time.time() - start_time
         logger.info(
-            f"Phase 3 complete in {elapsed:.2f}s: "
-            f"{total_measurements} measurements, {total_points} points restored"
+            f"Phases 2-3 complete in {elapsed:.2f}s: "
+            f"{backup_measurements} measurements, {backup_points} points backed up; "
+            f"{restore_measurements} measurements, {restore_points} points restored"
         )
 
-        return restore_results
+        return backup_results, restore_results
 
     def _phase4_validate(self) -> List:
         """Validate data integrity"""
         start_time = time.time()
 
-        databases = [schema.name for schema in self.generator.schemas]
-        comparisons = self.validator.compare_databases(databases, detailed=False)
+        comparisons = self.validator.compare_databases(
+            self.database_names, detailed=False
+        )
 
         elapsed = time.time() - start_time
         logger.info(f"Phase 4 complete in {elapsed:.2f}s")
@@ -236,31 +311,40 @@ class BackupTestOrchestrator:
 
     def _phase5_continuous_generation(self):
         """Generate data continuously every N seconds"""
-        duration = self.config['test']['test_duration']
-        interval = self.config['test']['generation_interval']
+        duration = self.cfg.test_duration
+        interval = self.cfg.generation_interval
 
         logger.info(
             f"Generating data every {interval}s for {duration}s "
             "(writing to source only)"
         )
 
-        end_time = time.time() + duration
+        # Monotonic clock, so wall-clock adjustments can't stretch or cut
+        # the run short
+        deadline = time.perf_counter() + duration
         iteration = 0
 
-        while time.time() < end_time:
+        while time.perf_counter() < deadline:
             iteration += 1
-            logger.info(f"Continuous generation iteration {iteration}")
-
+            logger.info("Continuous generation iteration %d", iteration)
+
+            # Collect the iteration's points per database and write each
+            # database's points in one batched call. Every point of an
+            # iteration shares one timestamp; each measurement gets a
+            # single point per iteration, so none overwrite each other
+            now = datetime.utcnow()
+            points_by_db: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
             for db_schema in self.generator.schemas:
                 for measurement in db_schema.measurements:
-                    point = self.generator.generate_point(
-                        measurement,
-                        datetime.utcnow()
-                    )
-                    self.source_op.write_points(
-                        [point],
-                        database=db_schema.name
-                    )
+                    point = self.generator.generate_point(measurement, now)
+                    points_by_db[db_schema.name].append(point)
+
+            for db_name, points in points_by_db.items():
+                self.source_op.write_points(
+                    points,
+                    database=db_name,
+                    batch_size=5000
+                )
 
             time.sleep(interval)
 
@@ -1,164 +1,235 @@
 import json
 import logging
-from typing import List, Dict, Any
+import sys
+from typing import Any, Dict, Iterator, List
 from datetime import datetime
 
+import numpy as np
+
 from .validator import DatabaseComparison
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+def _encode(obj: Any, level: int = 0) -> bytes:
+    """Indented JSON for a value nested `level` levels deep in the report"""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode()
+    if level:
+        data = data.replace(b'\n', b'\n' + b'  ' * level)
+    return data
+
+
+def _encode_member(key: str, value: Any) -> bytes:
+    """A top-level `"key": value` member of the report object"""
+    return b'  ' + _encode(key) + b': ' + _encode(value, 1)
+
+
 class StatisticsReporter:
     """Generates comprehensive comparison reports"""
 
     def __init__(self, comparisons: List[DatabaseComparison]):
         self.comparisons = comparisons
 
-    def generate_report(self) -> Dict[str, Any]:
-        """Generate comprehensive statistics report"""
-        return {
-            'timestamp': datetime.now().isoformat(),
-            'summary': self._generate_summary(),
-            'databases': self._generate_database_stats(),
-            'measurements': self._generate_measurement_stats(),
-            'integrity': self._generate_integrity_stats()
-        }
-
-    def _generate_summary(self) -> Dict[str, Any]:
-        """Generate high-level summary"""
-        total_measurements = sum(
-            len(db.measurement_comparisons) for db in self.comparisons
+        # Flat per-measurement views over every database, in report order
+        self._measurements = [
+            m for db in comparisons for m in db.measurement_comparisons
+        ]
+        sizes = np.fromiter(
+            (len(db.measurement_comparisons) for db in comparisons),
+            dtype=np.int64, count=len(comparisons)
         )
-        matching_measurements = sum(
-            sum(1 for m in db.measurement_comparisons if m.match)
-            for db in self.comparisons
+        self._db_index = np.repeat(np.arange(len(comparisons)), sizes)
+        self._match_mask = np.fromiter(
+            (m.match for m in self._measurements),
+            dtype=bool, count=len(self._measurements)
         )
 
-        total_source_points = sum(
-            db.summary['total_source_points'] for db in self.comparisons
-        )
-        total_dest_points = sum(
-            db.summary['total_dest_points'] for db in self.comparisons
-        )
+    def generate_report(self, include_measurements: bool = True) -> Dict[str, Any]:
+        """
+        Generate comprehensive statistics report; without
+        include_measurements the per-measurement list is left empty
+        """
+        stats = self._compute_all_stats(include_measurements)
+        total_measurements = stats['total_measurements']
+        matching_measurements = stats['matching_measurements']
+        total_source_points = stats['total_source_points']
+        total_dest_points = stats['total_dest_points']
+        failed_measurements = stats['failed_measurements']
 
         return {
-            'total_databases': len(self.comparisons),
-            'total_measurements': total_measurements,
-            'matching_measurements': matching_measurements,
-            'match_percentage': (
-                matching_measurements / total_measurements * 100
-                if total_measurements > 0 else 0
-            ),
-            'total_points_source': total_source_points,
-            'total_points_dest': total_dest_points,
-            'total_difference': abs(total_source_points - total_dest_points)
+            'timestamp': datetime.now().isoformat(),
+            'summary': {
+                'total_databases': len(self.comparisons),
+                'total_measurements': total_measurements,
+                'matching_measurements': matching_measurements,
+                'match_percentage': (
+                    matching_measurements / total_measurements * 100
+                    if total_measurements > 0 else 0
+                ),
+                'total_points_source': total_source_points,
+                'total_points_dest': total_dest_points,
+                'total_difference': abs(total_source_points - total_dest_points)
+            },
+            'databases': stats['per_db_stats'],
+            'measurements': stats['per_measurement_stats'],
+            'integrity': {
+                'passed': len(failed_measurements) == 0,
+                'failed_measurements': failed_measurements,
+                'failure_count': len(failed_measurements)
+            }
         }
 
-    def _generate_database_stats(self) -> List[Dict[str, Any]]:
-        """Generate per-database statistics"""
-        stats = []
-        for db_comp in self.comparisons:
-            stats.append({
+    def _compute_all_stats(self, include_measurements: bool = True) -> Dict[str, Any]:
+        """
+        Compute the summary totals and the per-database, per-measurement
+        and failed measurement lists that the report sections are built
+        from. Totals add up the per-database summaries computed during
+        validation, one term per database.
+        """
+        summaries = [db.summary for db in self.comparisons]
+
+        per_db_stats = [
+            {
                 'name': db_comp.database,
-                'measurement_count': len(db_comp.measurement_comparisons),
-                'total_points': db_comp.summary['total_source_points'],
-                'integrity_pass': all(
-                    m.match for m in db_comp.measurement_comparisons
-                ),
-                'match_percentage': db_comp.summary['match_percentage']
-            })
-        return stats
-
-    def _generate_measurement_stats(self) -> List[Dict[str, Any]]:
-        """Generate per-measurement statistics"""
-        stats = []
-        for db_comp in self.comparisons:
-            for m_comp in db_comp.measurement_comparisons:
-                stats.append({
-                    'database': db_comp.database,
-                    'measurement': m_comp.measurement,
-                    'source_count': m_comp.source_count,
-                    'dest_count': m_comp.dest_count,
-                    'match': m_comp.match,
-                    'difference': m_comp.difference,
-                    'diff_percentage': m_comp.difference_percentage
-                })
-        return stats
-
-    def _generate_integrity_stats(self) -> Dict[str, Any]:
-        """Generate integrity check results"""
-        failed_measurements = []
-        for db_comp in self.comparisons:
-            for m_comp in db_comp.measurement_comparisons:
-                if not m_comp.match:
-                    failed_measurements.append({
-                        'database': db_comp.database,
-                        'measurement': m_comp.measurement,
-                        'difference': m_comp.difference
-                    })
+                'measurement_count': summary['total_measurements'],
+                'total_points': summary['total_source_points'],
+                'integrity_pass': summary['integrity_pass'],
+                'match_percentage': db_comp.match_percentage
+            }
+            for db_comp, summary in zip(self.comparisons, summaries)
+        ]
+
+        names = [db.database for db in self.comparisons]
+        per_measurement_stats = (
+            list(self._iter_measurement_stats()) if include_measurements else []
+        )
+
+        failed_measurements = [
+            {
+                'database': names[self._db_index[i]],
+                'measurement': self._measurements[i].measurement,
+                'difference': self._measurements[i].difference
+            }
+            for i in np.flatnonzero(~self._match_mask).tolist()
+        ]
 
         return {
-            'passed': len(failed_measurements) == 0,
-            'failed_measurements': failed_measurements,
-            'failure_count': len(failed_measurements)
+            'total_measurements': sum(s['total_measurements'] for s in summaries),
+            'matching_measurements': sum(s['matching_measurements'] for s in summaries),
+            'total_source_points': sum(s['total_source_points'] for s in summaries),
+            'total_dest_points': sum(s['total_dest_points'] for s in summaries),
+            'per_db_stats': per_db_stats,
+            'per_measurement_stats': per_measurement_stats,
+            'failed_measurements': failed_measurements
         }
 
+    def _iter_measurement_stats(self) -> Iterator[Dict[str, Any]]:
+        """Yield the per-measurement report entries one at a time"""
+        names = [db.database for db in self.comparisons]
+        for db_i, m_comp in zip(self._db_index.tolist(), self._measurements):
+            yield {
+                'database': names[db_i],
+                'measurement': m_comp.measurement,
+                'source_count': m_comp.source_count,
+                'dest_count': m_comp.dest_count,
+                'match': m_comp.match,
+                'difference': m_comp.difference,
+                'diff_percentage': m_comp.difference_percentage
+            }
+
     def print_report(self):
-        """Print formatted report to console"""
+        """Print formatted report to console, in a single write"""
         report = self.generate_report()
+        separator = "=" * 80
+        out = []
+        add = out.append
 
-        print("\n" + "=" * 80)
-        print("INFLUXDB BACKUP/RESTORE TEST REPORT")
-        print("=" * 80)
-        print(f"Timestamp: {report['timestamp']}")
+        add("")
+        add(separator)
+        add("INFLUXDB BACKUP/RESTORE TEST REPORT")
+        add(separator)
+        add(f"Timestamp: {report['timestamp']}")
 
         # Summary section
         summary = report['summary']
-        print("\nSUMMARY:")
-        print(f"  Total Databases:       {summary['total_databases']}")
-        print(f"  Total Measurements:    {summary['total_measurements']}")
-        print(f"  Matching Measurements: {summary['matching_measurements']}")
-        print(f"  Match Percentage:      {summary['match_percentage']:.2f}%")
-        print(f"  Total Points (Source): {summary['total_points_source']:,}")
-        print(f"  Total Points (Dest):   {summary['total_points_dest']:,}")
-        print(f"  Total Difference:      {summary['total_difference']:,}")
+        add("")
+        add("SUMMARY:")
+        add(f"  Total Databases:       {summary['total_databases']}")
+        add(f"  Total Measurements:    {summary['total_measurements']}")
+        add(f"  Matching Measurements: {summary['matching_measurements']}")
+        add(f"  Match Percentage:      {summary['match_percentage']:.2f}%")
+        add(f"  Total Points (Source): {summary['total_points_source']:,}")
+        add(f"  Total Points (Dest):   {summary['total_points_dest']:,}")
+        add(f"  Total Difference:      {summary['total_difference']:,}")
 
         # Per-database stats
-        print("\nDATABASE STATISTICS:")
+        add("")
+        add("DATABASE STATISTICS:")
         for db_stats in report['databases']:
             status = "PASS" if db_stats['integrity_pass'] else "FAIL"
-            print(f"\n  {db_stats['name']}:")
-            print(f"    Measurements:   {db_stats['measurement_count']}")
-            print(f"    Total Points:   {db_stats['total_points']:,}")
-            print(f"    Match Rate:     {db_stats['match_percentage']:.2f}%")
-            print(f"    Integrity:      {status}")
+            add("")
+            add(f"  {db_stats['name']}:")
+            add(f"    Measurements:   {db_stats['measurement_count']}")
+            add(f"    Total Points:   {db_stats['total_points']:,}")
+            add(f"    Match Rate:     {db_stats['match_percentage']:.2f}%")
+            add(f"    Integrity:      {status}")
 
         # Measurement details
-        print("\nMEASUREMENT COMPARISON:")
+        add("")
+        add("MEASUREMENT COMPARISON:")
         for m in report['measurements']:
             status = "OK" if m['match'] else "XX"
-            print(
+            add(
                 f"  [{status}] {m['database']}.{m['measurement']}: "
                 f"Source={m['source_count']:,} | Dest={m['dest_count']:,}"
             )
             if not m['match']:
-                print(f"       Difference: {m['difference']:,} ({m['diff_percentage']:.2f}%)")
+                add(f"       Difference: {m['difference']:,} ({m['diff_percentage']:.2f}%)")
 
         # Integrity summary
         integrity = report['integrity']
-        print("\nINTEGRITY CHECK:")
+        add("")
+        add("INTEGRITY CHECK:")
         if integrity['passed']:
-            print("  Status: PASSED - All measurements match within tolerance")
+            add("  Status: PASSED - All measurements match within tolerance")
         else:
-            print(f"  Status: FAILED - {integrity['failure_count']} measurement(s) mismatch")
+            add(f"  Status: FAILED - {integrity['failure_count']} measurement(s) mismatch")
             for failed in integrity['failed_measurements']:
-                print(f"    - {failed['database']}.{failed['measurement']}: {failed['difference']} point difference")
+                add(f"    - {failed['database']}.{failed['measurement']}: {failed['difference']} point difference")
 
-        print("\n" + "=" * 80 + "\n")
+        add("")
+        add(separator)
+        add("")
+
+        sys.stdout.write("\n".join(out) + "\n")
 
     def save_report(self, filename: str):
-        """Save report to JSON file"""
-        report = self.generate_report()
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        """
+        Save report to JSON file. Measurement entries are encoded and
+        written one at a time, so the full list is never held in memory;
+        the layout matches a single indented dump of generate_report()
+        """
+        report = self.generate_report(include_measurements=False)
+        with open(filename, 'wb') as f:
+            f.write(b'{\n')
+            for key in ('timestamp', 'summary', 'databases'):
+                f.write(_encode_member(key, report[key]) + b',\n')
+
+            f.write(b'  "measurements": [')
+            empty = True
+            for entry in self._iter_measurement_stats():
+                f.write((b'\n    ' if empty else b',\n    ') + _encode(entry, 2))
+                empty = False
+            f.write(b'],\n' if empty else b'\n  ],\n')
+
+            f.write(_encode_member('integrity', report['integrity']) + b'\n}')
         logger.info(f"Report saved to: {filename}")
@@ -1,13 +1,18 @@
+import functools
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import numpy as np
 
 from ctrutils.database.influxdb import InfluxdbOperation
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class MeasurementComparison:
     """Comparison results for a single measurement"""
     measurement: str
@@ -18,7 +23,7 @@ class MeasurementComparison:
     difference_percentage: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseComparison:
     """Comparison results for a database"""
     database: str
@@ -27,6 +32,8 @@ class DatabaseComparison:
     measurements_match: bool
     measurement_comparisons: List[MeasurementComparison]
     summary: Dict[str, Any]
+    # summary['match_percentage'], kept as an attribute for direct access
+    match_percentage: float = 0.0
 
 
 class DataValidator:
@@ -36,24 +43,91 @@ class DataValidator:
         self,
         source_op: InfluxdbOperation,
         dest_op: InfluxdbOperation,
-        tolerance: float = 0.01
+        tolerance: float = 0.01,
+        max_workers: int = 8,
+        source_factory: Optional[Callable[[], InfluxdbOperation]] = None,
+        dest_factory: Optional[Callable[[], InfluxdbOperation]] = None
     ):
+        """
+        Args:
+            source_op: Source InfluxDB operation
+            dest_op: Destination InfluxDB operation
+            tolerance: Percentage tolerance for point count comparisons
+            max_workers: Concurrent databases, and concurrent measurements
+                within a database
+            source_factory: Builds a fresh source operation; with
+                dest_factory, lets databases be compared in parallel, each
+                on its own clients (InfluxdbOperation keeps the current
+                database as client state)
+            dest_factory: Builds a fresh destination operation
+        """
         self.source = source_op
         self.dest = dest_op
         self.tolerance = tolerance  # Percentage tolerance for comparisons
+        self.max_workers = max(1, max_workers)
+        self._source_factory = source_factory
+        self._dest_factory = dest_factory
+        self._db_ops: Dict[str, Tuple[InfluxdbOperation, InfluxdbOperation]] = {}
+        self._db_ops_lock = threading.Lock()
+        # Measurement lists per (operation, database); they don't change
+        # between comparisons of the same run, so each is fetched once
+        self._list_measurements = functools.lru_cache(maxsize=256)(
+            self._fetch_measurements
+        )
+        # Runs the source side of per-measurement counts while the calling
+        # thread counts the destination; created on first use
+        self._count_pool: Optional[ThreadPoolExecutor] = None
         logger.info(f"DataValidator initialized with tolerance: {tolerance}%")
 
+    def __enter__(self) -> 'DataValidator':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the per-database clients built by the factories and the count
+        pool. The source/dest operations passed in belong to the caller and
+        are left open
+        """
+        with self._db_ops_lock:
+            db_ops = list(self._db_ops.values())
+            self._db_ops.clear()
+            count_pool, self._count_pool = self._count_pool, None
+        if count_pool is not None:
+            count_pool.shutdown()
+        self.clear_cache()
+        for source, dest in db_ops:
+            source.close_client()
+            dest.close_client()
+
+    def clear_cache(self) -> None:
+        """Forget the cached measurement lists, e.g. once new data is being written"""
+        self._list_measurements.cache_clear()
+
     def compare_databases(
         self,
         databases: List[str],
         detailed: bool = False
     ) -> List[DatabaseComparison]:
-        """Compare multiple databases"""
-        results = []
-        for database in databases:
-            comparison = self.compare_database(database, detailed=detailed)
-            results.append(comparison)
-        return results
+        """Compare multiple databases, in parallel when factories are set"""
+        workers = 1
+        if self._source_factory is not None and self._dest_factory is not None:
+            workers = min(len(databases), self.max_workers)
+        if workers <= 1:
+            return [
+                self.compare_database(database, detailed=detailed)
+                for database in databases
+            ]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.compare_database, database, detailed)
+                for database in databases
+            ]
+            # Submission order, so results line up with `databases`
+            return [future.result() for future in futures]
 
     def compare_database(
         self,
@@ -61,37 +135,57 @@ class DataValidator:
         detailed: bool = False
     ) -> DatabaseComparison:
         """Compare single database structure and data"""
-        logger.info(f"Comparing database: {database}")
+        logger.info("Comparing database: %s", database)
 
-        source_measurements = self.source.list_measurements(database)
-        dest_measurements = self.dest.list_measurements(database)
+        source, dest = self._ops_for(database)
+        source_measurements = self._list_measurements(source, database)
+        dest_measurements = self._list_measurements(dest, database)
 
-        measurements_match = set(source_measurements) == set(dest_measurements)
+        dest_set = set(dest_measurements)
+        measurements_match = set(source_measurements) == dest_set
 
         if not measurements_match:
             logger.warning(
-                f"Measurement lists don't match for {database}: "
-                f"source={len(source_measurements)}, dest={len(dest_measurements)}"
+                "Measurement lists don't match for %s: source=%d, dest=%d",
+                database, len(source_measurements), len(dest_measurements)
             )
 
-        measurement_comparisons = []
+        common = []
         for measurement in source_measurements:
-            if measurement in dest_measurements:
-                comp = self.compare_measurement(
-                    database,
-                    measurement,
-                    detailed=detailed
-                )
-                measurement_comparisons.append(comp)
+            if measurement in dest_set:
+                common.append(measurement)
             else:
-                logger.warning(f"Measurement {measurement} missing from destination")
+                logger.warning("Measurement %s missing from destination", measurement)
 
-        summary = self._create_summary(measurement_comparisons)
+        # One COUNT query per side covers every measurement; if either
+        # fails, fall back to counting measurement by measurement
+        source_counts = self._count_all_measurements(source, database)
+        dest_counts = self._count_all_measurements(dest, database)
+        workers = min(len(common), self.max_workers)
+        if source_counts is not None and dest_counts is not None:
+            measurement_comparisons = self._compare_counts(
+                common, source_counts, dest_counts
+            )
+        elif workers <= 1:
+            measurement_comparisons = [
+                self.compare_measurement(database, measurement, detailed=detailed)
+                for measurement in common
+            ]
+        else:
+            # Every count for one database goes through the same clients,
+            # which all point at this database
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self.compare_measurement, database, measurement, detailed)
+                    for measurement in common
+                ]
+                measurement_comparisons = [future.result() for future in futures]
+
+        summary = self._create_summary(measurement_comparisons, measurements_match)
 
         logger.info(
-            f"Database {database} comparison complete: "
-            f"{summary['total_measurements']} measurements, "
-            f"{summary['matching_measurements']} matches"
+            "Database %s comparison complete: %d measurements, %d matches",
+            database, summary['total_measurements'], summary['matching_measurements']
         )
 
         return DatabaseComparison(
@@ -100,21 +194,36 @@ class DataValidator:
             dest_measurements=dest_measurements,
             measurements_match=measurements_match,
             measurement_comparisons=measurement_comparisons,
-            summary=summary
+            summary=summary,
+            match_percentage=summary['match_percentage']
         )
 
     def compare_measurement(
         self,
         database: str,
         measurement: str,
-        detailed: bool = False
+        detailed: bool = False,
+        counts: Optional[Tuple[Dict[str, int], Dict[str, int]]] = None
     ) -> MeasurementComparison:
-        """Compare single measurement point counts"""
-        logger.debug(f"Comparing measurement: {database}.{measurement}")
+        """
+        Compare single measurement point counts, looked up in the
+        (source, dest) per-database `counts` when given
+        """
+        logger.debug("Comparing measurement: %s.%s", database, measurement)
 
         # Count points
-        source_count = self.source.count_points(measurement, database)
-        dest_count = self.dest.count_points(measurement, database)
+        if counts is not None:
+            source_count = counts[0].get(measurement, 0)
+            dest_count = counts[1].get(measurement, 0)
+        else:
+            # Source and destination are separate servers: overlap the
+            # two round trips
+            source, dest = self._ops_for(database)
+            source_future = self._get_count_pool().submit(
+                source.count_points, measurement, database
+            )
+            dest_count = dest.count_points(measurement, database)
+            source_count = source_future.result()
 
         difference = abs(source_count - dest_count)
         diff_pct = (difference / source_count * 100) if source_count > 0 else 0
@@ -122,8 +231,8 @@ class DataValidator:
 
         if not match:
             logger.warning(
-                f"Measurement {measurement} mismatch: "
-                f"source={source_count}, dest={dest_count}, diff={difference}"
+                "Measurement %s mismatch: source=%d, dest=%d, diff=%d",
+                measurement, source_count, dest_count, difference
             )
 
         return MeasurementComparison(
@@ -135,21 +244,111 @@ class DataValidator:
             difference_percentage=diff_pct
         )
 
+    def _compare_counts(
+        self,
+        measurements: List[str],
+        source_counts: Dict[str, int],
+        dest_counts: Dict[str, int]
+    ) -> List[MeasurementComparison]:
+        """
+        Compare the point counts of many measurements at once; same results
+        as compare_measurement() with `counts`, computed over arrays
+        """
+        n = len(measurements)
+        src = np.fromiter(
+            (source_counts.get(m, 0) for m in measurements), dtype=np.int64, count=n
+        )
+        dst = np.fromiter(
+            (dest_counts.get(m, 0) for m in measurements), dtype=np.int64, count=n
+        )
+        diff = np.abs(src - dst)
+        diff_pct = np.divide(diff, src, out=np.zeros(n), where=src > 0) * 100
+        match = diff <= src * self.tolerance / 100
+
+        for i in np.flatnonzero(~match).tolist():
+            logger.warning(
+                "Measurement %s mismatch: source=%d, dest=%d, diff=%d",
+                measurements[i], src[i], dst[i], diff[i]
+            )
+
+        return [
+            MeasurementComparison(
+                measurement=measurement,
+                source_count=source_count,
+                dest_count=dest_count,
+                match=is_match,
+                difference=difference,
+                difference_percentage=pct
+            )
+            for measurement, source_count, dest_count, is_match, difference, pct in zip(
+                measurements, src.tolist(), dst.tolist(), match.tolist(),
+                diff.tolist(), diff_pct.tolist()
+            )
+        ]
+
+    def _count_all_measurements(
+        self,
+        op: InfluxdbOperation,
+        database: str
+    ) -> Optional[Dict[str, int]]:
+        """
+        Points per measurement of a database in a single COUNT query, or
+        None if the query fails
+        """
+        try:
+            return op.count_points_by_measurement(database)
+        except Exception as e:
+            logger.warning("Could not count points in %s in one query: %s", database, e)
+            return None
+
+    @staticmethod
+    def _fetch_measurements(op: InfluxdbOperation, database: str) -> List[str]:
+        return op.list_measurements(database)
+
+    def _get_count_pool(self) -> ThreadPoolExecutor:
+        with self._db_ops_lock:
+            if self._count_pool is None:
+                self._count_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='validator-count'
+                )
+            return self._count_pool
+
+    def _ops_for(self, database: str) -> Tuple[InfluxdbOperation, InfluxdbOperation]:
+        """Return the (source, dest) operations dedicated to a database"""
+        if self._source_factory is None or self._dest_factory is None:
+            return self.source, self.dest
+        with self._db_ops_lock:
+            if database not in self._db_ops:
+                self._db_ops[database] = (self._source_factory(), self._dest_factory())
+            return self._db_ops[database]
+
     def _create_summary(
         self,
-        comparisons: List[MeasurementComparison]
+        comparisons: List[MeasurementComparison],
+        measurements_match: bool = True
     ) -> Dict[str, Any]:
-        """Create summary statistics from measurement comparisons"""
-        total = len(comparisons)
-        matching = sum(1 for c in comparisons if c.match)
+        """
+        Create summary statistics from measurement comparisons
 
-        total_source_points = sum(c.source_count for c in comparisons)
-        total_dest_points = sum(c.dest_count for c in comparisons)
+        integrity_pass needs at least one compared measurement: a destination
+        sharing no measurements with the source must not pass
+        """
+        total = len(comparisons)
+        matching = 0
+        total_source_points = 0
+        total_dest_points = 0
+        for c in comparisons:
+            if c.match:
+                matching += 1
+            total_source_points += c.source_count
+            total_dest_points += c.dest_count
 
         return {
             'total_measurements': total,
             'matching_measurements': matching,
             'match_percentage': (matching / total * 100) if total > 0 else 0,
+            'integrity_pass': total > 0 and matching == total and measurements_match,
             'total_source_points': total_source_points,
             'total_dest_points': total_dest_points,
             'total_difference': abs(total_source_points - total_dest_points)
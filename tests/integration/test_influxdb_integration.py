@@ -14,17 +14,25 @@ Para ejecutar solo tests de integracion:
 Para saltar tests de integracion:
     pytest tests/unit/ -v
 """
+import csv
 import unittest
 import os
+import time
+import warnings
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
 
 from ctrutils.database.influxdb import InfluxdbOperation
+from ctrutils.database.influxdb.InfluxdbOperation import POOL_CONNECTIONS, POOL_MAXSIZE
 from tests.fixtures import (
+    SEED_WRITES,
     get_test_config,
+    clear_database,
     create_sample_dataframe,
     create_time_series_with_gaps,
+    write_seed_dataframe,
 )
 
 
@@ -43,32 +51,41 @@ class TestInfluxdbOperationIntegration(unittest.TestCase):
         cls.config = get_test_config()
         cls.test_database = cls.config['database']
         cls.test_measurement = 'test_measurement'
-
-    def setUp(self):
-        """Setup para cada test."""
+        # Datos de solo lectura compartidos por toda la clase
+        cls.seed_measurement = 'seed_measurement'
         try:
-            self.op = InfluxdbOperation(
-                host=self.config['host'],
-                port=self.config['port'],
-                username=self.config['username'],
-                password=self.config['password'],
+            # Un unico cliente (y su pool de conexiones) para toda la clase
+            cls.op = InfluxdbOperation(
+                host=cls.config['host'],
+                port=cls.config['port'],
+                username=cls.config['username'],
+                password=cls.config['password'],
             )
+            # Sesion HTTP creada junto al cliente; ningun test debe sustituirla
+            cls._session_id = id(cls.op._client._session)
 
             # Crear base de datos de test
-            self.op.create_database(self.test_database)
-            self.op.switch_database(self.test_database)
-
+            cls.op.create_database(cls.test_database)
+            cls._seed_measurement()
         except Exception as e:
-            self.skipTest(f"No se pudo conectar a InfluxDB: {e}")
+            raise unittest.SkipTest(f"No se pudo conectar a InfluxDB: {e}")
+
+    @classmethod
+    def _seed_measurement(cls):
+        """Escribe una sola vez los datos de referencia de los tests de lectura."""
+        cls._seed_key = (cls.test_database, cls.seed_measurement)
+        cls.seed_df = write_seed_dataframe(cls.op, cls.seed_measurement, cls.test_database)
+
+    def setUp(self):
+        """Setup para cada test."""
+        self.op.switch_database(self.test_database)
+        # Measurements escritos por el test; el measurement semilla nunca se borra
+        self._created_measurements = {self.test_measurement}
 
     def tearDown(self):
-        """Limpieza despues de cada test."""
+        """Limpieza despues de cada test: se borran de una vez las series que creo."""
         try:
-            # Limpiar datos de test
-            if hasattr(self, 'op') and self.op:
-                measurements = self.op.get_measurements()
-                for measurement in measurements:
-                    self.op.delete(measurement)
+            clear_database(self.op, self.test_database, self._created_measurements)
         except:
             pass
 
@@ -76,17 +93,34 @@ class TestInfluxdbOperationIntegration(unittest.TestCase):
     def tearDownClass(cls):
         """Limpieza final."""
         try:
-            config = get_test_config()
-            op = InfluxdbOperation(
-                host=config['host'],
-                port=config['port'],
-                username=config['username'],
-                password=config['password'],
-            )
-            op.drop_database(cls.test_database)
+            cls.op.drop_database(cls.test_database, confirm=True)
+            cls.op.close_client()
         except:
             pass
 
+    def test_seed_written_once(self):
+        """Test que los datos semilla se escriben una sola vez por clase."""
+        self.assertEqual(SEED_WRITES[self._seed_key], 1)
+        df = self.op.query_to_dataframe(measurement=self.seed_measurement)
+        self.assertEqual(len(df), len(self.seed_df))
+
+    def test_client_session_reused(self):
+        """Test que el cliente conserva la sesion HTTP creada en setUpClass."""
+        self.assertEqual(id(self.op._client._session), self._session_id)
+
+    def test_client_session_reused_across_tests(self):
+        """Test que otro test sigue viendo la misma sesion HTTP."""
+        self.assertEqual(id(self.op._client._session), self._session_id)
+
+    def test_client_session_pooled_adapter(self):
+        """Test que la sesion usa el adaptador con pool y reintentos configurados."""
+        adapter = self.op._client._session.get_adapter('http://')
+        self.assertIsInstance(adapter, HTTPAdapter)
+        self.assertEqual(adapter._pool_connections, POOL_CONNECTIONS)
+        self.assertEqual(adapter._pool_maxsize, POOL_MAXSIZE)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.1)
+
     def test_write_and_read_points(self):
         """Test escribir y leer puntos."""
         points = [
@@ -171,18 +205,15 @@ class TestInfluxdbOperationIntegration(unittest.TestCase):
         self.op.drop_retention_policy(rp_name, self.test_database)
 
     def test_continuous_query(self):
-        """Test crear y listar continuous queries."""
-        # Primero escribir algunos datos
-        df = create_sample_dataframe(rows=100)
-        self.op.write_dataframe(df, measurement=self.test_measurement)
-
+        """Test crear y listar continuous queries sobre los datos semilla."""
         cq_name = 'test_cq'
         target_measurement = 'downsampled_data'
+        self._created_measurements.add(target_measurement)
 
         # Crear CQ
         self.op.create_continuous_query(
             cq_name=cq_name,
-            measurement=self.test_measurement,
+            measurement=self.seed_measurement,
             target_measurement=target_measurement,
             aggregation_window='10m',
             aggregation_func='MEAN',
@@ -198,51 +229,49 @@ class TestInfluxdbOperationIntegration(unittest.TestCase):
         self.op.drop_continuous_query(cq_name, self.test_database)
 
     def test_backup_and_restore(self):
-        """Test backup y restore de measurement."""
+        """Test backup y restore de measurement en line protocol y CSV."""
         import tempfile
 
         # Escribir datos originales
         df_original = create_sample_dataframe(rows=50)
         self.op.write_dataframe(df_original, measurement=self.test_measurement)
 
-        # Backup
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            backup_file = f.name
-
-        try:
-            points_exported = self.op.backup_measurement(
-                measurement=self.test_measurement,
-                output_file=backup_file
-            )
-            self.assertGreater(points_exported, 0)
-
-            # Eliminar datos originales
-            self.op.delete(self.test_measurement)
-
-            # Restore
-            stats = self.op.restore_measurement(
-                measurement=self.test_measurement,
-                input_file=backup_file
-            )
-            self.assertGreater(stats['successful'], 0)
-
-            # Verificar
-            df_restored = self.op.query_to_dataframe(measurement=self.test_measurement)
-            self.assertFalse(df_restored.empty)
-
-        finally:
-            if os.path.exists(backup_file):
-                os.remove(backup_file)
+        for backup_format in ('csv', 'lp'):
+            with self.subTest(backup_format=backup_format):
+                with tempfile.NamedTemporaryFile(suffix=f'.{backup_format}', delete=False) as f:
+                    backup_file = f.name
+
+                try:
+                    points_exported = self.op.backup_measurement(
+                        measurement=self.test_measurement,
+                        output_file=backup_file,
+                        backup_format=backup_format
+                    )
+                    self.assertGreater(points_exported, 0)
+
+                    # Eliminar datos originales
+                    self.op.delete(self.test_measurement)
+
+                    # Restore
+                    stats = self.op.restore_measurement(
+                        measurement=self.test_measurement,
+                        input_file=backup_file,
+                        backup_format=backup_format
+                    )
+                    self.assertEqual(stats['written_points'], points_exported)
+
+                    # Verificar
+                    df_restored = self.op.query_to_dataframe(measurement=self.test_measurement)
+                    self.assertEqual(len(df_restored), points_exported)
+
+                finally:
+                    if os.path.exists(backup_file):
+                        os.remove(backup_file)
 
     def test_data_quality_metrics(self):
-        """Test calcular metricas de calidad de datos."""
-        # Crear datos con caracteristicas conocidas
-        df = create_sample_dataframe(rows=100, with_nans=True)
-        self.op.write_dataframe(df, measurement=self.test_measurement)
-
-        # Calcular metricas
+        """Test calcular metricas de calidad de los datos semilla (con NaNs)."""
         metrics = self.op.calculate_data_quality_metrics(
-            measurement=self.test_measurement
+            measurement=self.seed_measurement
         )
 
         self.assertIsInstance(metrics, dict)
@@ -255,19 +284,11 @@ class TestInfluxdbOperationIntegration(unittest.TestCase):
             self.assertIn('missing_percentage', field_metrics)
 
     def test_downsampling(self):
-        """Test downsampling de datos."""
-        # Crear datos con alta frecuencia
-        timestamps = pd.date_range(start='2024-01-01', periods=1000, freq='1min')
-        df = pd.DataFrame({
-            'value': np.random.uniform(20, 30, 1000),
-        }, index=timestamps)
-
-        self.op.write_dataframe(df, measurement=self.test_measurement)
-
-        # Downsample
+        """Test downsampling de los datos semilla (1000 puntos, uno por minuto)."""
         target_measurement = 'downsampled_test'
+        self._created_measurements.add(target_measurement)
         points_created = self.op.downsample_data(
-            measurement=self.test_measurement,
+            measurement=self.seed_measurement,
             target_measurement=target_measurement,
             aggregation_window='1h',
             aggregation_func='MEAN',
@@ -307,33 +328,42 @@ class TestInfluxdbOperationPerformance(unittest.TestCase):
         """Setup una vez para toda la clase."""
         cls.config = get_test_config()
         cls.test_database = cls.config['database'] + '_perf'
+        try:
+            cls.op = InfluxdbOperation(
+                host=cls.config['host'],
+                port=cls.config['port'],
+                username=cls.config['username'],
+                password=cls.config['password'],
+                compress_requests=True,
+            )
+            cls.op.create_database(cls.test_database)
+            cls.op.enable_logging()
+        except Exception as e:
+            raise unittest.SkipTest(f"No se pudo conectar a InfluxDB: {e}")
 
     def setUp(self):
         """Setup para cada test."""
+        self.op.switch_database(self.test_database)
+
+    def tearDown(self):
+        """Limpieza: se recrea la base de datos (dos consultas, sin importar cuantas measurements haya)."""
         try:
-            self.op = InfluxdbOperation(
-                host=self.config['host'],
-                port=self.config['port'],
-                username=self.config['username'],
-                password=self.config['password'],
-            )
+            self.op.drop_database(self.test_database, confirm=True)
             self.op.create_database(self.test_database)
-            self.op.switch_database(self.test_database)
-            self.op.enable_logging()
-
-        except Exception as e:
-            self.skipTest(f"No se pudo conectar a InfluxDB: {e}")
+        except:
+            pass
 
-    def tearDown(self):
-        """Limpieza."""
+    @classmethod
+    def tearDownClass(cls):
+        """Limpieza final."""
         try:
-            if hasattr(self, 'op') and self.op:
-                self.op.drop_database(self.test_database)
+            cls.op.drop_database(cls.test_database, confirm=True)
+            cls.op.close_client()
         except:
             pass
 
     def test_write_large_dataframe(self):
-        """Test escribir DataFrame grande."""
+        """Test escribir DataFrame grande con distintos tamaños de lote."""
         # Crear DataFrame con 10k filas
         timestamps = pd.date_range(start='2024-01-01', periods=10000, freq='1s')
         df = pd.DataFrame({
@@ -341,20 +371,93 @@ class TestInfluxdbOperationPerformance(unittest.TestCase):
             'memory': np.random.uniform(0, 100, 10000),
         }, index=timestamps)
 
-        # Escribir
-        stats = self.op.write_dataframe(
-            df=df,
-            measurement='performance_test',
-            batch_size=1000
-        )
-
-        self.assertEqual(stats['successful'], 10000)
-        self.assertGreater(stats['points_per_second'], 0)
+        for batch_size in (1000, 5000, 10000):
+            with self.subTest(batch_size=batch_size):
+                # Escribir
+                start = time.perf_counter()
+                stats = self.op.write_dataframe(
+                    df=df,
+                    measurement=f'performance_test_{batch_size}',
+                    batch_size=batch_size
+                )
+                elapsed = time.perf_counter() - start
+
+                self.assertEqual(stats['written_points'], 10000)
+                self.assertEqual(stats['batches'], 10000 // batch_size)
+                print(f"batch_size={batch_size}: {10000 / elapsed:.2f} points/sec")
 
         # Verificar metricas
         metrics = self.op.get_metrics()
         self.assertGreater(metrics['total_points'], 0)
 
+    def test_batch_size_sweep(self):
+        """Test barrido de tamaños de lote para write_points y write_dataframe.
+
+        El rendimiento no crece de forma monotona con el tamaño de lote: con
+        lotes pequeños domina el coste fijo de cada peticion HTTP, y por encima
+        de ~10k lineas el servidor tarda mas en procesar cada cuerpo (y
+        write_dataframe recorta el lote a MAX_BATCH_SIZE, por lo que 25000 se
+        comporta como 10000). El pico esperado esta en 5000-10000 puntos por
+        lote; si se desplaza se emite un aviso, porque suele indicar que ha
+        vuelto a crecer el coste por lote.
+
+        Los resultados se guardan en tests/artifacts/batch_size_sweep.csv.
+        """
+        rows = 50000
+        batch_sizes = (100, 500, 1000, 2500, 5000, 10000, 25000)
+        df = pd.DataFrame({
+            'cpu': np.random.uniform(0, 100, rows),
+            'memory': np.random.uniform(0, 100, rows),
+        }, index=pd.date_range(start='2024-01-01', periods=rows, freq='1s', tz='UTC'))
+        times = df.index.as_unit('ns').asi8.tolist()
+        cpu = df['cpu'].tolist()
+        memory = df['memory'].tolist()
+
+        results = []
+        for method in ('write_points', 'write_dataframe'):
+            for batch_size in batch_sizes:
+                with self.subTest(method=method, batch_size=batch_size):
+                    measurement = f'sweep_{method}_{batch_size}'
+                    if method == 'write_points':
+                        points = [
+                            {'measurement': measurement, 'time': t, 'fields': {'cpu': c, 'memory': m}}
+                            for t, c, m in zip(times, cpu, memory)
+                        ]
+                        start = time.perf_counter()
+                        stats = self.op.write_points(points, batch_size=batch_size)
+                    else:
+                        start = time.perf_counter()
+                        stats = self.op.write_dataframe(df=df, measurement=measurement, batch_size=batch_size)
+                    elapsed = time.perf_counter() - start
+
+                    self.assertEqual(stats['written_points'], rows)
+                    results.append({
+                        'method': method,
+                        'batch_size': batch_size,
+                        'points': rows,
+                        'seconds': elapsed,
+                        'points_per_second': rows / elapsed,
+                    })
+
+        artifacts_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'artifacts')
+        os.makedirs(artifacts_dir, exist_ok=True)
+        with open(os.path.join(artifacts_dir, 'batch_size_sweep.csv'), 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+        for method in ('write_points', 'write_dataframe'):
+            pps = {r['batch_size']: r['points_per_second'] for r in results if r['method'] == method}
+            peak = max(pps, key=pps.get)
+            print(f"{method}: pico de {pps[peak]:.2f} points/sec con batch_size={peak}")
+            # Con lotes de 100 el coste por peticion domina siempre
+            self.assertNotEqual(peak, batch_sizes[0])
+            if peak not in (5000, 10000):
+                warnings.warn(
+                    f"{method}: el pico de rendimiento se ha desplazado a batch_size={peak} "
+                    f"(esperado 5000-10000)"
+                )
+
     def test_write_dataframe_parallel(self):
         """Test escritura paralela."""
         # Crear DataFrame grande
@@ -376,6 +479,61 @@ class TestInfluxdbOperationPerformance(unittest.TestCase):
         self.assertGreater(stats['points_per_second'], 0)
         print(f"Performance: {stats['points_per_second']:.2f} points/sec")
 
+    @unittest.skipUnless(os.getenv('INFLUXDB_TEST_UDP_PORT'), "Requiere un listener UDP (INFLUXDB_TEST_UDP_PORT)")
+    def test_write_via_udp(self):
+        """Test escritura UDP frente a HTTP.
+
+        El listener UDP del servidor debe escribir en la base de datos de performance.
+        """
+        rows = 10000
+        start = pd.Timestamp('2024-01-01', tz='UTC')
+
+        def make_points(measurement):
+            return [{'measurement': measurement, 'time': start + pd.Timedelta(seconds=i),
+                     'fields': {'value': float(i)}} for i in range(rows)]
+
+        udp_points = make_points('udp_test')
+        udp_start = time.perf_counter()
+        self.op.write_points_udp(udp_points, port=int(os.environ['INFLUXDB_TEST_UDP_PORT']))
+        udp_pps = rows / (time.perf_counter() - udp_start)
+
+        http_points = make_points('http_test')
+        http_start = time.perf_counter()
+        self.op.write_points(http_points)
+        http_pps = rows / (time.perf_counter() - http_start)
+
+        # Dar tiempo al listener para volcar su buffer
+        time.sleep(0.2)
+        df = self.op.query_to_dataframe(measurement='udp_test')
+
+        # UDP puede perder paquetes
+        self.assertGreaterEqual(len(df), rows * 0.95)
+        self.assertGreater(udp_pps, http_pps)
+        print(f"UDP: {udp_pps:.2f} points/sec, HTTP: {http_pps:.2f} points/sec")
+
+    def test_write_dataframe_parallel_shard_aligned(self):
+        """Test escritura paralela repartida por serie y grupo de shards."""
+        # 100k filas con 32 series distintas
+        rows = 100000
+        df = pd.DataFrame({
+            'value': np.random.uniform(0, 100, rows),
+            'sensor': [f'sensor_{i % 32}' for i in range(rows)],
+        }, index=pd.date_range(start='2024-01-01', periods=rows, freq='1s'))
+
+        baseline = self.op.write_dataframe_parallel(
+            df=df, measurement='shard_test_1', tag_columns=['sensor'], max_workers=1
+        )
+        stats = self.op.write_dataframe_parallel(
+            df=df, measurement='shard_test_8', tag_columns=['sensor'], max_workers=8
+        )
+
+        self.assertEqual(baseline['successful'], rows)
+        self.assertEqual(stats['successful'], rows)
+        self.assertEqual(stats['shards'], 8)
+        self.assertGreater(stats['points_per_second'], baseline['points_per_second'])
+        print(f"1 worker: {baseline['points_per_second']:.2f} points/sec, "
+              f"8 workers: {stats['points_per_second']:.2f} points/sec")
+
 
 if __name__ == '__main__':
     unittest.main()
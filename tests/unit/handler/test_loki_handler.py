@@ -1,6 +1,8 @@
 """Tests unitarios para LokiHandler"""
 
 import logging
+import threading
+import time
 from unittest.mock import Mock, patch, call
 
 import pytest
@@ -27,6 +29,7 @@ class TestLokiHandler:
         assert handler.timeout == 5
         assert handler.batch_size == 0
         assert handler.batch == []
+        handler.close()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', False)
     def test_init_no_requests(self):
@@ -46,12 +49,14 @@ class TestLokiHandler:
         )
 
         assert handler.url == "http://localhost:3100/loki/api/v1/push"
+        handler.close()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
     @patch('time.time', return_value=1000.0)
-    def test_emit_without_batching(self, mock_time, mock_post):
+    def test_emit_without_batching(self, mock_time, mock_session):
         """Test envío inmediato de log sin batching"""
+        mock_post = mock_session.return_value.post
         mock_response = Mock()
         mock_response.status_code = 204
         mock_post.return_value = mock_response
@@ -74,18 +79,21 @@ class TestLokiHandler:
         )
 
         handler.emit(record)
+        handler.flush()
 
         mock_post.assert_called_once()
         call_args = mock_post.call_args
         assert call_args[0][0] == "http://localhost:3100/loki/api/v1/push"
         assert call_args[1]['json']['streams'][0]['stream'] == {"app": "test"}
         assert call_args[1]['json']['streams'][0]['values'][0][1] == "Test message"
+        handler.close()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
     @patch('time.time', return_value=1000.0)
-    def test_emit_with_batching(self, mock_time, mock_post):
+    def test_emit_with_batching(self, mock_time, mock_session):
         """Test acumulación de logs con batching"""
+        mock_post = mock_session.return_value.post
         mock_response = Mock()
         mock_response.status_code = 204
         mock_post.return_value = mock_response
@@ -93,7 +101,8 @@ class TestLokiHandler:
         handler = LokiHandler(
             url="http://localhost:3100",
             labels={"app": "test"},
-            batch_size=3
+            batch_size=3,
+            background=False
         )
         handler.setFormatter(logging.Formatter('%(message)s'))
 
@@ -129,10 +138,11 @@ class TestLokiHandler:
         mock_post.assert_called_once()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
     @patch('time.time', return_value=1000.0)
-    def test_flush_with_pending_batch(self, mock_time, mock_post):
+    def test_flush_with_pending_batch(self, mock_time, mock_session):
         """Test flush envía logs pendientes"""
+        mock_post = mock_session.return_value.post
         mock_response = Mock()
         mock_response.status_code = 204
         mock_post.return_value = mock_response
@@ -140,7 +150,8 @@ class TestLokiHandler:
         handler = LokiHandler(
             url="http://localhost:3100",
             labels={"app": "test"},
-            batch_size=10
+            batch_size=10,
+            background=False
         )
         handler.setFormatter(logging.Formatter('%(message)s'))
 
@@ -166,9 +177,10 @@ class TestLokiHandler:
         mock_post.assert_called_once()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
-    def test_emit_http_error(self, mock_post, capsys):
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_emit_http_error(self, mock_session, capsys):
         """Test manejo de errores HTTP"""
+        mock_post = mock_session.return_value.post
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = "Internal Server Error"
@@ -191,14 +203,17 @@ class TestLokiHandler:
         )
 
         handler.emit(record)
+        handler.flush()
 
         captured = capsys.readouterr()
         assert "Loki respondió con status 500" in captured.err
+        handler.close()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
-    def test_emit_timeout(self, mock_post, capsys):
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_emit_timeout(self, mock_session, capsys):
         """Test manejo de timeout"""
+        mock_post = mock_session.return_value.post
         import requests
         mock_post.side_effect = requests.exceptions.Timeout("Timeout")
 
@@ -219,14 +234,49 @@ class TestLokiHandler:
         )
 
         handler.emit(record)
+        handler.flush()
 
         captured = capsys.readouterr()
         assert "Timeout al enviar logs a Loki" in captured.err
+        handler.close()
 
     @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
-    @patch('ctrutils.handler.notification.loki_handler.requests.post')
-    def test_close_sends_pending_logs(self, mock_post):
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_sender_survives_unexpected_error(self, mock_session, capsys):
+        """Test que un error ajeno a requests no detiene el hilo de envío"""
+        mock_post = mock_session.return_value.post
+        mock_post.side_effect = [TypeError("not JSON serializable"), Mock(status_code=204)]
+
+        handler = LokiHandler(
+            url="http://localhost:3100",
+            labels={"app": "test"}
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        for msg in ("First", "Second"):
+            record = logging.LogRecord(
+                name="test",
+                level=logging.INFO,
+                pathname="",
+                lineno=0,
+                msg=msg,
+                args=(),
+                exc_info=None
+            )
+            handler.emit(record)
+            handler.flush()
+
+        assert handler._sender.is_alive()
+        assert "Error al enviar logs a Loki: not JSON serializable" in capsys.readouterr().err
+        assert mock_post.call_count == 2
+        assert mock_post.call_args[1]['json']['streams'][0]['values'][0][1] == "Second"
+        handler.close()
+
+    @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_close_sends_pending_logs(self, mock_session):
         """Test close envía logs pendientes antes de cerrar"""
+        mock_post = mock_session.return_value.post
         mock_response = Mock()
         mock_response.status_code = 204
         mock_post.return_value = mock_response
@@ -234,7 +284,8 @@ class TestLokiHandler:
         handler = LokiHandler(
             url="http://localhost:3100",
             labels={"app": "test"},
-            batch_size=10
+            batch_size=10,
+            background=False
         )
         handler.setFormatter(logging.Formatter('%(message)s'))
 
@@ -257,3 +308,111 @@ class TestLokiHandler:
 
         assert len(handler.batch) == 0
         mock_post.assert_called_once()
+
+    @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_emit_does_not_wait_for_network(self, mock_session):
+        """Test emit retorna sin esperar a la petición HTTP"""
+        release = threading.Event()
+        mock_post = mock_session.return_value.post
+        mock_post.side_effect = lambda *args, **kwargs: release.wait(5) and Mock(status_code=204)
+
+        handler = LokiHandler(
+            url="http://localhost:3100",
+            labels={"app": "test"}
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        start = time.perf_counter()
+        for i in range(100):
+            record = logging.LogRecord(
+                name="test",
+                level=logging.INFO,
+                pathname="",
+                lineno=0,
+                msg=f"Message {i}",
+                args=(),
+                exc_info=None
+            )
+            handler.emit(record)
+        elapsed = time.perf_counter() - start
+
+        # La primera petición sigue bloqueada: los logs solo se han encolado
+        assert elapsed < 1.0
+        release.set()
+        handler.close()
+
+        sent = [
+            value[1]
+            for c in mock_post.call_args_list
+            for value in c[1]['json']['streams'][0]['values']
+        ]
+        assert sent == [f"Message {i}" for i in range(100)]
+        # Los logs encolados mientras se enviaba el primero viajan juntos
+        assert mock_post.call_count < 100
+        assert not handler._sender.is_alive()
+
+    @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_background_batching_coalesces(self, mock_session):
+        """Test el hilo de envío agrupa los logs en batches de batch_size"""
+        mock_post = mock_session.return_value.post
+        mock_post.return_value = Mock(status_code=204)
+
+        handler = LokiHandler(
+            url="http://localhost:3100",
+            labels={"app": "test"},
+            batch_size=5,
+            flush_interval=60
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        for i in range(12):
+            record = logging.LogRecord(
+                name="test",
+                level=logging.INFO,
+                pathname="",
+                lineno=0,
+                msg=f"Message {i}",
+                args=(),
+                exc_info=None
+            )
+            handler.emit(record)
+        handler.flush()
+
+        sizes = [len(c[1]['json']['streams'][0]['values']) for c in mock_post.call_args_list]
+        assert sizes == [5, 5, 2]
+        # Una única sesión HTTP persistente para todos los envíos
+        mock_session.assert_called_once_with()
+        handler.close()
+
+    @patch('ctrutils.handler.notification.loki_handler.REQUESTS_AVAILABLE', True)
+    @patch('ctrutils.handler.notification.loki_handler.requests.Session')
+    def test_flush_interval_sends_partial_batch(self, mock_session):
+        """Test un batch incompleto se envía tras flush_interval sin logs nuevos"""
+        sent = threading.Event()
+        mock_post = mock_session.return_value.post
+        mock_post.side_effect = lambda *args, **kwargs: sent.set() or Mock(status_code=204)
+
+        handler = LokiHandler(
+            url="http://localhost:3100",
+            labels={"app": "test"},
+            batch_size=10,
+            flush_interval=0.05
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=0,
+            msg="Test message",
+            args=(),
+            exc_info=None
+        )
+        handler.emit(record)
+
+        assert sent.wait(2)
+        mock_post.assert_called_once()
+        handler.close()
@@ -61,6 +61,39 @@ class TestDatabaseOperations(unittest.TestCase):
         self.influx.switch_database('new_db')
         self.assertEqual(self.influx._database, 'new_db')
 
+    def test_database_exists_uses_cache(self):
+        """Test database_exists reuses the cached database list."""
+        self.mock_client.get_list_database.return_value = create_database_list_response(['test_db'])
+
+        self.assertTrue(self.influx.database_exists('test_db'))
+        self.assertFalse(self.influx.database_exists('other_db'))
+
+        self.assertEqual(self.mock_client.get_list_database.call_count, 1)
+
+    def test_switch_database_uses_cache(self):
+        """Test repeated switch_database calls skip SHOW DATABASES and CREATE DATABASE."""
+        self.mock_client.get_list_database.return_value = create_database_list_response(['test_db'])
+
+        for _ in range(3):
+            self.influx.switch_database('test_db')
+
+        self.assertEqual(self.mock_client.get_list_database.call_count, 1)
+        self.mock_client.create_database.assert_not_called()
+
+    def test_database_cache_invalidated(self):
+        """Test create_database and drop_database invalidate the cache."""
+        self.mock_client.get_list_database.return_value = create_database_list_response(['test_db'])
+        self.assertFalse(self.influx.database_exists('new_db'))
+
+        self.influx.create_database('new_db')
+        self.mock_client.get_list_database.return_value = create_database_list_response(['test_db', 'new_db'])
+        self.assertTrue(self.influx.database_exists('new_db'))
+
+        self.influx.drop_database('new_db', confirm=True)
+        self.mock_client.get_list_database.return_value = create_database_list_response(['test_db'])
+        self.assertFalse(self.influx.database_exists('new_db'))
+        self.assertEqual(self.mock_client.get_list_database.call_count, 3)
+
 
 @pytest.mark.unit
 class TestMeasurementOperations(unittest.TestCase):
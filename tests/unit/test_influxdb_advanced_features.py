@@ -1,4 +1,7 @@
 """Tests for advanced InfluxDB features and edge cases."""
+import gzip
+import os
+import tempfile
 import unittest
 import pytest
 import pandas as pd
@@ -288,3 +291,212 @@ class TestSwitchDatabaseEdgeCases(unittest.TestCase):
         self.influx.switch_database('existing_db')
 
         self.assertEqual(self.influx._database, 'existing_db')
+
+
+@pytest.mark.unit
+class TestBackupMeasurementCompression(unittest.TestCase):
+    """Test backup_measurement compressed output."""
+
+    def setUp(self):
+        self.mock_client = create_comprehensive_mock_client()
+        self.influx = InfluxdbOperation(client=self.mock_client)
+        self.influx._database = 'test_db'
+        points = [
+            {'time': '2024-01-01T12:00:00Z', 'value': 1.0},
+            {'time': '2024-01-01T12:01:00Z', 'value': 2.0},
+        ]
+        self.mock_client.query.return_value = create_mock_query_result(points)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_backup_infers_gzip_from_extension(self):
+        """Test that a .csv.gz output file is gzip-compressed."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.csv.gz')
+        exported = self.influx.backup_measurement('cpu', output_file)
+
+        self.assertEqual(exported, 2)
+        with gzip.open(output_file, 'rt') as f:
+            self.assertIn('value', f.readline())
+
+    def test_backup_with_explicit_compression_options(self):
+        """Test passing explicit compression options."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.csv.gz')
+        self.influx.backup_measurement(
+            'cpu',
+            output_file,
+            compression={'method': 'gzip', 'compresslevel': 1},
+        )
+
+        df = pd.read_csv(output_file, index_col=0)
+        self.assertEqual(len(df), 2)
+
+
+@pytest.mark.unit
+class TestBackupMeasurementLineProtocol(unittest.TestCase):
+    """Test backup_measurement/restore_measurement in line protocol format."""
+
+    def setUp(self):
+        self.mock_client = create_comprehensive_mock_client()
+        self.influx = InfluxdbOperation(client=self.mock_client)
+        self.influx._database = 'test_db'
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        start = pd.Timestamp('2024-01-01T00:00:00Z').value
+        self.rows = [
+            {
+                'time': start + i * 60_000_000_000,
+                'host': f'server {i % 3}',
+                'value': float(i) * 1.25,
+                'count': i,
+                'status': 'ok' if i % 2 else None,
+            }
+            for i in range(1000)
+        ]
+        self.queries = []
+
+        def query(q, **kwargs):
+            self.queries.append((q, kwargs))
+            if q.startswith('SHOW TAG KEYS'):
+                return Mock(get_points=Mock(return_value=iter([{'tagKey': 'host'}])))
+            if q.startswith('SHOW FIELD KEYS'):
+                return Mock(get_points=Mock(return_value=iter([
+                    {'fieldKey': 'value', 'fieldType': 'float'},
+                    {'fieldKey': 'count', 'fieldType': 'integer'},
+                    {'fieldKey': 'status', 'fieldType': 'string'},
+                ])))
+            if kwargs.get('chunked'):
+                # Un ResultSet por bloque, como la respuesta JSON por bloques
+                size = kwargs['chunk_size']
+                return (
+                    create_mock_query_result(self.rows[i:i + size])
+                    for i in range(0, len(self.rows), size)
+                )
+            iso_rows = [
+                {**row, 'time': pd.Timestamp(row['time'], tz='UTC').isoformat()}
+                for row in self.rows
+            ]
+            return create_mock_query_result(iso_rows)
+
+        self.mock_client.query.side_effect = query
+
+    def _sent_lines(self):
+        lines = []
+        for c in self.mock_client.write_points.call_args_list:
+            self.assertEqual(c.kwargs['protocol'], 'line')
+            lines.extend(c.kwargs['points'])
+        return lines
+
+    def test_backup_streams_chunked_query(self):
+        """Test that the dump uses a chunked query with ns epoch."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.lp')
+        exported = self.influx.backup_measurement('cpu', output_file)
+
+        self.assertEqual(exported, 1000)
+        select = [kw for q, kw in self.queries if q.startswith('SELECT')]
+        self.assertEqual(len(select), 1)
+        self.assertTrue(select[0]['chunked'])
+        self.assertEqual(select[0]['epoch'], 'ns')
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 1000)
+        self.assertEqual(
+            lines[1],
+            'cpu,host=server\\ 1 count=1i,status="ok",value=1.25 1704067260000000000',
+        )
+        # Un float entero conserva su tipo aunque JSON lo devuelva como int
+        self.assertIn('value=0.0 ', lines[0])
+
+    def test_roundtrip_gzip_with_rename_and_tags(self):
+        """Test that restore resends the dumped lines without reparsing them."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.lp.gz')
+        self.influx.backup_measurement('cpu', output_file)
+        with gzip.open(output_file, 'rt', encoding='utf-8') as f:
+            dumped = f.read().splitlines()
+
+        stats = self.influx.restore_measurement(
+            'cpu restored', output_file, tags={'source': 'backup'}, batch_size=300
+        )
+
+        self.assertEqual(stats['total_points'], 1000)
+        self.assertEqual(stats['written_points'], 1000)
+        self.assertEqual(stats['batches'], 4)
+        sent = self._sent_lines()
+        self.assertEqual(len(sent), 1000)
+        for original, restored in zip(dumped, sent):
+            self.assertEqual(
+                restored,
+                'cpu\\ restored,source=backup' + original[len('cpu'):],
+            )
+
+    def test_restore_detects_gzip_without_gz_suffix(self):
+        """Test that an explicitly gzipped dump restores whatever its name."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.lp')
+        self.influx.backup_measurement('cpu', output_file, compression='gzip')
+        with gzip.open(output_file, 'rt', encoding='utf-8') as f:
+            dumped = f.read().splitlines()
+
+        stats = self.influx.restore_measurement('cpu', output_file)
+
+        self.assertEqual(stats['written_points'], 1000)
+        self.assertEqual(self._sent_lines(), dumped)
+
+    def test_restore_tags_replace_dumped_tags(self):
+        """Test that a restore tag drops the dumped tag with the same key."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.lp')
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('cpu,dc=a\\,b,host=server\\ 1,zone=x\\=y value=1.0,host="f" 1\n')
+            f.write('cpu,host=server\\ 2 value=2.0 2\n')
+            f.write('cpu value=3.0 3\n')
+
+        stats = self.influx.restore_measurement('cpu', output_file, tags={'host': 'restored'})
+
+        self.assertEqual(stats['written_points'], 3)
+        self.assertEqual(self._sent_lines(), [
+            'cpu,host=restored,dc=a\\,b,zone=x\\=y value=1.0,host="f" 1',
+            'cpu,host=restored value=2.0 2',
+            'cpu,host=restored value=3.0 3',
+        ])
+
+    def test_unknown_extension_stays_csv(self):
+        """Test that a '.txt' CSV backup written by the old code still round-trips."""
+        output_file = os.path.join(self.tmpdir.name, 'cpu.txt')
+        # Lo que escribia backup_measurement antes de existir el line protocol
+        df = self.influx.query_to_dataframe(measurement='cpu')
+        df.to_csv(output_file, index=True)
+        with open(output_file, 'r', encoding='utf-8') as f:
+            old_backup = f.read()
+
+        stats = self.influx.restore_measurement('cpu', output_file)
+
+        self.assertEqual(stats['total_points'], 1000)
+        self.assertEqual(stats['written_points'], 1000)
+
+        # Sin backup_format el nuevo backup sigue siendo el mismo CSV
+        self.influx.backup_measurement('cpu', output_file)
+        self.assertFalse(any(kw.get('chunked') for _, kw in self.queries))
+        with open(output_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), old_backup)
+
+    def test_line_protocol_restore_skips_point_parsing(self):
+        """Test that the line protocol restore never rebuilds points or DataFrames."""
+        lp_file = os.path.join(self.tmpdir.name, 'cpu.lp')
+        self.influx.backup_measurement('cpu', lp_file)
+
+        with patch.object(InfluxdbOperation, 'points_to_line_protocol') as serialize, \
+                patch.object(InfluxdbOperation, 'write_dataframe') as write_dataframe, \
+                patch('pandas.read_csv') as read_csv:
+            stats = self.influx.restore_measurement('cpu', lp_file, tags={'source': 'backup'})
+
+        self.assertEqual(stats['written_points'], 1000)
+        serialize.assert_not_called()
+        write_dataframe.assert_not_called()
+        read_csv.assert_not_called()
+
+    def test_invalid_format_raises(self):
+        """Test that an unknown backup format is rejected."""
+        with self.assertRaises(ValueError):
+            self.influx.backup_measurement(
+                'cpu', os.path.join(self.tmpdir.name, 'cpu.json'), backup_format='json'
+            )
@@ -1,4 +1,5 @@
 """Tests unitarios para InfluxdbOperation."""
+import os
 import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 from datetime import datetime, timezone
@@ -6,6 +7,14 @@ import pandas as pd
 import numpy as np
 
 from ctrutils.database.influxdb import InfluxdbOperation
+from tests.fixtures import (
+    SEED_WRITES,
+    clear_database,
+    create_sample_dataframe,
+    get_test_config,
+    write_seed_dataframe,
+)
+from tests.fixtures.influxdb_fixtures import create_mock_influxdb_client
 
 
 class TestInfluxdbOperationInit(unittest.TestCase):
@@ -39,6 +48,38 @@ class TestInfluxdbOperationInit(unittest.TestCase):
         op = InfluxdbOperation(host='localhost', port=8086)
         self.assertIsNone(op._database)
 
+    def test_init_mounts_pooled_adapter(self):
+        """Test que el cliente reutiliza un pool de conexiones con reintentos."""
+        op = InfluxdbOperation(host='localhost', port=8086)
+
+        adapter = op._client._session.get_adapter('http://localhost:8086')
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.1)
+
+    def test_init_respects_custom_pool_size(self):
+        """Test que un pool_size explicito no se sustituye."""
+        op = InfluxdbOperation(host='localhost', port=8086, pool_size=4)
+
+        adapter = op._client._session.get_adapter('http://localhost:8086')
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_session_can_be_shared(self):
+        """Test que varias instancias pueden compartir una sesion HTTP inyectada."""
+        import requests
+        shared = requests.Session()
+        first = InfluxdbOperation(host='localhost', port=8086)
+        second = InfluxdbOperation(host='localhost', port=8087)
+        own = first.session
+
+        first.session = shared
+        second.session = shared
+
+        self.assertIs(first.session, shared)
+        self.assertIs(first.get_client._session, shared)
+        self.assertIs(second.get_client._session, shared)
+        self.assertIsNot(own, shared)
+
 
 class TestInfluxdbOperationDataValidation(unittest.TestCase):
     """Tests para validacion de datos."""
@@ -297,6 +338,58 @@ class TestInfluxdbOperationDataframe(unittest.TestCase):
         self.assertIn('temperature', df.columns)
         self.assertIn('humidity', df.columns)
 
+    def test_sample_dataframe_fixture_cached(self):
+        """Test que el fixture reutiliza el DataFrame y es reproducible."""
+        df = create_sample_dataframe(rows=50, with_nans=True)
+
+        self.assertIs(create_sample_dataframe(rows=50, with_nans=True), df)
+        self.assertEqual(df.index.asi8.dtype, np.int64)
+        pd.testing.assert_frame_equal(
+            create_sample_dataframe(rows=50, with_nans=True, seed=7),
+            create_sample_dataframe(rows=50, with_nans=True, seed=7),
+        )
+
+    def test_test_config_database_per_xdist_worker(self):
+        """Test que cada worker de pytest-xdist usa su propia base de datos."""
+        with patch.dict(os.environ, {'PYTEST_XDIST_WORKER': 'gw3', 'INFLUXDB_TEST_DATABASE': 'test_db'}):
+            self.assertEqual(get_test_config()['database'], 'test_db_gw3')
+        with patch.dict(os.environ, {'INFLUXDB_TEST_DATABASE': 'test_db'}):
+            os.environ.pop('PYTEST_XDIST_WORKER', None)
+            self.assertEqual(get_test_config()['database'], 'test_db')
+
+    def test_teardown_is_single_query(self):
+        """Test que clear_database vacia la base de datos con una sola consulta."""
+        mock_client = create_mock_influxdb_client()
+        op = InfluxdbOperation(client=mock_client)
+
+        clear_database(op, 'testdb')
+
+        mock_client.query.assert_called_once_with('DROP SERIES FROM /.*/', database='testdb')
+
+    def test_teardown_only_created_measurements(self):
+        """Test que clear_database puede limitarse a los measurements creados por el test."""
+        mock_client = create_mock_influxdb_client()
+        op = InfluxdbOperation(client=mock_client)
+
+        clear_database(op, 'testdb', {'b_measurement', 'a_measurement'})
+        clear_database(op, 'testdb', set())
+
+        mock_client.query.assert_called_once_with(
+            'DROP SERIES FROM "a_measurement", "b_measurement"', database='testdb'
+        )
+
+    def test_seed_write_counted(self):
+        """Test que write_seed_dataframe contabiliza cada escritura de datos semilla."""
+        op = Mock()
+        before = SEED_WRITES[('testdb', 'seed')]
+
+        df = write_seed_dataframe(op, 'seed', 'testdb')
+
+        self.assertEqual(SEED_WRITES[('testdb', 'seed')] - before, 1)
+        self.assertEqual(len(df), 1000)
+        self.assertTrue(df.isna().any().any())
+        op.write_dataframe.assert_called_once_with(df, measurement='seed', database='testdb')
+
     def test_dataframe_with_nans(self):
         """Test validacion de DataFrame con NaNs."""
         timestamps = pd.date_range(start='2024-01-01', periods=5, freq='1min')
@@ -158,6 +158,35 @@ class TestCountOperations(unittest.TestCase):
         )
         self.assertIsInstance(count, int)
 
+    def test_count_points_matches_count_points_by_measurement(self):
+        """Test both counts take the most complete field, not the first one."""
+        from influxdb.resultset import ResultSet
+        self.mock_client.query.return_value = ResultSet({'series': [
+            {'name': 'cpu', 'columns': ['time', 'count_idle', 'count_user'],
+             'values': [[0, 8, 10]]},
+        ]})
+
+        self.assertEqual(self.influx.count_points('cpu'), 10)
+        self.assertEqual(self.influx.count_points_by_measurement(), {'cpu': 10})
+
+    def test_count_points_by_measurement_single_query(self):
+        """Test counting every measurement of a database in one query."""
+        from influxdb.resultset import ResultSet
+        self.mock_client.query.return_value = ResultSet({'series': [
+            {'name': 'cpu', 'columns': ['time', 'count_idle', 'count_user'],
+             'values': [[0, 8, 10]]},
+            {'name': 'mem', 'columns': ['time', 'count_used'], 'values': [[0, 4]]},
+            {'name': 'empty', 'columns': ['time', 'count_value'], 'values': [[0, None]]},
+        ]})
+
+        counts = self.influx.count_points_by_measurement('other_db')
+
+        self.assertEqual(counts, {'cpu': 10, 'mem': 4, 'empty': 0})
+        self.mock_client.query.assert_called_once_with(
+            'SELECT COUNT(*) FROM /.*/', database='other_db'
+        )
+        self.assertEqual(self.influx._database, 'test_db')
+
 
 @pytest.mark.unit
 class TestContinuousQueries(unittest.TestCase):
@@ -124,6 +124,90 @@ class TestNormalizeValueToWrite(unittest.TestCase):
         self.assertEqual(self.influx_op.normalize_value_to_write(value), value)
 
 
+@pytest.mark.unit
+@pytest.mark.edge_case
+class TestNormalizeDataframeToWrite(unittest.TestCase):
+    def setUp(self):
+        mock_client = create_mock_influxdb_client()
+        self.influx_op = InfluxdbOperation(client=mock_client, database='test_db')
+
+    def test_normalize_dataframe_matches_scalar_normalization(self):
+        df = pd.DataFrame({
+            'float': [1.5, np.nan, np.inf, -np.inf, 0.0],
+            'int': np.arange(5),
+            'bool': [True, False, True, False, True],
+            'text': [' a ', 'nan', '', None, 'ok'],
+        }, index=pd.date_range('2024-01-01', periods=5, freq='1min'))
+
+        result = self.influx_op.normalize_dataframe_to_write(df)
+
+        for (_, row), (_, normalized) in zip(df.iterrows(), result.iterrows()):
+            for column, value in row.items():
+                expected = None if pd.isna(value) else self.influx_op.normalize_value_to_write(value)
+                self.assertEqual(normalized[column], expected)
+                self.assertIs(type(normalized[column]), type(expected))
+
+    def test_normalize_dataframe_without_validation_keeps_inf(self):
+        df = pd.DataFrame({
+            'float': [np.inf, np.nan],
+            'int': [1, 2],
+        }, index=pd.date_range('2024-01-01', periods=2, freq='1min'))
+
+        result = self.influx_op.normalize_dataframe_to_write(
+            df, validate_data=False, pass_to_float=False
+        )
+
+        self.assertEqual(result['float'].tolist(), [float('inf'), None])
+        # Con una columna float, pandas promociona las filas a float
+        self.assertEqual(result['int'].tolist(), [1.0, 2.0])
+
+    def test_normalize_dataframe_vectorized(self):
+        rows = 10_000
+        df = pd.DataFrame({
+            'value1': np.random.uniform(0, 100, rows),
+            'value2': np.random.uniform(0, 100, rows),
+        }, index=pd.date_range('2024-01-01', periods=rows, freq='1s'))
+        df.iloc[::7, 0] = np.nan
+        df.iloc[::11, 1] = np.inf
+
+        # Las columnas numericas no pasan por la normalizacion escalar por celda
+        with patch.object(
+            InfluxdbOperation, 'normalize_value_to_write'
+        ) as normalize_value:
+            result = self.influx_op.normalize_dataframe_to_write(df)
+
+        normalize_value.assert_not_called()
+        self.assertEqual(result['value1'].isna().sum(), len(range(0, rows, 7)))
+        self.assertEqual(result['value2'].isna().sum(), len(range(0, rows, 11)))
+
+    def test_validate_frame_vectorized(self):
+        rows = 1000
+        df = pd.DataFrame({
+            'value1': np.random.uniform(0, 100, rows),
+            'value2': np.random.uniform(0, 100, rows),
+        }, index=pd.date_range('2024-01-01', periods=rows, freq='1s'))
+        df.iloc[::3, 0] = np.nan
+        df.iloc[::5, 1] = np.inf
+        df.iloc[::15, 0] = -np.inf
+
+        expected = {}
+        for timestamp, row in df.iterrows():
+            point = self.influx_op._validate_point({'fields': row.to_dict()})
+            if point is not None:
+                expected[timestamp] = point['fields']
+
+        # Ni el validador de puntos ni la normalizacion escalar se llaman por fila
+        with patch.object(InfluxdbOperation, '_validate_point') as validate_point, \
+                patch.object(InfluxdbOperation, 'normalize_value_to_write') as normalize_value:
+            result = self.influx_op._validate_frame(df)
+
+        validate_point.assert_not_called()
+        normalize_value.assert_not_called()
+        self.assertEqual(list(result.index), list(expected))
+        for timestamp, row in result.iterrows():
+            self.assertEqual({k: v for k, v in row.items() if v is not None}, expected[timestamp])
+
+
 @pytest.mark.unit
 @pytest.mark.edge_case
 class TestValidatePoint(unittest.TestCase):
@@ -1,9 +1,13 @@
 """Tests for write operations in InfluxdbOperation."""
+import json
+import socket
+import tracemalloc
 import unittest
 from unittest.mock import patch, MagicMock
 import pytest
 import pandas as pd
 import numpy as np
+from influxdb.line_protocol import make_lines
 
 from ctrutils.database.influxdb.InfluxdbOperation import InfluxdbOperation
 from tests.fixtures.influxdb_fixtures import create_mock_influxdb_client, create_test_dataframe
@@ -113,6 +117,47 @@ class TestWriteDataframeParameterCombinations(unittest.TestCase):
             self.influx.write_dataframe(measurement='test', data=df)
 
 
+@pytest.mark.unit
+class TestWriteDataframeBatchSize(unittest.TestCase):
+    """Test how write_dataframe sizes its write batches."""
+
+    def setUp(self):
+        self.mock_client = create_mock_influxdb_client(write_points_return=True)
+        self.influx = InfluxdbOperation(client=self.mock_client)
+        self.influx._database = 'test_db'
+
+    def _batch_lengths(self):
+        return [len(c.kwargs['points']) for c in self.mock_client.write_points.call_args_list]
+
+    def test_write_dataframe_default_batch_size(self):
+        """Test write_dataframe writes 5000 points per batch by default."""
+        df = pd.DataFrame({'value': np.arange(12000, dtype=float)},
+                          index=pd.date_range('2024-01-01', periods=12000, freq='1s'))
+
+        result = self.influx.write_dataframe(measurement='test', data=df)
+
+        self.assertEqual(self._batch_lengths(), [5000, 5000, 2000])
+        self.assertEqual(result['batches'], 3)
+
+    def test_write_dataframe_batch_size_clamped(self):
+        """Test batch_size above MAX_BATCH_SIZE is clamped."""
+        df = pd.DataFrame({'value': np.arange(12000, dtype=float)},
+                          index=pd.date_range('2024-01-01', periods=12000, freq='1s'))
+
+        self.influx.write_dataframe(measurement='test', data=df, batch_size=50000)
+
+        self.assertEqual(self._batch_lengths(), [10000, 2000])
+
+    def test_write_dataframe_max_payload_bytes(self):
+        """Test max_payload_bytes caps the rows per batch."""
+        df = pd.DataFrame({'value': np.arange(100, dtype=float)},
+                          index=pd.date_range('2024-01-01', periods=100, freq='1s'))
+        # 8 bytes of index + 8 bytes of value per row
+        self.influx.write_dataframe(measurement='test', data=df, max_payload_bytes=16 * 25)
+
+        self.assertEqual(self._batch_lengths(), [25, 25, 25, 25])
+
+
 @pytest.mark.unit
 class TestWritePointsBatchingAndStats(unittest.TestCase):
     """Test write_points batching and statistics."""
@@ -157,3 +202,215 @@ class TestWritePointsBatchingAndStats(unittest.TestCase):
 
         self.influx.write_points(points=points, tags={'location': 'lab'})
         self.assertTrue(self.mock_client.write_points.called)
+
+
+@pytest.mark.unit
+class TestWritePointsLineProtocol(unittest.TestCase):
+    """Test write_points sends pre-serialized line protocol."""
+
+    def setUp(self):
+        self.mock_client = create_mock_influxdb_client(write_points_return=True)
+        self.influx = InfluxdbOperation(client=self.mock_client)
+        self.influx._database = 'test_db'
+
+    def test_write_points_line_protocol(self):
+        """Test write_points passes protocol='line' and fewer bytes than JSON."""
+        points = [{'measurement': 'test', 'time': f'2024-01-01T12:{i:02d}:00Z',
+                   'tags': {'host': 'server01'}, 'fields': {'value': i * 1.5}}
+                  for i in range(50)]
+        json_size = len(json.dumps(points))
+
+        self.influx.write_points(points=points, validate_data=False)
+
+        call = self.mock_client.write_points.call_args
+        self.assertEqual(call.kwargs['protocol'], 'line')
+        lines = call.kwargs['points']
+        self.assertEqual(len(lines), 50)
+        self.assertLess(len('\n'.join(lines)), json_size)
+
+    def test_write_dataframe_int64_timestamps(self):
+        """Test write_dataframe sends raw int64 nanosecond timestamps."""
+        df = create_test_dataframe(rows=20, num_tags=0)
+        self.assertEqual(df.index.asi8.dtype, np.int64)
+
+        self.influx.write_dataframe(measurement='test', data=df)
+
+        lines = self.mock_client.write_points.call_args.kwargs['points']
+        self.assertEqual([int(line.rsplit(' ', 1)[1]) for line in lines], df.index.as_unit('ns').asi8.tolist())
+        self.assertNotIn('T', ''.join(line.rsplit(' ', 1)[1] for line in lines))
+
+    def test_write_dataframe_no_dict_allocations(self):
+        """Test write_dataframe peak memory stays close to the line protocol payload."""
+        rows = 10000
+        df = pd.DataFrame({'cpu': np.random.uniform(0, 100, rows), 'memory': np.random.uniform(0, 100, rows)},
+                          index=pd.date_range('2024-01-01', periods=rows, freq='1s'))
+
+        tracemalloc.start()
+        try:
+            self.influx.write_dataframe(measurement='test', data=df)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        payload = sum(len(line) for c in self.mock_client.write_points.call_args_list
+                      for line in c.kwargs['points'])
+        # Building a dict per row needed close to 10x the payload
+        self.assertLess(peak, 6 * payload)
+
+    def test_points_to_line_protocol_matches_client(self):
+        """Test serialization matches influxdb.line_protocol.make_lines."""
+        shared_tags = {'host': 'a b', 'site': 'x,y=z', 'empty': ''}
+        points = [
+            {'measurement': 'cpu load', 'time': '2024-01-01T00:00:00.123456Z',
+             'tags': shared_tags, 'fields': {'f': 1.5, 'i': 3, 'b': True, 's': 'say "hi"\\', 'n': None}},
+            {'measurement': 'cpu load', 'time': '2024-01-01T01:00:00+05:30',
+             'tags': shared_tags, 'fields': {'f': np.float64(2.25), 'i': np.int64(7)}},
+            {'measurement': 'mem', 'time': '2024-01-01T00:00:00', 'fields': {'v': -0.0}},
+            {'measurement': 'mem', 'fields': {'v': 1e300}},
+        ]
+
+        expected = make_lines({'points': points}).split('\n')[:-1]
+
+        self.assertEqual(InfluxdbOperation.points_to_line_protocol(points), expected)
+
+    def test_points_to_line_protocol_fallback(self):
+        """Test non-ISO8601 and out-of-range timestamps fall back to the client."""
+        points = [
+            {'measurement': 'm', 'time': '01/02/2024 10:00', 'fields': {'v': 1.0}},
+            {'measurement': 'm', 'time': '3000-01-01T00:00:00Z', 'fields': {'v': 2.0}},
+        ]
+
+        expected = make_lines({'points': points}).split('\n')[:-1]
+
+        self.assertEqual(InfluxdbOperation.points_to_line_protocol(points), expected)
+
+
+@pytest.mark.unit
+class TestWriteGzipCompression(unittest.TestCase):
+    """Test the gzip option compresses write request bodies."""
+
+    def _write_body(self, compress_requests):
+        influx = InfluxdbOperation(host='localhost', port=8086, compress_requests=compress_requests)
+        influx._database = 'test_db'
+        df = pd.DataFrame({'value': np.random.default_rng(0).uniform(20, 30, 1000)},
+                          index=pd.date_range('2024-01-01', periods=1000, freq='1min'))
+        with patch.object(influx._client._session, 'request',
+                          return_value=MagicMock(status_code=204)) as mock_request, \
+                patch.object(influx, 'switch_database'):
+            influx.write_dataframe(measurement='test_measurement', data=df, tags={'location': 'room_1'})
+        return mock_request.call_args.kwargs
+
+    def test_write_dataframe_gzip(self):
+        """Test compress_requests=True shrinks the request body at least 3x."""
+        plain = self._write_body(compress_requests=False)
+        compressed = self._write_body(compress_requests=True)
+
+        self.assertNotIn('Content-Encoding', plain['headers'])
+        self.assertEqual(compressed['headers']['Content-Encoding'], 'gzip')
+        self.assertGreaterEqual(len(plain['data']), 3 * len(compressed['data']))
+
+    def test_gzip_option_in_client_info(self):
+        """Test compress_requests is reported by get_client_info."""
+        self.assertFalse(InfluxdbOperation(host='localhost', port=8086, compress_requests=False).get_client_info['gzip'])
+        self.assertTrue(InfluxdbOperation(host='localhost', port=8086).get_client_info['gzip'])
+        # El argumento gzip de InfluxDBClient sigue aceptandose via kwargs
+        self.assertFalse(InfluxdbOperation(host='localhost', port=8086, gzip=False).get_client_info['gzip'])
+
+
+@pytest.mark.unit
+class TestWriteDataframeParallel(unittest.TestCase):
+    """Test write_dataframe_parallel partitions rows by series and shard window."""
+
+    def setUp(self):
+        self.mock_client = create_mock_influxdb_client(write_points_return=True)
+        self.influx = InfluxdbOperation(client=self.mock_client)
+        self.influx._database = 'test_db'
+        rows = 7200
+        self.df = pd.DataFrame({
+            'value': np.arange(rows, dtype=float),
+            'host': [f'host_{i % 4}' for i in range(rows)],
+        }, index=pd.date_range('2024-01-01', periods=rows, freq='2s'))
+
+    def test_write_dataframe_parallel_stats(self):
+        """Test successful counts every written row."""
+        stats = self.influx.write_dataframe_parallel(df=self.df, measurement='test', max_workers=3)
+
+        self.assertEqual(stats['successful'], len(self.df))
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['shards'], 3)
+
+    def test_write_dataframe_parallel_shard_aligned(self):
+        """Test each (series, shard window) is written by a single call with its own tags."""
+        with patch.object(self.influx, 'write_dataframe', wraps=self.influx.write_dataframe) as mock_write:
+            self.influx.write_dataframe_parallel(
+                df=self.df, measurement='test', tag_columns=['host'], max_workers=4
+            )
+
+        owners = {}
+        for i, c in enumerate(mock_write.call_args_list):
+            frame = c.kwargs['df']
+            self.assertEqual(frame['host'].nunique(), 1)
+            for key in set(zip(frame['host'], frame.index.floor('1h'))):
+                self.assertEqual(owners.setdefault(key, i), i)
+        self.assertEqual(len(owners), 4 * 4)
+
+        series = {line.split(' ')[0] for c in self.mock_client.write_points.call_args_list
+                  for line in c.kwargs['points']}
+        self.assertEqual(series, {f'test,host=host_{k}' for k in range(4)})
+
+    def test_write_dataframe_parallel_requires_datetime_index(self):
+        """Test a non-DatetimeIndex raises TypeError."""
+        with pytest.raises(TypeError):
+            self.influx.write_dataframe_parallel(df=self.df.reset_index(drop=True), measurement='test')
+
+
+@pytest.mark.unit
+class TestWritePointsUdp(unittest.TestCase):
+    """Test write_points_udp frames line protocol into UDP datagrams."""
+
+    def setUp(self):
+        self.influx = InfluxdbOperation(client=create_mock_influxdb_client())
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(('127.0.0.1', 0))
+        self.receiver.settimeout(2)
+        self.port = self.receiver.getsockname()[1]
+        self.points = [{'measurement': 'udp_test', 'time': f'2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z',
+                        'tags': {'host': 'server01'}, 'fields': {'value': float(i)}}
+                       for i in range(200)]
+
+    def tearDown(self):
+        self.receiver.close()
+
+    def _receive(self, count):
+        return [self.receiver.recv(65535) for _ in range(count)]
+
+    def test_write_points_udp_single_datagram(self):
+        """Test small writes fit in one newline-separated datagram."""
+        expected = InfluxdbOperation.points_to_line_protocol([dict(p) for p in self.points])
+
+        stats = self.influx.write_points_udp(self.points, host='127.0.0.1', port=self.port)
+
+        self.assertEqual(stats['written_points'], 200)
+        self.assertEqual(stats['datagrams'], 1)
+        self.assertEqual(self._receive(1)[0].decode('utf-8').split('\n'), expected)
+
+    def test_write_points_udp_splits_datagrams(self):
+        """Test lines are split across datagrams without exceeding the limit."""
+        stats = self.influx.write_points_udp(
+            self.points, host='127.0.0.1', port=self.port, max_datagram_bytes=1000
+        )
+
+        datagrams = self._receive(stats['datagrams'])
+        self.assertGreater(len(datagrams), 1)
+        self.assertTrue(all(len(d) <= 1000 for d in datagrams))
+        self.assertEqual(sum(len(d.split(b'\n')) for d in datagrams), 200)
+
+    def test_write_points_udp_point_too_large(self):
+        """Test a point larger than a datagram raises ValueError."""
+        with pytest.raises(ValueError, match="no cabe en un datagrama"):
+            self.influx.write_points_udp(self.points, host='127.0.0.1', port=self.port, max_datagram_bytes=10)
+
+    def test_write_points_udp_empty_list(self):
+        """Test write_points_udp with empty list raises error."""
+        with pytest.raises(ValueError, match="La lista de puntos no puede estar vacia"):
+            self.influx.write_points_udp([], host='127.0.0.1', port=self.port)